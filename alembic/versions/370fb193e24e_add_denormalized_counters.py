@@ -0,0 +1,43 @@
+"""Add denormalized counters
+
+Revision ID: 370fb193e24e
+Revises: 57df34c38ff8
+Create Date: 2026-10-17 15:27:40.912215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '370fb193e24e'
+down_revision: Union[str, None] = '57df34c38ff8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('questions',
+    sa.Column('answer_count', sa.Integer(), server_default=sa.text('0'), nullable=False)
+    )
+    op.create_table('counters',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Заполнение счетчиков по уже существующим данным
+    op.execute(
+        "UPDATE questions SET answer_count = a.cnt "
+        "FROM (SELECT question_id, count(*) AS cnt FROM answers GROUP BY question_id) AS a "
+        "WHERE questions.id = a.question_id"
+    )
+    op.execute("INSERT INTO counters (name, value) SELECT 'questions', count(*) FROM questions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('counters')
+    op.drop_column('questions', 'answer_count')
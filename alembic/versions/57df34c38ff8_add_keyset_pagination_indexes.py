@@ -0,0 +1,45 @@
+"""Add keyset pagination indexes
+
+Revision ID: 57df34c38ff8
+Revises: 2f9e4989369b
+Create Date: 2026-10-17 12:04:11.318042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57df34c38ff8'
+down_revision: Union[str, None] = '2f9e4989369b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_created_at_id', 'questions', ['created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_answers_question_id_created_at_id', 'answers', ['question_id', 'created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_answers_question_id_created_at_id', table_name='answers',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_questions_created_at_id', table_name='questions',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,36 @@
+"""Add import checkpoints
+
+Revision ID: 5f658ac21dd8
+Revises: cd585cf2e473
+Create Date: 2026-10-18 00:17:40.905849
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f658ac21dd8'
+down_revision: Union[str, None] = 'cd585cf2e473'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('import_checkpoints',
+    sa.Column('job', sa.String(length=128), nullable=False),
+    sa.Column('position', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('questions', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('answers', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('rejected', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('job')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('import_checkpoints')
@@ -0,0 +1,56 @@
+"""Add full-text search
+
+Revision ID: cd585cf2e473
+Revises: 370fb193e24e
+Create Date: 2026-10-17 23:43:19.599684
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'cd585cf2e473'
+down_revision: Union[str, None] = '370fb193e24e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Сгенерированная колонка заполняется при добавлении: таблица переписывается под ACCESS EXCLUSIVE
+    op.add_column('questions', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('russian', text)", persisted=True), nullable=False,
+    ))
+    op.add_column('answers', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('russian', text)", persisted=True), nullable=False,
+    ))
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_search_vector', 'questions', ['search_vector'], unique=False,
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_answers_search_vector', 'answers', ['search_vector'], unique=False,
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_answers_search_vector', table_name='answers',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_questions_search_vector', table_name='questions',
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('answers', 'search_vector')
+    op.drop_column('questions', 'search_vector')
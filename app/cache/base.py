@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@dataclass
+class CacheStats:
+    """Counters of a cache backend since process start."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class CacheBackend(ABC):
+    """
+    Async key-value cache for serialized responses.
+
+    Every entry can carry tags; ``invalidate_tags`` drops all entries
+    with any of the given tags, which lets writes invalidate exactly the
+    responses that depend on the changed rows.
+
+    Every invalidation starts a new generation and stamps its tags with
+    it. A read-through caller takes ``generation()`` before reading the
+    database and passes it to ``set``: if any tag of the entry was
+    invalidated after that, the value may predate the write and is not
+    stored.
+    """
+
+    name: str = "base"
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        """Return cached value or None on miss."""
+
+    @abstractmethod
+    async def generation(self) -> int:
+        """Current invalidation generation, taken before reading the data to cache."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, tags: tuple[str, ...] = (), generation: int | None = None) -> None:
+        """Store value under key and register it in the given tags, unless a tag changed after generation."""
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Drop all entries registered in any of the tags and start a new generation."""
+
+    async def get_model(self, key: str, model: type[ModelT]) -> ModelT | None:
+        """Return cached Pydantic model or None on miss."""
+        value = await self.get(key)
+        return model.model_validate_json(value) if value is not None else None
+
+    async def set_model(self, key: str, value: BaseModel, tags: tuple[str, ...] = (),
+                        generation: int | None = None) -> None:
+        """Store Pydantic model serialized to JSON."""
+        await self.set(key, value.model_dump_json(), tags, generation)
+
+    async def collect_stats(self) -> CacheStats:
+        """Current counters of the backend."""
+        return self.stats
+
+    async def size(self) -> int | None:
+        """Number of entries, if the backend can tell cheaply."""
+        return None
+
+    async def close(self) -> None:
+        """Release backend resources."""
@@ -0,0 +1,12 @@
+# Теги кэша: по ним записи инвалидируют ровно зависящие от них ответы
+
+QUESTIONS_LIST_TAG = "questions"
+
+
+def question_tag(question_id: int) -> str:
+    """Everything built from the question and its answers."""
+    return f"question:{question_id}"
+
+
+def answer_tag(answer_id: int) -> str:
+    return f"answer:{answer_id}"
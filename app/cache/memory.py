@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+
+from app.cache.base import CacheBackend
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with a per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 60.0):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires_at, value, tags); порядок — от давно использованных к недавним
+        self._entries: OrderedDict[str, tuple[float, str, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._generation = 0
+        # tag -> поколение последней инвалидации; старые отметки вытесняются после max_entries,
+        # а set со снимком старше вытесненной отметки не принимается
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._oldest_generation = 0
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def set(self, key: str, value: str, tags: tuple[str, ...] = (), generation: int | None = None) -> None:
+        if generation is not None and self._changed_since(generation, tags):
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats.evictions += 1
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        self._generation += 1
+        for tag in tags:
+            self._invalidated[tag] = self._generation
+            self._invalidated.move_to_end(tag)
+        while len(self._invalidated) > self.max_entries:
+            _, self._oldest_generation = self._invalidated.popitem(last=False)
+        for tag in tags:
+            for key in self._tags.pop(tag, set()).copy():
+                if key in self._entries:
+                    self._remove(key)
+                    self.stats.invalidations += 1
+
+    async def size(self) -> int | None:
+        return len(self._entries)
+
+    def _changed_since(self, generation: int, tags: tuple[str, ...]) -> bool:
+        if generation < self._oldest_generation:
+            return True
+        return any(self._invalidated.get(tag, 0) > generation for tag in tags)
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
@@ -0,0 +1,107 @@
+from app.cache.base import CacheBackend, CacheStats
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # redis — необязательная зависимость
+    redis_asyncio = None
+
+# Проверка поколений и запись выполняются одним скриптом, атомарно относительно инвалидации.
+# KEYS[1] — ключ записи, затем по одному ключу отметки и множества на каждый тег;
+# ARGV: значение, TTL, поколение (пустая строка — без проверки)
+SET_SCRIPT = """
+local tags = (#KEYS - 1) / 2
+if ARGV[3] ~= '' then
+    for i = 2, tags + 1 do
+        local stamp = redis.call('GET', KEYS[i])
+        if stamp and tonumber(stamp) > tonumber(ARGV[3]) then
+            return 0
+        end
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = tags + 2, #KEYS do
+    redis.call('SADD', KEYS[i], KEYS[1])
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+end
+return 1
+"""
+
+# KEYS[1] — счетчик поколений, затем по одному ключу отметки и множества на каждый тег;
+# ARGV[1] — TTL отметок. Возвращает число удаленных записей
+INVALIDATE_SCRIPT = """
+local generation = redis.call('INCR', KEYS[1])
+local tags = (#KEYS - 1) / 2
+local dropped = 0
+for i = 2, tags + 1 do
+    redis.call('SET', KEYS[i], generation, 'EX', ARGV[1])
+end
+for i = tags + 2, #KEYS do
+    for _, key in ipairs(redis.call('SMEMBERS', KEYS[i])) do
+        dropped = dropped + redis.call('DEL', key)
+    end
+    redis.call('DEL', KEYS[i])
+end
+return dropped
+"""
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache backend for any Redis-protocol server (Redis, Valkey, KeyDB...).
+
+    Tags are stored as Redis sets of keys, so invalidation is shared by
+    all workers and instances that use the same server. Invalidation and
+    the generation-checked set run as Lua scripts, so a set never sees an
+    invalidation half done.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl: float = 60.0, prefix: str = "qa:"):
+        super().__init__()
+        if redis_asyncio is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package: pip install redis")
+        self.client = redis_asyncio.from_url(url)
+        self.ttl = max(1, int(ttl))
+        self.prefix = prefix
+        self.generation_key = f"{prefix}generation"
+        self._set_script = self.client.register_script(SET_SCRIPT)
+        self._invalidate_script = self.client.register_script(INVALIDATE_SCRIPT)
+
+    async def get(self, key: str) -> str | None:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value.decode()
+
+    async def generation(self) -> int:
+        value = await self.client.get(self.generation_key)
+        return int(value) if value is not None else 0
+
+    async def set(self, key: str, value: str, tags: tuple[str, ...] = (), generation: int | None = None) -> None:
+        full_key = self.prefix + key
+        await self._set_script(
+            keys=[full_key, *self._tag_keys(tags)],
+            args=[value, self.ttl, "" if generation is None else generation],
+        )
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        # Отметка живет TTL: чтение, начатое раньше, к этому времени давно закончилось
+        dropped = await self._invalidate_script(keys=[self.generation_key, *self._tag_keys(tags)], args=[self.ttl])
+        self.stats.invalidations += dropped
+
+    def _tag_keys(self, tags: tuple[str, ...]) -> list[str]:
+        stamps = [f"{self.prefix}gen:{tag}" for tag in tags]
+        members = [f"{self.prefix}tag:{tag}" for tag in tags]
+        return stamps + members
+
+    async def collect_stats(self) -> CacheStats:
+        # Вытеснение делает сам сервер по maxmemory-policy
+        info = await self.client.info("stats")
+        self.stats.evictions = int(info.get("evicted_keys", 0))
+        return self.stats
+
+    async def close(self) -> None:
+        await self.client.aclose()
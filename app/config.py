@@ -0,0 +1,214 @@
+import os
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+
+# Загрузка переменных окружения
+load_dotenv()
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.getenv(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Application settings read from environment and .env."""
+
+    # Логирование: записи пишет фоновый поток из ограниченной очереди
+    log_level: str = "INFO"
+    log_file: str = "app.log"
+    log_queue_size: int = 10_000
+    # drop — при переполнении новые записи отбрасываются и считаются, block — вызов ждет место
+    log_overflow_policy: str = "drop"
+    # text | json; в json каждая строка — JSON-объект с полями события
+    log_format: str = "text"
+    # Запись на каждый HTTP-запрос: маршрут, статус, время, время в БД, число запросов, ожидание пула
+    access_log: bool = True
+    # Запросы к БД дольше порога пишутся в лог с вероятностью sample_rate
+    slow_query_ms: float = 100.0
+    slow_query_sample_rate: float = 1.0
+
+    # Подключение к БД
+    db_host: str = "localhost"
+    db_port: int = 5432
+    db_name: str = "postgres"
+    db_user: str = "postgres"
+    db_password: str = "postgres"
+    db_echo: bool = False
+
+    # Пул соединений: всего не больше pool_size + max_overflow
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    # Общий лимит соединений на все воркеры (0 — не задан); делится поровну между воркерами
+    db_pool_total: int = 0
+    # Сколько секунд ждать свободное соединение до TimeoutError
+    db_pool_timeout: float = 30.0
+    # Пересоздавать соединения старше N секунд (-1 — никогда)
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = False
+
+    # asyncpg
+    # Размер кэша подготовленных запросов на соединение (0 — для pgbouncer в transaction mode)
+    db_statement_cache_size: int = 100
+    # Клиентский таймаут операции, секунды (0 — без таймаута)
+    db_command_timeout: float = 0.0
+    # Серверный statement_timeout для каждого запроса, мс (0 — без ограничения)
+    db_statement_timeout_ms: int = 0
+    db_application_name: str = "qa-fastapi"
+    # Проверка схемы при старте: alembic (ревизия = head) | create_all (dev) | none
+    db_schema_check: str = "alembic"
+
+    # Сервер (python -m app.server)
+    web_host: str = "0.0.0.0"
+    web_port: int = 8000
+    web_workers: int = 1
+    # auto | asyncio | uvloop и auto | h11 | httptools
+    web_loop: str = "auto"
+    web_http: str = "auto"
+    web_backlog: int = 2048
+    web_keepalive: int = 5
+    # Сколько секунд ждать завершения текущих запросов при остановке
+    web_graceful_timeout: int = 30
+    # Access log uvicorn синхронно пишет строку на каждый запрос
+    web_access_log: bool = False
+
+    # Реплика для чтения (SQLAlchemy URL); пусто — все запросы идут в primary
+    db_replica_url: str = ""
+    # При отставании реплики больше N секунд чтение идет в primary
+    replica_max_lag: float = 5.0
+    # Как часто перепроверять отставание, секунды
+    replica_lag_check_interval: float = 1.0
+    # Сколько секунд после своей записи клиент читает из primary
+    read_your_writes_window: float = 5.0
+
+    # Стратегия подсчета total: exact | cached | counter | estimate
+    questions_count_strategy: str = "exact"
+    answers_count_strategy: str = "exact"
+    # TTL (секунды) для стратегии cached
+    count_cache_ttl: float = 30.0
+
+    # Кэш ответов на чтение: none | memory | redis
+    cache_backend: str = "none"
+    cache_ttl: float = 60.0
+    cache_max_entries: int = 10_000
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Максимум элементов в одном batch-запросе на создание
+    batch_max_size: int = 1000
+
+    # Сколько совпадений на каждую таблицу ранжирует поиск; 0 — все. Для частых слов ранжируются
+    # первые найденные, а не все сотни тысяч совпадений
+    search_max_candidates: int = 5000
+    # postgres — tsvector и GIN-индексы; memory — инвертированный индекс в памяти каждого воркера
+    search_backend: str = "postgres"
+    # Снимок индекса для SEARCH_BACKEND=memory; пусто — индекс строится из таблиц при каждом старте
+    search_index_path: str = "search_index.bin"
+
+    # Строк за один FETCH курсора в GET /export; от него зависит память на одну выгрузку
+    export_batch_size: int = 1000
+    # Строк NDJSON в одной пачке импорта: одна транзакция с COPY и сдвигом контрольной точки
+    import_batch_size: int = 1000
+    # Сколько отклоненных строк перечислять в ответе POST /import
+    import_max_errors: int = 1000
+
+    # Ответы сериализуются pydantic-core сразу в байты, без повторной валидации по response_model
+    fast_json: bool = False
+
+    @property
+    def worker_pool_limits(self) -> tuple[int, int]:
+        """
+        Pool size and max overflow of one worker process.
+
+        With DB_POOL_TOTAL set, every worker gets an equal share of it as a
+        fixed pool without overflow, so all workers together never open
+        more than DB_POOL_TOTAL connections.
+        """
+        if self.db_pool_total <= 0:
+            return self.db_pool_size, self.db_max_overflow
+        return max(1, self.db_pool_total // max(1, self.web_workers)), 0
+
+    @property
+    def database_url(self) -> str:
+        return (f"postgresql+asyncpg://{self.db_user}:{self.db_password}@"
+                f"{self.db_host}:{self.db_port}/{self.db_name}")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            log_level=_env_str("LOG_LEVEL", cls.log_level),
+            log_file=_env_str("LOG_FILE", cls.log_file),
+            log_queue_size=_env_int("LOG_QUEUE_SIZE", cls.log_queue_size),
+            log_overflow_policy=_env_str("LOG_OVERFLOW_POLICY", cls.log_overflow_policy),
+            log_format=_env_str("LOG_FORMAT", cls.log_format),
+            access_log=_env_bool("ACCESS_LOG", cls.access_log),
+            slow_query_ms=_env_float("SLOW_QUERY_MS", cls.slow_query_ms),
+            slow_query_sample_rate=_env_float("SLOW_QUERY_SAMPLE_RATE", cls.slow_query_sample_rate),
+            db_host=_env_str("DB_HOST", cls.db_host),
+            db_port=_env_int("DB_PORT", cls.db_port),
+            db_name=_env_str("DB_NAME", cls.db_name),
+            db_user=_env_str("DB_USER", cls.db_user),
+            db_password=_env_str("DB_PWD", cls.db_password),
+            db_echo=_env_bool("DB_ECHO", cls.db_echo),
+            db_pool_size=_env_int("DB_POOL_SIZE", cls.db_pool_size),
+            db_max_overflow=_env_int("DB_MAX_OVERFLOW", cls.db_max_overflow),
+            db_pool_total=_env_int("DB_POOL_TOTAL", cls.db_pool_total),
+            db_pool_timeout=_env_float("DB_POOL_TIMEOUT", cls.db_pool_timeout),
+            db_pool_recycle=_env_int("DB_POOL_RECYCLE", cls.db_pool_recycle),
+            db_pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.db_pool_pre_ping),
+            db_statement_cache_size=_env_int("DB_STATEMENT_CACHE_SIZE", cls.db_statement_cache_size),
+            db_command_timeout=_env_float("DB_COMMAND_TIMEOUT", cls.db_command_timeout),
+            db_statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", cls.db_statement_timeout_ms),
+            db_application_name=_env_str("DB_APPLICATION_NAME", cls.db_application_name),
+            db_schema_check=_env_str("DB_SCHEMA_CHECK", cls.db_schema_check),
+            web_host=_env_str("WEB_HOST", cls.web_host),
+            web_port=_env_int("WEB_PORT", cls.web_port),
+            # То же имя читает сам uvicorn
+            web_workers=_env_int("WEB_CONCURRENCY", cls.web_workers),
+            web_loop=_env_str("WEB_LOOP", cls.web_loop),
+            web_http=_env_str("WEB_HTTP", cls.web_http),
+            web_backlog=_env_int("WEB_BACKLOG", cls.web_backlog),
+            web_keepalive=_env_int("WEB_KEEPALIVE", cls.web_keepalive),
+            web_graceful_timeout=_env_int("WEB_GRACEFUL_TIMEOUT", cls.web_graceful_timeout),
+            web_access_log=_env_bool("WEB_ACCESS_LOG", cls.web_access_log),
+            db_replica_url=_env_str("DB_REPLICA_URL", cls.db_replica_url),
+            replica_max_lag=_env_float("REPLICA_MAX_LAG", cls.replica_max_lag),
+            replica_lag_check_interval=_env_float("REPLICA_LAG_CHECK_INTERVAL", cls.replica_lag_check_interval),
+            read_your_writes_window=_env_float("READ_YOUR_WRITES_WINDOW", cls.read_your_writes_window),
+            questions_count_strategy=_env_str("QUESTIONS_COUNT_STRATEGY", cls.questions_count_strategy),
+            answers_count_strategy=_env_str("ANSWERS_COUNT_STRATEGY", cls.answers_count_strategy),
+            count_cache_ttl=_env_float("COUNT_CACHE_TTL", cls.count_cache_ttl),
+            cache_backend=_env_str("CACHE_BACKEND", cls.cache_backend),
+            cache_ttl=_env_float("CACHE_TTL", cls.cache_ttl),
+            cache_max_entries=_env_int("CACHE_MAX_ENTRIES", cls.cache_max_entries),
+            redis_url=_env_str("REDIS_URL", cls.redis_url),
+            batch_max_size=_env_int("BATCH_MAX_SIZE", cls.batch_max_size),
+            search_max_candidates=_env_int("SEARCH_MAX_CANDIDATES", cls.search_max_candidates),
+            search_backend=_env_str("SEARCH_BACKEND", cls.search_backend),
+            search_index_path=_env_str("SEARCH_INDEX_PATH", cls.search_index_path),
+            export_batch_size=_env_int("EXPORT_BATCH_SIZE", cls.export_batch_size),
+            import_batch_size=_env_int("IMPORT_BATCH_SIZE", cls.import_batch_size),
+            import_max_errors=_env_int("IMPORT_MAX_ERRORS", cls.import_max_errors),
+            fast_json=_env_bool("FAST_JSON", cls.fast_json),
+        )
+
+
+settings = Settings.from_env()
@@ -1,42 +1,91 @@
-from dotenv import load_dotenv
-import os
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 
+from app.config import settings
 from app.logging_config import setup_logger
 from app.database.models import Base
+from app.database.pool import InstrumentedPool
+from app.metrics import PoolMetrics
+from app.observability import instrument_engine
 
 
 # Настройка логирования
 logger = setup_logger(__name__)
 
-# Загрузка переменных окружения
-load_dotenv()
 
-DATABASE_CONFIG = {
-    "host": os.getenv("DB_HOST", "localhost"),
-    "port": os.getenv("DB_PORT", 5432),
-    "database": os.getenv("DB_NAME", "postgres"),
-    "user": os.getenv("DB_USER", "postgres"),
-    "password": os.getenv("DB_PASSWORD", "postgres"),
-}
+DSN = settings.database_url
 
 
-DSN = (f"postgresql+asyncpg://{DATABASE_CONFIG['user']}:{DATABASE_CONFIG['password']}@"
-       f"{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/{DATABASE_CONFIG['database']}")
+def connect_args() -> dict:
+    """asyncpg connection arguments from settings."""
+    server_settings = {"application_name": settings.db_application_name}
+    if settings.db_statement_timeout_ms:
+        server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+    args = {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "server_settings": server_settings,
+    }
+    if settings.db_command_timeout:
+        args["command_timeout"] = settings.db_command_timeout
+    return args
 
-engine = create_async_engine(
-    url=DSN,
-    echo=False,
-    pool_size=5,
-    max_overflow=10
-)
 
-async_session_factory = async_sessionmaker(
-    bind=engine,
-    expire_on_commit=False,
-    autoflush=False,
-    class_=AsyncSession
-)
+def create_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """
+    Async engine with pool and asyncpg options from settings.
+
+    Args:
+        url: SQLAlchemy database URL
+        name: Label of the engine's pool in metrics
+    """
+    if not url.startswith("postgresql+asyncpg"):
+        # Локальная замена реплики (например, sqlite+aiosqlite) — без настроек пула и asyncpg
+        engine = create_async_engine(url=url, echo=settings.db_echo)
+    else:
+        # Движок создается при импорте в каждом процессе-воркере, пул — на долю воркера
+        pool_size, max_overflow = settings.worker_pool_limits
+        engine = create_async_engine(
+            url=url,
+            echo=settings.db_echo,
+            poolclass=InstrumentedPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            connect_args=connect_args(),
+        )
+        engine.pool.set_metrics(PoolMetrics(name))
+    # Время запросов для access log и медленных запросов
+    instrument_engine(engine)
+    return engine
+
+
+def create_session_factory(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=bind,
+        expire_on_commit=False,
+        autoflush=False,
+        class_=AsyncSession
+    )
+
+
+engine = create_engine(DSN)
+async_session_factory = create_session_factory(engine)
+
+# Реплика только для чтения; None, если DB_REPLICA_URL не задан
+replica_engine = create_engine(settings.db_replica_url, "replica") if settings.db_replica_url else None
+replica_session_factory = create_session_factory(replica_engine) if replica_engine is not None else None
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Return the session's connection to the pool once its reads are done.
+
+    Loaded objects stay usable after close (expire_on_commit=False and
+    nothing is expired), so responses are built without holding a
+    connection. A later query in the same request checks one out again.
+    """
+    await session.close()
 
 
 async def init_db():
@@ -45,9 +94,11 @@ async def init_db():
             await conn.run_sync(Base.metadata.create_all)
             logger.info("Database initialized")
     except Exception as e:
-        logger.error(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
 
 
 async def close_db():
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Database closed")
\ No newline at end of file
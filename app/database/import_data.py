@@ -0,0 +1,64 @@
+# Загрузка вопросов с ответами из NDJSON (формат GET /api/v1/export) через COPY
+# Запуск: python -m app.database.import_data legacy.ndjson --job legacy --rejects rejected.ndjson
+# Повторный запуск с тем же --job продолжает после последней загруженной пачки.
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import AsyncIterator
+from typing import BinaryIO
+
+from app.config import settings
+from app.database.db import async_session_factory, close_db
+from app.repository.import_repository import ImportRepository
+from app.schemes.import_scheme import ImportRejectedLine
+from app.services.import_service import ImportService
+
+
+async def read_lines(file: BinaryIO) -> AsyncIterator[bytes]:
+    for line in file:
+        yield line
+
+
+async def import_file(file: BinaryIO, job: str, batch_size: int, rejects: BinaryIO | None) -> int:
+    def write_reject(rejected: ImportRejectedLine, line: bytes) -> None:
+        record = {**rejected.model_dump(), "record": line.decode("utf-8", "replace")}
+        rejects.write(json.dumps(record, ensure_ascii=False).encode() + b"\n")
+
+    # Без SEARCH_BACKEND=memory в этом процессе: индекс запущенного приложения догонит таблицы при рестарте
+    service = ImportService(ImportRepository(), batch_size=batch_size, max_errors=0)
+    try:
+        async with async_session_factory() as session:
+            result = await service.import_lines(session, job, read_lines(file),
+                                                on_reject=write_reject if rejects is not None else None)
+    finally:
+        await close_db()
+
+    if result.resumed_from:
+        print(f"Resumed after line {result.resumed_from}")
+    print(f"Job {job}: {result.questions} questions, {result.answers} answers loaded, "
+          f"{result.rejected} lines rejected, checkpoint at line {result.position}")
+    return 1 if result.rejected else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk import questions with answers from NDJSON using COPY")
+    parser.add_argument("path", help="NDJSON file, - for stdin")
+    parser.add_argument("--job", required=True, help="job name; a rerun with the same job resumes after its checkpoint")
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size, help="lines per transaction")
+    parser.add_argument("--rejects", help="write rejected lines with their errors to this NDJSON file")
+    args = parser.parse_args()
+
+    file = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    rejects = open(args.rejects, "ab") if args.rejects else None
+    try:
+        return asyncio.run(import_file(file, args.job, args.batch_size, rejects))
+    finally:
+        file.close()
+        if rejects is not None:
+            rejects.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
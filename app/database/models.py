@@ -1,4 +1,5 @@
-from sqlalchemy import Integer, String, TIMESTAMP, ForeignKey, func
+from sqlalchemy import BigInteger, Column, Computed, Integer, String, TIMESTAMP, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from datetime import datetime
@@ -8,6 +9,10 @@ from app.logging_config import setup_logger
 # Настройка логирования
 logger = setup_logger(__name__)
 
+# Конфигурация полнотекстового поиска: russian стеммит кириллицу, латиницу — английским стеммером.
+# Зашита в сгенерированные колонки, смена требует миграции
+SEARCH_CONFIG = "russian"
+
 
 class Base(DeclarativeBase, AsyncAttrs):
     pass
@@ -21,6 +26,13 @@ class Question(Base):
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
     )
+    # Денормализованный счетчик ответов, поддерживается AnswerRepository
+    answer_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
+    # Вычисляется PostgreSQL при записи. Есть только в таблице, не в маппинге (exclude_properties):
+    # ORM не читает его вместе с вопросом и не запрашивает в INSERT ... RETURNING
+    search_vector = Column(
+        TSVECTOR, Computed(f"to_tsvector('{SEARCH_CONFIG}', text)", persisted=True), nullable=False
+    )
 
     answers: Mapped[list["Answer"]] = relationship(
         "Answer",
@@ -29,6 +41,14 @@ class Question(Base):
         passive_deletes=True
     )
 
+    __table_args__ = (
+        # Keyset-пагинация списка вопросов по (created_at, id)
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        Index("ix_questions_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    # id, created_at и answer_count возвращаются из INSERT ... RETURNING, без SELECT после commit
+    __mapper_args__ = {"eager_defaults": True, "exclude_properties": ["search_vector"]}
+
 
 class Answer(Base):
     __tablename__ = "answers"
@@ -48,10 +68,43 @@ class Answer(Base):
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
     )
+    search_vector = Column(
+        TSVECTOR, Computed(f"to_tsvector('{SEARCH_CONFIG}', text)", persisted=True), nullable=False
+    )
 
     question: Mapped["Question"] = relationship("Question", back_populates="answers")
     # user: Mapped["User"] = relationship("User", back_populates="answers")
 
+    __table_args__ = (
+        # Keyset-пагинация ответов внутри вопроса; покрывает и поиск по FK question_id
+        Index("ix_answers_question_id_created_at_id", "question_id", "created_at", "id"),
+        Index("ix_answers_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"eager_defaults": True, "exclude_properties": ["search_vector"]}
+
+
+class Counter(Base):
+    """Global named counters, e.g. total number of questions."""
+    __tablename__ = "counters"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+
+
+class ImportCheckpoint(Base):
+    """Progress of a bulk import job, committed together with every loaded batch."""
+    __tablename__ = "import_checkpoints"
+
+    job: Mapped[str] = mapped_column(String(128), primary_key=True)
+    # Сколько строк входного NDJSON уже обработано: загружены или отклонены
+    position: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    questions: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    answers: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    rejected: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+
 
 # class User(Base):
 #     __tablename__ = "users"
@@ -0,0 +1,93 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.metrics import PoolMetrics
+from app.observability import current_request_stats
+
+
+# Ключ в ConnectionRecord.info с моментом выдачи соединения
+_CHECKED_OUT_AT = "checked_out_at"
+
+
+@dataclass
+class PoolUsageStats:
+    """Connection checkout counters since process start."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    # Сколько соединение было занято от выдачи до возврата в пул
+    checkins: int = 0
+    hold_total: float = 0.0
+    hold_max: float = 0.0
+
+    def record_wait(self, waited: float) -> None:
+        self.checkouts += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def record_hold(self, held: float) -> None:
+        self.checkins += 1
+        self.hold_total += held
+        self.hold_max = max(self.hold_max, held)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that measures checkout wait and connection hold times.
+
+    The wait includes opening a new connection when the pool grows,
+    which is what a request actually spends before its first query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.usage = PoolUsageStats()
+        # Метка по умолчанию; create_engine задает свою через set_metrics
+        self.metrics = PoolMetrics("primary")
+
+    def set_metrics(self, metrics: PoolMetrics) -> None:
+        """Report this pool under the given metric labels."""
+        self.metrics = metrics
+        self.metrics.size.set(self.size())
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.usage.timeouts += 1
+            self.metrics.timeouts.inc()
+            raise
+        checked_out_at = time.perf_counter()
+        waited = checked_out_at - started
+        self.usage.record_wait(waited)
+        self.metrics.wait.observe(waited)
+        self.metrics.checked_out.inc()
+        self.metrics.overflow.set(max(self.overflow(), 0))
+        request_stats = current_request_stats()
+        if request_stats is not None:
+            request_stats.pool_wait += waited
+        connection.info[_CHECKED_OUT_AT] = checked_out_at
+        return connection
+
+    def _do_return_conn(self, record):
+        checked_out_at = record.info.pop(_CHECKED_OUT_AT, None)
+        if checked_out_at is not None:
+            held = time.perf_counter() - checked_out_at
+            self.usage.record_hold(held)
+            self.metrics.hold.observe(held)
+            self.metrics.checked_out.dec()
+        super()._do_return_conn(record)
+        self.metrics.overflow.set(max(self.overflow(), 0))
+
+    def recreate(self):
+        # Счетчики переживают engine.dispose(), новый пул наследует их
+        pool = super().recreate()
+        pool.usage = self.usage
+        pool.set_metrics(self.metrics)
+        return pool
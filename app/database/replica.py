@@ -0,0 +1,82 @@
+import math
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# Cookie с временем последней записи клиента (unix time)
+LAST_WRITE_COOKIE = "qa_last_write"
+
+# NULL на primary (не в recovery) — отставания нет
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+
+class ReplicaLagMonitor:
+    """
+    Replication lag of a read replica, re-checked at most once per interval.
+
+    A failed check counts as infinite lag, so reads fall back to the
+    primary until the replica answers again.
+    """
+
+    def __init__(self, engine: AsyncEngine, check_interval: float = 1.0):
+        self.engine = engine
+        self.check_interval = check_interval
+        self._lag = 0.0
+        self._checked_at = -math.inf
+
+    async def lag(self) -> float:
+        """
+        Current replication lag in seconds.
+
+        Returns:
+            Cached lag if it was checked recently, otherwise a fresh value
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._lag
+        # Отметка до запроса, чтобы параллельные запросы не проверяли реплику одновременно
+        self._checked_at = now
+        if self.engine.dialect.name != "postgresql":
+            # Локальная замена реплики не реплицируется и не отстает
+            self._lag = 0.0
+            return self._lag
+        try:
+            async with self.engine.connect() as conn:
+                self._lag = float(await conn.scalar(_LAG_SQL) or 0.0)
+        except Exception as e:
+            logger.warning("Replica lag check failed: %s", e)
+            self._lag = math.inf
+        return self._lag
+
+
+def mark_write(response: Response, window: float) -> None:
+    """Remember the client's write so its next reads go to the primary."""
+    response.set_cookie(
+        LAST_WRITE_COOKIE,
+        f"{time.time():.3f}",
+        max_age=math.ceil(window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def wrote_recently(request: Request, window: float) -> bool:
+    """Check if the client wrote within the read-your-writes window."""
+    value = request.cookies.get(LAST_WRITE_COOKIE)
+    if not value:
+        return False
+    try:
+        return time.time() - float(value) < window
+    except ValueError:
+        return False
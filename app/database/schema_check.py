@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# SQLSTATE undefined_table
+UNDEFINED_TABLE = "42P01"
+
+
+class SchemaMismatchError(RuntimeError):
+    """Database schema revision doesn't match the Alembic head of the code."""
+
+
+def alembic_heads() -> set[str]:
+    """Head revisions of the migration scripts shipped with the code."""
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def check_schema_revision(engine: AsyncEngine) -> None:
+    """
+    Compare the database revision with the Alembic head using one query.
+
+    Args:
+        engine: Engine of the primary database
+
+    Raises:
+        SchemaMismatchError: If migrations are not applied or the database is ahead of the code
+        DBAPIError: If the database is unreachable or the query fails for another reason
+    """
+    expected = alembic_heads()
+    try:
+        async with engine.connect() as conn:
+            current = set((await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars())
+    except DBAPIError as e:
+        # Ошибки соединения и прочие ошибки драйвера — не признак непримененных миграций
+        if getattr(e.orig, "sqlstate", None) != UNDEFINED_TABLE:
+            raise
+        raise SchemaMismatchError("alembic_version table is missing, run 'alembic upgrade head'") from e
+
+    if current != expected:
+        raise SchemaMismatchError(
+            f"Database revision {sorted(current) or 'none'} doesn't match Alembic head {sorted(expected)}, "
+            f"run 'alembic upgrade head'"
+        )
+    logger.info("Database schema is at Alembic head %s", ", ".join(sorted(expected)))
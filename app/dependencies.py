@@ -1,37 +1,212 @@
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+import os
+import time
 
-from app.database.db import async_session_factory
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.base import CacheBackend
+from app.cache.memory import MemoryCache
+from app.cache.redis_cache import RedisCache
+from app.config import settings
+from app.database.db import async_session_factory, replica_engine, replica_session_factory
+from app.database.replica import ReplicaLagMonitor, mark_write, wrote_recently
 from app.repository.answer_repository import AnswerRepository
+from app.repository.counting import CountStrategy
+from app.repository.export_repository import ExportRepository
+from app.repository.import_repository import ImportRepository
 from app.repository.question_repository import QuestionRepository
+from app.repository.search_repository import IndexSearchRepository, SearchRepository
+from app.search.inverted_index import InvertedIndex
 from app.services.answer_service import AnswerService
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
 from app.services.question_service import QuestionService
+from app.services.search_service import SearchService
 from app.logging_config import setup_logger
 
 
 logger = setup_logger(__name__)
 
+# Проверяются при импорте, чтобы неверная настройка ломала старт, а не запросы
+QUESTIONS_COUNT_STRATEGY = CountStrategy(settings.questions_count_strategy)
+ANSWERS_COUNT_STRATEGY = CountStrategy(settings.answers_count_strategy)
+
+
+def create_cache() -> CacheBackend | None:
+    if settings.cache_backend == "none":
+        return None
+    if settings.cache_backend == "memory":
+        return MemoryCache(max_entries=settings.cache_max_entries, ttl=settings.cache_ttl)
+    if settings.cache_backend == "redis":
+        return RedisCache(url=settings.redis_url, ttl=settings.cache_ttl)
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.cache_backend}")
+
+
+# Один кэш на процесс, общий для всех запросов
+cache = create_cache()
+
+
+def get_cache() -> CacheBackend | None:
+    return cache
+
+
+def get_response_cache(request: Request, cache: CacheBackend | None = Depends(get_cache)) -> CacheBackend | None:
+    """
+    Response cache for a service, skipped by reads inside the read-your-writes window.
+
+    Another client's replica read may put a body older than the write back
+    into the cache right after the writer's invalidation; the writer's reads
+    routed to the primary neither read nor fill the cache. Writes keep the
+    cache to invalidate it.
+
+    Args:
+        request: Incoming request, carries the client's last write cookie
+        cache: Process-wide cache backend
+
+    Returns:
+        The cache backend, or None for a read that must see the client's writes
+    """
+    if (cache is not None and replica_monitor is not None and request.method in ("GET", "HEAD")
+            and wrote_recently(request, settings.read_your_writes_window)):
+        return None
+    return cache
+
+
+def create_search_index() -> InvertedIndex | None:
+    if settings.search_backend == "postgres":
+        return None
+    if settings.search_backend == "memory":
+        return InvertedIndex()
+    raise ValueError(f"Unknown SEARCH_BACKEND: {settings.search_backend}")
+
+
+# Индекс поиска на процесс; репозитории вопросов и ответов обновляют его при записи
+search_index = create_search_index()
+
+
+async def restore_search_index() -> None:
+    """Load the index snapshot, apply changes made since it was saved and save it again."""
+    path = settings.search_index_path
+    if path and os.path.exists(path):
+        started = time.perf_counter()
+        try:
+            search_index.load(path)
+            logger.info("Search index loaded from %s in %.2fs: %s documents",
+                        path, time.perf_counter() - started, len(search_index))
+        except (OSError, ValueError) as e:
+            logger.warning("Search index snapshot %s is unusable, rebuilding: %s", path, e)
+    started = time.perf_counter()
+    async with async_session_factory() as session:
+        changed = await IndexSearchRepository(search_index).sync(session)
+    logger.info("Search index synced in %.2fs", time.perf_counter() - started)
+    if changed:
+        save_search_index()
+
 
-def get_answer_service() -> AnswerService:
-    return AnswerService(repository=AnswerRepository())
+def save_search_index() -> None:
+    if settings.search_index_path:
+        started = time.perf_counter()
+        search_index.save(settings.search_index_path)
+        logger.info("Search index saved to %s in %.2fs", settings.search_index_path, time.perf_counter() - started)
+
+
+def get_answer_service(cache: CacheBackend | None = Depends(get_response_cache)) -> AnswerService:
+    return AnswerService(
+        repository=AnswerRepository(search_index=search_index),
+        cache=cache,
+    )
 
 
 def get_question_service(
     answer_service: AnswerService = Depends(get_answer_service),
+    cache: CacheBackend | None = Depends(get_response_cache),
 ) -> QuestionService:
     return QuestionService(
-        repository=QuestionRepository(),
+        repository=QuestionRepository(
+            count_strategy=QUESTIONS_COUNT_STRATEGY,
+            answers_count_strategy=ANSWERS_COUNT_STRATEGY,
+            search_index=search_index,
+        ),
         answer_service=answer_service,
+        cache=cache,
     )
 
 
-async def get_async_session() -> AsyncSession:
-    async with async_session_factory() as session:
+def get_search_service() -> SearchService:
+    if search_index is not None:
+        repository = IndexSearchRepository(search_index, max_candidates=settings.search_max_candidates)
+    else:
+        repository = SearchRepository(max_candidates=settings.search_max_candidates)
+    return SearchService(repository=repository)
+
+
+def get_export_service() -> ExportService:
+    return ExportService(repository=ExportRepository(), batch_size=settings.export_batch_size)
+
+
+def get_import_service(cache: CacheBackend | None = Depends(get_cache)) -> ImportService:
+    return ImportService(
+        repository=ImportRepository(search_index=search_index),
+        cache=cache,
+        batch_size=settings.import_batch_size,
+        max_errors=settings.import_max_errors,
+    )
+
+
+# Один монитор отставания реплики на процесс
+replica_monitor = (
+    ReplicaLagMonitor(replica_engine, check_interval=settings.replica_lag_check_interval)
+    if replica_engine is not None else None
+)
+
+
+async def _session_scope(factory: async_sessionmaker[AsyncSession]) -> AsyncSession:
+    # Сессия берет соединение из пула только при первом запросе к БД: ответы из кэша
+    # и отклоненные валидацией запросы пул не трогают. Сервисы возвращают соединение
+    # через release_connection сразу после чтения, до сборки Pydantic-ответа.
+    async with factory() as session:
         try:
             yield session
         except Exception as e:
             await session.rollback()
-            logger.error(f"Error in async session: {e}")
+            logger.error("Error in async session: %s", e)
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_async_session(response: Response) -> AsyncSession:
+    """Session on the primary, for routes that write."""
+    if replica_monitor is not None:
+        mark_write(response, settings.read_your_writes_window)
+    async for session in _session_scope(async_session_factory):
+        yield session
+
+
+async def choose_read_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    """
+    Pick the replica for a read unless it lags or the client wrote recently.
+
+    Args:
+        request: Incoming request, carries the client's last write cookie
+
+    Returns:
+        Session factory of the replica or of the primary
+    """
+    if replica_monitor is None:
+        return async_session_factory
+    if wrote_recently(request, settings.read_your_writes_window):
+        logger.debug("Read routed to primary: read-your-writes window")
+        return async_session_factory
+    lag = await replica_monitor.lag()
+    if lag > settings.replica_max_lag:
+        logger.debug("Read routed to primary: replica lag %.1fs", lag)
+        return async_session_factory
+    return replica_session_factory
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """Session for read-only routes, on a replica when one is usable."""
+    factory = await choose_read_factory(request)
+    async for session in _session_scope(factory):
+        yield session
@@ -24,3 +24,8 @@ class ConflictError(AppError):
 class ValidationError(AppError):
     status_code = 400
     code = "validation_error"
+
+
+class ServiceUnavailableError(AppError):
+    status_code = 503
+    code = "service_unavailable"
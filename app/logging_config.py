@@ -1,26 +1,136 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
+from app.config import settings
+from app.metrics import LOG_RECORDS_DROPPED
 
-def setup_logger(name: str) -> logging.Logger:
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
 
-    if not logger.handlers:
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra={"fields": {...}}`` adds event fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(getattr(record, "fields", {}))
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the event loop on a full queue.
+
+    Only the message itself is rendered on the calling thread; the
+    timestamp, layout and file I/O happen in the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = "drop"):
+        super().__init__(log_queue)
+        if overflow_policy not in ("drop", "block"):
+            raise ValueError(f"Unknown LOG_OVERFLOW_POLICY: {overflow_policy}")
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Аргументы подставляются сразу: объекты могут измениться, пока запись ждет в очереди
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+class DrainingQueueListener(QueueListener):
+    """Queue listener whose ``stop()`` waits for room in a full queue instead of failing."""
+
+    def enqueue_sentinel(self) -> None:
+        # QueueListener кладет маркер остановки через put_nowait и на полной очереди падает
+        # с queue.Full; поток записи продолжает разбирать очередь, место освободится
+        self.queue.put(self._sentinel)
+
+
+_queue_handler: BoundedQueueHandler | None = None
+_listener: QueueListener | None = None
+_setup_lock = threading.Lock()
+
+
+def _start_listener() -> BoundedQueueHandler:
+    """Create the shared queue handler and the writer thread once per process."""
+    global _queue_handler, _listener
+    with _setup_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        if settings.log_format == "json":
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
 
         # Обработчик для вывода в терминал
         stream_handler = logging.StreamHandler()
         stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
 
         # Обработчик для записи в файл с ротацией
         file_handler = RotatingFileHandler(
-            "app.log", maxBytes=10_000_000, backupCount=5
+            settings.log_file, maxBytes=10_000_000, backupCount=5
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
 
-    return logger
\ No newline at end of file
+        # Буфер записей между event loop и потоком записи
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+        _queue_handler = BoundedQueueHandler(log_queue, settings.log_overflow_policy)
+        _listener = DrainingQueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        # При выходе поток записи дописывает все, что осталось в очереди
+        atexit.register(stop_logging)
+        return _queue_handler
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records() -> int:
+    """Number of records dropped because the queue was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def setup_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(settings.log_level)
+
+    if not logger.handlers:
+        logger.addHandler(_start_listener())
+
+    return logger
@@ -1,11 +1,22 @@
-from fastapi import FastAPI, Request
+import os
+
+from fastapi import FastAPI, Request, Response
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 
-from app.database.db import init_db, close_db
+from app.config import settings
+from app.database.db import engine, init_db, close_db
+from app.database.schema_check import check_schema_revision
+from app.dependencies import cache, restore_search_index, save_search_index, search_index
 from app.logging_config import setup_logger
-from app.routes import question_routes, answer_routes
-from app.errors import AppError
+from app.metrics import mark_worker_dead, record_error, render_metrics
+from app.observability import ObservabilityMiddleware
+from app.routes import question_routes, answer_routes, export_routes, import_routes, search_routes, \
+    system_routes
+from app.errors import AppError, ServiceUnavailableError
 
 
 # Настройка логирования
@@ -16,14 +27,34 @@ logger = setup_logger(__name__)
 async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения"""
     logger.info("Starting application")
-    await init_db()
+    pool_size, max_overflow = settings.worker_pool_limits
+    logger.info("Worker %s: pool_size=%s, max_overflow=%s, workers=%s",
+                os.getpid(), pool_size, max_overflow, settings.web_workers)
+    if settings.db_schema_check == "alembic":
+        # Несовпадение ревизии останавливает воркер до приема запросов
+        await check_schema_revision(engine)
+    elif settings.db_schema_check == "create_all":
+        await init_db()
+    elif settings.db_schema_check != "none":
+        raise ValueError(f"Unknown DB_SCHEMA_CHECK: {settings.db_schema_check}")
+    if search_index is not None:
+        if settings.web_workers > 1:
+            # Запись через другой воркер этот индекс не увидит до перезапуска
+            logger.warning("SEARCH_BACKEND=memory with %s workers: every worker keeps its own index",
+                           settings.web_workers)
+        await restore_search_index()
     logger.info("Application started")
 
     try:
         yield
     finally:
         logger.info("Stopping application")
+        if search_index is not None:
+            save_search_index()
         await close_db()
+        if cache is not None:
+            await cache.close()
+        mark_worker_dead(os.getpid())
         logger.info("Application stopped")
 
 
@@ -38,16 +69,38 @@ app = FastAPI(
 
 @app.exception_handler(AppError)
 async def app_error_handler(request: Request, exc: AppError):
-    logger.warning(f"AppError {exc.code}: {exc.message}")
+    logger.warning("AppError %s: %s", exc.code, exc.message)
+    record_error(request.scope, exc.code)
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": {"code": exc.code, "message": exc.message}}
     )
 
 
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # Все соединения пула заняты дольше DB_POOL_TIMEOUT
+    return await app_error_handler(request, ServiceUnavailableError("Database connection pool exhausted"))
+
+
+@app.exception_handler(DBAPIError)
+async def dbapi_error_handler(request: Request, exc: DBAPIError):
+    # 57014 query_canceled — сработал DB_STATEMENT_TIMEOUT_MS
+    if getattr(exc.orig, "pgcode", None) == "57014":
+        return await app_error_handler(request, ServiceUnavailableError("Database statement timeout"))
+    return await generic_exception_handler(request, exc)
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    record_error(request.scope, "request_validation_error")
+    return await request_validation_exception_handler(request, exc)
+
+
 @app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
     logger.exception("Unhandled exception", exc_info=exc)
+    record_error(request.scope, "internal_error")
     return JSONResponse(
         status_code=500,
         content={"error": {"code": "internal_error", "message": "Internal server error"}}
@@ -59,6 +112,19 @@ async def root():
     return {"message": "Hello World"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+app.add_middleware(ObservabilityMiddleware)
+
+
 # Регистрация маршрутов
 app.include_router(question_routes.router)
-app.include_router(answer_routes.router)
\ No newline at end of file
+app.include_router(answer_routes.router)
+app.include_router(search_routes.router)
+app.include_router(export_routes.router)
+app.include_router(import_routes.router)
+app.include_router(system_routes.router)
\ No newline at end of file
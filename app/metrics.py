@@ -0,0 +1,108 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Значения пишутся без блокировок между процессами: в multiprocess-режиме каждый воркер
+# пишет в свои mmap-файлы в PROMETHEUS_MULTIPROC_DIR, а /metrics суммирует их при чтении
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Метка для запросов, не совпавших ни с одним маршрутом: сырой путь раздул бы число серий
+UNMATCHED_ROUTE = "unmatched"
+
+_QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"]
+)
+HTTP_ERRORS = Counter(
+    "http_errors_total", "Error responses by error code", ["route", "code"]
+)
+
+REPOSITORY_DURATION = Histogram(
+    "db_repository_call_duration_seconds", "Duration of repository methods, including all their queries",
+    ["operation"], buckets=_QUERY_BUCKETS,
+)
+
+# Метка pool: primary или replica
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool size", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections checked out of the pool", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections opened above the pool size", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total", "Checkouts that timed out waiting for a connection", ["pool"]
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection", ["pool"], buckets=_QUERY_BUCKETS
+)
+DB_POOL_HOLD = Histogram(
+    "db_pool_hold_seconds", "Time a connection stays checked out", ["pool"], buckets=_QUERY_BUCKETS
+)
+
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+
+class PoolMetrics:
+    """Metric children of one connection pool, resolved once instead of per checkout."""
+
+    def __init__(self, pool: str):
+        self.size = DB_POOL_SIZE.labels(pool)
+        self.checked_out = DB_POOL_CHECKED_OUT.labels(pool)
+        self.overflow = DB_POOL_OVERFLOW.labels(pool)
+        self.timeouts = DB_POOL_TIMEOUTS.labels(pool)
+        self.wait = DB_POOL_WAIT.labels(pool)
+        self.hold = DB_POOL_HOLD.labels(pool)
+
+
+def route_label(scope) -> str:
+    """Route template of a matched request, e.g. /api/v1/questions/{question_id}."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def record_request(method: str, route: str, status: int, duration: float) -> None:
+    HTTP_REQUESTS.labels(method, route, str(status)).inc()
+    HTTP_REQUEST_DURATION.labels(method, route).observe(duration)
+
+
+def record_error(scope, code: str) -> None:
+    HTTP_ERRORS.labels(route_label(scope), code).inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Exposition of all metrics in Prometheus text format.
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop livesum gauges of a stopped worker in multiprocess mode."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,164 @@
+import functools
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.logging_config import setup_logger
+from app.metrics import REPOSITORY_DURATION, UNMATCHED_ROUTE, record_request, route_label
+
+access_logger = setup_logger("app.access")
+query_logger = setup_logger("app.queries")
+
+# Ключ в Connection.info со стеком времен начала запросов
+_QUERY_STARTED = "query_started"
+# Сколько символов SQL попадает в запись о медленном запросе
+_STATEMENT_LOG_LIMIT = 1000
+
+
+@dataclass
+class RequestStats:
+    """Database usage of one HTTP request."""
+
+    queries: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+# Метод репозитория, внутри которого выполняется запрос, например QuestionRepository.get_all
+_current_operation: ContextVar[str | None] = ContextVar("current_operation", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    """Stats of the request being handled, None outside of a request."""
+    return _request_stats.get()
+
+
+def repository_operation(func):
+    """
+    Time a repository method and tag the queries it runs with its name.
+
+    The duration goes to the per-method histogram; slow-query records
+    carry the name as ``operation``.
+    """
+    operation = func.__qualname__
+    histogram = REPOSITORY_DURATION.labels(operation)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _current_operation.set(operation)
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - started)
+            _current_operation.reset(token)
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_STARTED, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish_query(conn, statement)
+
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        _finish_query(exception_context.connection, exception_context.statement)
+
+
+def _finish_query(conn, statement: str | None) -> None:
+    started = conn.info.get(_QUERY_STARTED)
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+    elapsed_ms = elapsed * 1000
+    if (statement and elapsed_ms >= settings.slow_query_ms
+            and random.random() < settings.slow_query_sample_rate):
+        sql = " ".join(statement.split())[:_STATEMENT_LOG_LIMIT]
+        operation = _current_operation.get()
+        query_logger.warning(
+            "Slow query %.1fms in %s: %s", elapsed_ms, operation, sql,
+            extra={"fields": {"event": "slow_query", "operation": operation,
+                              "duration_ms": round(elapsed_ms, 2), "statement": sql}},
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach query timing hooks to an engine."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def _log_access(scope, route: str, status_code: int, duration: float, stats: RequestStats) -> None:
+    # Шаблон маршрута вместо пути, чтобы записи группировались по эндпоинту
+    path = route if route != UNMATCHED_ROUTE else scope["path"]
+    fields = {
+        "event": "request",
+        "method": scope["method"],
+        "route": path,
+        "status": status_code,
+        "duration_ms": round(duration * 1000, 2),
+        "db_ms": round(stats.db_time * 1000, 2),
+        "queries": stats.queries,
+        "pool_wait_ms": round(stats.pool_wait * 1000, 2),
+    }
+    access_logger.info(
+        "%s %s %s %.1fms db=%.1fms queries=%s pool_wait=%.1fms",
+        fields["method"], path, status_code, fields["duration_ms"], fields["db_ms"],
+        stats.queries, fields["pool_wait_ms"],
+        extra={"fields": fields},
+    )
+
+
+class ObservabilityMiddleware:
+    """
+    ASGI middleware that records metrics and logs one record per HTTP request.
+
+    The access record carries route, status, total time and the
+    database time, query count and pool wait collected by the engine hooks.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            _request_stats.reset(token)
+            route = route_label(scope)
+            record_request(scope["method"], route, status_code, duration)
+            if settings.access_log:
+                _log_access(scope, route, status_code, duration, stats)
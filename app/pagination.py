@@ -0,0 +1,86 @@
+import base64
+import json
+from datetime import datetime
+
+from app.errors import ValidationError
+
+# Позиция в keyset-пагинации: (created_at, id) последней отданной записи
+CursorKey = tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    Encode keyset position into an opaque cursor string.
+
+    Args:
+        created_at: Creation time of the last item on the page
+        item_id: ID of the last item on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([created_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """
+    Decode an opaque cursor string into keyset position.
+
+    Args:
+        cursor: Cursor string previously returned as next_cursor
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        ValidationError: If cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError) as e:
+        raise ValidationError("Invalid cursor") from e
+
+
+# Позиция в выдаче поиска: (rank, type, id) последнего результата на странице
+SearchCursorKey = tuple[float, str, int]
+
+
+def encode_search_cursor(rank: float, hit_type: str, hit_id: int) -> str:
+    """
+    Encode search result position into an opaque cursor string.
+
+    Args:
+        rank: Rank of the last result on the page
+        hit_type: "question" or "answer"
+        hit_id: ID of the last result on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    # repr float сохраняет значение точно, курсор сравнивается с тем же ts_rank
+    payload = json.dumps([rank, hit_type, hit_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> SearchCursorKey:
+    """
+    Decode an opaque search cursor.
+
+    Args:
+        cursor: Cursor string previously returned as next_cursor
+
+    Returns:
+        Tuple of (rank, type, id)
+
+    Raises:
+        ValidationError: If cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, hit_type, hit_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), str(hit_type), int(hit_id)
+    except (ValueError, TypeError) as e:
+        raise ValidationError("Invalid cursor") from e
@@ -1,10 +1,15 @@
-from sqlalchemy import func, select
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.errors import ConflictError, NotFoundError
 from app.logging_config import setup_logger
-from app.database.models import Answer
+from app.observability import repository_operation
+from app.search.inverted_index import InvertedIndex
+from app.database.models import Answer, Question
+from app.repository.counting import answers_count_key, count_cache
 from app.schemes.answer_scheme import AnswerCreate
 
 logger = setup_logger(__name__)
@@ -13,6 +18,11 @@ logger = setup_logger(__name__)
 class AnswerRepository:
     """Repository for answer operations."""
 
+    def __init__(self, search_index: InvertedIndex | None = None):
+        # Индекс поиска в памяти (SEARCH_BACKEND=memory) обновляется после commit
+        self.search_index = search_index
+
+    @repository_operation
     async def create(self, question_id: int, answer_data: AnswerCreate, session: AsyncSession) -> Answer:
         """
         Create a new answer for a question.
@@ -29,23 +39,82 @@ class AnswerRepository:
             NotFoundError: If question doesn't exist
             ConflictError: If answer creation fails
         """
-        logger.info(f"Creating answer for question {question_id} by user {answer_data.user_id}")
+        logger.info("Creating answer for question %s by user %s", question_id, answer_data.user_id)
 
         answer = Answer(question_id=question_id, user_id=answer_data.user_id, text=answer_data.text)
         session.add(answer)
         try:
+            await self._bump_answer_count(session, question_id, 1)
             await session.commit()
-            await session.refresh(answer)
-            logger.info(f"Answer {answer.id} created successfully for question {question_id}")
+            count_cache.invalidate(answers_count_key(question_id))
+            if self.search_index is not None:
+                self.search_index.add_answer(answer.id, question_id, answer.text, answer.created_at)
+            logger.info("Answer %s created successfully for question %s", answer.id, question_id)
             return answer
         except IntegrityError as e:
             await session.rollback()
             if e.orig.pgcode == "23503":
-                logger.warning(f"Question {question_id} not found when creating answer")
+                logger.warning("Question %s not found when creating answer", question_id)
                 raise NotFoundError(f"question {question_id} not found") from e
-            logger.error(f"Integrity error creating answer: {e}")
+            logger.error("Integrity error creating answer: %s", e)
             raise ConflictError("Can't create answer") from e
 
+    @repository_operation
+    async def create_many(
+            self, question_id: int, answers_data: list[AnswerCreate], session: AsyncSession
+    ) -> list[Answer] | None:
+        """
+        Create answers for a question with a multi-row INSERT ... RETURNING.
+
+        The question row is locked by the answer_count update first, so it
+        can't be deleted until the batch is committed.
+
+        Args:
+            question_id: ID of the question to answer
+            answers_data: Answers creation data
+            session: Database session
+
+        Returns:
+            Created answer objects in input order, or None if question doesn't exist
+
+        Raises:
+            ConflictError: If answers creation fails
+        """
+        logger.info("Creating %s answers for question %s", len(answers_data), question_id)
+
+        try:
+            locked_id = await session.scalar(
+                update(Question)
+                .where(Question.id == question_id)
+                .values(answer_count=Question.answer_count + len(answers_data))
+                .returning(Question.id)
+            )
+            if locked_id is None:
+                await session.rollback()
+                logger.warning("Question %s not found when creating answers", question_id)
+                return None
+
+            result = await session.scalars(
+                insert(Answer).returning(Answer, sort_by_parameter_order=True),
+                [
+                    {"question_id": question_id, "user_id": answer_data.user_id, "text": answer_data.text}
+                    for answer_data in answers_data
+                ],
+            )
+            answers_list = list(result.all())
+            await session.commit()
+            count_cache.invalidate(answers_count_key(question_id))
+            if self.search_index is not None:
+                for answer in answers_list:
+                    self.search_index.add_answer(answer.id, question_id, answer.text, answer.created_at)
+            logger.info("%s answers created successfully for question %s", len(answers_list), question_id)
+            return answers_list
+        except IntegrityError as e:
+            await session.rollback()
+            logger.error("Integrity error creating answers: %s", e)
+            raise ConflictError("Can't create answers") from e
+
+    @repository_operation
     async def get_by_id(self, answer_id: int, session: AsyncSession) -> Answer | None:
         """
         Get answer by ID.
@@ -57,68 +126,86 @@ class AnswerRepository:
         Returns:
             Answer object or None if not found
         """
-        logger.debug(f"Retrieving answer by ID: {answer_id}")
+        logger.debug("Retrieving answer by ID: %s", answer_id)
         answer = await session.get(Answer, answer_id)
         if answer:
-            logger.debug(f"Answer {answer_id} found")
+            logger.debug("Answer %s found", answer_id)
         else:
-            logger.debug(f"Answer {answer_id} not found")
+            logger.debug("Answer %s not found", answer_id)
         return answer
 
-    async def get_by_question_id(
-            self,
-            session: AsyncSession,
-            question_id: int,
-            limit: int = 10,
-            offset: int = 0,
-    ) -> tuple[list[Answer], int]:
+    @repository_operation
+    async def get_created_at(self, answer_id: int, session: AsyncSession) -> datetime | None:
         """
-        Get answers for a specific question with pagination.
+        Get creation time of an answer; answers are immutable, so it is their version.
 
         Args:
+            answer_id: ID of the answer
             session: Database session
-            question_id: ID of the question
-            limit: Maximum number of answers to return (max 100)
-            offset: Number of answers to skip
 
         Returns:
-            Tuple of (list of answers, total count)
+            Creation time or None if answer doesn't exist
         """
-        logger.debug(f"Retrieving answers for question {question_id}, limit: {limit}, offset: {offset}")
-
-        limit = min(limit, 100)
-        offset = max(offset, 0)
-
-        stmt = select(Answer).where(Answer.question_id == question_id).offset(offset).limit(limit)
-        result = await session.execute(stmt)
-        answers_list = result.scalars().all()
-
-        total_count = await session.scalar(
-            select(func.count(Answer.id)).where(Answer.question_id == question_id)
-        )
-        total_count = int(total_count or 0)
-
-        logger.debug(f"Found {len(answers_list)} answers for question {question_id}, total: {total_count}")
-        return answers_list, total_count
+        return await session.scalar(select(Answer.created_at).where(Answer.id == answer_id))
 
-    async def delete(self, db_answer: Answer, session: AsyncSession) -> None:
+    @repository_operation
+    async def delete(self, answer_id: int, session: AsyncSession) -> int:
         """
-        Delete an answer.
+        Delete an answer, locking its question row first.
+
+        The answer_count update takes the question row lock before the
+        DELETE touches the answer, in the same order as question deletion
+        and answer creation, so concurrent deletes can't deadlock.
 
         Args:
-            db_answer: Answer object to delete
+            answer_id: ID of the answer to delete
             session: Database session
 
+        Returns:
+            ID of the question the answer belonged to
+
         Raises:
+            NotFoundError: If answer doesn't exist
             ConflictError: If answer deletion fails
         """
-        logger.info(f"Deleting answer {db_answer.id} for question {db_answer.question_id}")
+        logger.info("Deleting answer %s", answer_id)
 
         try:
-            await session.delete(db_answer)
+            # Сначала блокируется строка вопроса, затем удаляется ответ
+            question_id = await session.scalar(
+                update(Question)
+                .where(Question.id == select(Answer.question_id).where(Answer.id == answer_id).scalar_subquery())
+                .values(answer_count=Question.answer_count - 1)
+                .returning(Question.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted_id = None
+            if question_id is not None:
+                deleted_id = await session.scalar(
+                    delete(Answer)
+                    .where(Answer.id == answer_id)
+                    .returning(Answer.id)
+                    .execution_options(synchronize_session=False)
+                )
+            if deleted_id is None:
+                # Ответа нет или его удалили параллельно: откатывается и декремент счетчика
+                await session.rollback()
+                logger.warning("Answer %s not found for deletion", answer_id)
+                raise NotFoundError(f"Answer with id {answer_id} not found")
             await session.commit()
-            logger.info(f"Answer {db_answer.id} deleted successfully")
+            count_cache.invalidate(answers_count_key(question_id))
+            if self.search_index is not None:
+                self.search_index.remove_answer(answer_id)
+            logger.info("Answer %s deleted successfully for question %s", answer_id, question_id)
+            return question_id
         except IntegrityError as e:
             await session.rollback()
-            logger.error(f"Integrity error deleting answer {db_answer.id}: {e}")
+            logger.error("Integrity error deleting answer %s: %s", answer_id, e)
             raise ConflictError("Can't delete answer") from e
+
+    async def _bump_answer_count(self, session: AsyncSession, question_id: int, delta: int) -> None:
+        await session.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(answer_count=Question.answer_count + delta)
+        )
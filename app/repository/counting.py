@@ -0,0 +1,92 @@
+import json
+import time
+from enum import Enum
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CountStrategy(str, Enum):
+    """How repositories compute the ``total`` of a paginated list."""
+
+    EXACT = "exact"          # COUNT(*) на каждый запрос
+    CACHED = "cached"        # COUNT(*) не чаще раза в TTL
+    COUNTER = "counter"      # денормализованные счетчики (questions.answer_count, counters)
+    ESTIMATE = "estimate"    # оценка планировщика Postgres
+
+
+class CountCache:
+    """Process-local cache of totals with a fixed TTL."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, int]] = {}
+
+    def get(self, key: str) -> int | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: str, value: int) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+count_cache = CountCache(ttl=settings.count_cache_ttl)
+
+
+def answers_count_key(question_id: int) -> str:
+    return f"answers:{question_id}"
+
+
+async def estimate_table_rows(session: AsyncSession, table_name: str) -> int | None:
+    """
+    Get planner row estimate for a whole table from pg_class.reltuples.
+
+    Args:
+        session: Database session
+        table_name: Name of the table
+
+    Returns:
+        Estimated row count or None if the table was never analyzed
+    """
+    estimate = await session.scalar(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name},
+    )
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def estimate_query_rows(session: AsyncSession, stmt: Select) -> int:
+    """
+    Get planner row estimate for a query via EXPLAIN.
+
+    Args:
+        session: Database session
+        stmt: Select statement to estimate
+
+    Returns:
+        Estimated number of rows the query returns
+    """
+    compiled = stmt.compile(bind=session.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = await session.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
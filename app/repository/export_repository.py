@@ -0,0 +1,47 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+
+from app.database.models import Answer, Question
+from app.logging_config import setup_logger
+from app.observability import repository_operation
+
+logger = setup_logger(__name__)
+
+
+class ExportRepository:
+    """Repository for reading all questions with answers in one pass."""
+
+    @repository_operation
+    async def stream_questions_with_answers(self, session: AsyncSession, batch_size: int = 1000) -> AsyncResult:
+        """
+        Open a server-side cursor over questions joined with their answers.
+
+        Rows come ordered by question id, then by answer (created_at, id):
+        a merge join of the primary key and the answers index, so the first
+        rows are sent without sorting the tables. Questions without answers
+        have NULL answer columns. The whole export is one statement and
+        sees one snapshot of the data.
+
+        Args:
+            session: Database session, must stay open while the result is read
+            batch_size: Rows fetched from the cursor per round trip
+
+        Returns:
+            Streaming result; read it with ``partitions()``
+        """
+        logger.info("Opening export cursor, batch size %s", batch_size)
+        stmt = (
+            select(
+                Question.id.label("question_id"),
+                Question.text.label("question_text"),
+                Question.created_at.label("question_created_at"),
+                Answer.id.label("answer_id"),
+                Answer.user_id.label("answer_user_id"),
+                Answer.text.label("answer_text"),
+                Answer.created_at.label("answer_created_at"),
+            )
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .order_by(Question.id, Answer.created_at, Answer.id)
+            .execution_options(yield_per=batch_size)
+        )
+        return await session.stream(stmt)
@@ -0,0 +1,133 @@
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Counter, ImportCheckpoint
+from app.errors import ConflictError
+from app.logging_config import setup_logger
+from app.observability import repository_operation
+from app.repository.counting import count_cache
+from app.repository.question_repository import QUESTIONS_COUNTER
+from app.schemes.import_scheme import ImportQuestion
+from app.search.inverted_index import InvertedIndex
+
+logger = setup_logger(__name__)
+
+QUESTION_COPY_COLUMNS = ("id", "text", "created_at", "answer_count")
+ANSWER_COPY_COLUMNS = ("id", "question_id", "user_id", "text", "created_at")
+
+# id выделяются из тех же последовательностей, что и у INSERT, одним запросом на пачку:
+# ответы ссылаются на id вопросов, а COPY не умеет RETURNING
+_ALLOCATE_IDS = text(
+    "SELECT now(), "
+    "ARRAY(SELECT nextval(pg_get_serial_sequence('questions', 'id')) FROM generate_series(1, :questions)), "
+    "ARRAY(SELECT nextval(pg_get_serial_sequence('answers', 'id')) FROM generate_series(1, :answers))"
+)
+
+
+class ImportRepository:
+    """Repository for bulk loading questions and answers with COPY."""
+
+    def __init__(self, search_index: InvertedIndex | None = None):
+        # Индекс поиска в памяти (SEARCH_BACKEND=memory) обновляется после commit
+        self.search_index = search_index
+
+    @repository_operation
+    async def get_checkpoint(self, session: AsyncSession, job: str) -> ImportCheckpoint:
+        """
+        Get the checkpoint of an import job, creating it at position 0.
+
+        Args:
+            session: Database session
+            job: Import job name
+
+        Returns:
+            Checkpoint of the job
+        """
+        await session.execute(insert(ImportCheckpoint).values(job=job).on_conflict_do_nothing(index_elements=["job"]))
+        checkpoint = await session.scalar(select(ImportCheckpoint).where(ImportCheckpoint.job == job))
+        await session.commit()
+        return checkpoint
+
+    @repository_operation
+    async def load_batch(self, session: AsyncSession, job: str, questions: list[ImportQuestion],
+                         position: int, new_position: int, rejected: int) -> int:
+        """
+        Load validated questions with their answers and move the checkpoint, in one transaction.
+
+        Rows are written with asyncpg COPY; answer_count and the questions
+        counter are set in the same transaction. The checkpoint moves only
+        from ``position``, so two requests of the same job can't both load
+        a batch: the second one fails and nothing of it is committed.
+
+        Args:
+            session: Database session
+            job: Import job name
+            questions: Validated questions of the batch
+            position: Checkpoint position the batch starts after
+            new_position: Position of the last input line of the batch
+            rejected: Number of rejected lines in the batch
+
+        Returns:
+            Number of loaded answers
+
+        Raises:
+            ConflictError: If the checkpoint was moved by another request
+        """
+        answers_count = sum(len(question.answers) for question in questions)
+        question_rows, answer_rows = [], []
+        if questions:
+            now, question_ids, answer_ids = (
+                await session.execute(_ALLOCATE_IDS, {"questions": len(questions), "answers": answers_count})
+            ).one()
+            answer_ids = iter(answer_ids)
+            for question_id, question in zip(question_ids, questions):
+                question_rows.append((question_id, question.text, question.created_at or now, len(question.answers)))
+                answer_rows.extend(
+                    (next(answer_ids), question_id, answer.user_id, answer.text, answer.created_at or now)
+                    for answer in question.answers
+                )
+
+            connection = await session.connection()
+            driver_connection = (await connection.get_raw_connection()).driver_connection
+            await driver_connection.copy_records_to_table(
+                "questions", records=question_rows, columns=QUESTION_COPY_COLUMNS
+            )
+            if answer_rows:
+                await driver_connection.copy_records_to_table(
+                    "answers", records=answer_rows, columns=ANSWER_COPY_COLUMNS
+                )
+            await session.execute(
+                update(Counter)
+                .where(Counter.name == QUESTIONS_COUNTER)
+                .values(value=Counter.value + len(questions))
+            )
+
+        moved = await session.scalar(
+            update(ImportCheckpoint)
+            .where(ImportCheckpoint.job == job, ImportCheckpoint.position == position)
+            .values(
+                position=new_position,
+                questions=ImportCheckpoint.questions + len(questions),
+                answers=ImportCheckpoint.answers + answers_count,
+                rejected=ImportCheckpoint.rejected + rejected,
+                updated_at=func.now(),
+            )
+            .returning(ImportCheckpoint.job)
+            .execution_options(synchronize_session=False)
+        )
+        if moved is None:
+            await session.rollback()
+            logger.warning("Import job %s: checkpoint moved past %s by another request", job, position)
+            raise ConflictError(f"Import job {job} is being loaded by another request")
+        await session.commit()
+
+        count_cache.invalidate(QUESTIONS_COUNTER)
+        if self.search_index is not None:
+            for question_id, question_text, created_at, _ in question_rows:
+                self.search_index.add_question(question_id, question_text, created_at)
+            for answer_id, question_id, _, answer_text, created_at in answer_rows:
+                self.search_index.add_answer(answer_id, question_id, answer_text, created_at)
+        logger.info("Import job %s: lines %s-%s loaded, %s questions, %s answers, %s rejected",
+                    job, position + 1, new_position, len(questions), answers_count, rejected)
+        return answers_count
@@ -1,18 +1,159 @@
-from sqlalchemy import select, func
+from collections.abc import Sequence
+from functools import lru_cache
+
+from sqlalchemy import Integer, Row, Select, any_, bindparam, delete, insert, select, func, true, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import Question
-from app.errors import ConflictError
+from app.database.models import Answer, Counter, Question
+from app.errors import ConflictError, NotFoundError
+from app.pagination import CursorKey
+from app.repository.counting import (
+    CountStrategy,
+    answers_count_key,
+    count_cache,
+    estimate_query_rows,
+    estimate_table_rows,
+)
 from app.schemes.question_scheme import QuestionCreate
 from app.logging_config import setup_logger
+from app.observability import repository_operation
+from app.search.inverted_index import InvertedIndex
 
 logger = setup_logger(__name__)
 
 
+QUESTIONS_COUNTER = "questions"
+
+# Версия ответов вопроса для ETag: (answer_count, id последнего ответа)
+QuestionVersion = tuple[int, int]
+
+# Колонки QuestionResponse: списки читаются строками, без ORM-объектов и identity map
+QUESTION_COLUMNS = (Question.id, Question.text, Question.created_at)
+# Колонки AnswerResponse для ответов в строке вопроса: под своими метками, чтобы не совпасть
+# с колонками вопроса; question_id берется из строки вопроса
+EMBEDDED_ANSWER_COLUMNS = (
+    Answer.id.label("answer_id"), Answer.user_id, Answer.text.label("answer_text"),
+    Answer.created_at.label("answer_created_at"),
+)
+
+
+def _newest_answer():
+    """
+    LATERAL subquery with the id of the question's newest answer.
+
+    Together with answer_count it is the version of the question's answers:
+    a new answer always becomes the newest one and a deleted answer changes
+    the count. It is one backward step of the (question_id, created_at, id)
+    index, however many answers the question has.
+    """
+    return (
+        select(Answer.id.label("newest_answer_id"))
+        .where(Answer.question_id == Question.id)
+        .order_by(Answer.created_at.desc(), Answer.id.desc())
+        .limit(1)
+        .lateral("newest_answer")
+    )
+
+
+@lru_cache(maxsize=None)
+def _question_with_answers_stmt(keyset: bool, total_column: str | None) -> Select:
+    """
+    Build the question + answers page statement once per shape.
+
+    Values are passed as bind parameters, so the ORM doesn't rebuild
+    the LATERAL subqueries and their column proxies on every request.
+
+    Args:
+        keyset: Page by (after_created_at, after_id) instead of offset
+        total_column: None, "count" for exact COUNT or "counter" for answer_count
+    """
+    page = (
+        select(*EMBEDDED_ANSWER_COLUMNS)
+        .where(Answer.question_id == Question.id)
+        .order_by(Answer.created_at, Answer.id)
+        .limit(bindparam("limit"))
+    )
+    if keyset:
+        page = page.where(
+            tuple_(Answer.created_at, Answer.id)
+            > tuple_(bindparam("after_created_at", type_=Answer.created_at.type), bindparam("after_id"))
+        )
+    else:
+        page = page.offset(bindparam("offset"))
+    page = page.lateral("answers_page")
+    newest = _newest_answer()
+
+    # Только колонки, без ORM-объектов и identity map. answer_count и id последнего ответа —
+    # версия для ETag; answer_count — еще и total для counter
+    stmt = (
+        select(*QUESTION_COLUMNS, *page.c, Question.answer_count, newest.c.newest_answer_id)
+        .select_from(Question)
+        .outerjoin(newest, true())
+        .outerjoin(page, true())
+        .where(Question.id == bindparam("question_id"))
+        .order_by(page.c.answer_created_at, page.c.answer_id)
+    )
+    if total_column == "count":
+        total = (
+            select(func.count(Answer.id).label("total"))
+            .where(Answer.question_id == Question.id)
+            .lateral("answers_total")
+        )
+        stmt = stmt.join(total, true()).add_columns(total.c.total)
+    return stmt
+
+
+@lru_cache(maxsize=None)
+def _latest_answers_stmt(total_column: str) -> Select:
+    """
+    Build the latest answers statement for a page of questions once per shape.
+
+    Args:
+        total_column: "count" for exact COUNT or "counter" for answer_count
+    """
+    latest = (
+        select(*EMBEDDED_ANSWER_COLUMNS)
+        .where(Answer.question_id == Question.id)
+        .order_by(Answer.created_at.desc(), Answer.id.desc())
+        .limit(bindparam("limit"))
+        .lateral("latest_answers")
+    )
+    if total_column == "counter":
+        total = Question.answer_count
+    else:
+        answers_total = (
+            select(func.count(Answer.id).label("total"))
+            .where(Answer.question_id == Question.id)
+            .lateral("answers_total")
+        )
+        total = answers_total.c.total
+
+    stmt = (
+        select(Question.id.label("question_id"), total.label("answer_count"), *latest.c)
+        .select_from(Question)
+        .outerjoin(latest, true())
+        .where(Question.id == any_(bindparam("question_ids", type_=ARRAY(Integer))))
+        .order_by(Question.id, latest.c.answer_created_at.desc(), latest.c.answer_id.desc())
+    )
+    if total_column != "counter":
+        stmt = stmt.join(answers_total, true())
+    return stmt
+
+
 class QuestionRepository:
     """Repository for question operations."""
 
+    def __init__(self, count_strategy: CountStrategy = CountStrategy.EXACT,
+                 answers_count_strategy: CountStrategy = CountStrategy.EXACT,
+                 search_index: InvertedIndex | None = None):
+        self.count_strategy = count_strategy
+        self.answers_count_strategy = answers_count_strategy
+        # Индекс поиска в памяти (SEARCH_BACKEND=memory) обновляется после commit
+        self.search_index = search_index
+
+    @repository_operation
     async def create(self, question_data: QuestionCreate, session: AsyncSession) -> Question:
         """
         Create a new question.
@@ -32,80 +173,314 @@ class QuestionRepository:
         db_question = Question(text=question_data.text)
         session.add(db_question)
         try:
+            await self._bump_counter(session, 1)
             await session.commit()
-            await session.refresh(db_question)
-            logger.info(f"Question {db_question.id} created successfully")
+            count_cache.invalidate(QUESTIONS_COUNTER)
+            if self.search_index is not None:
+                self.search_index.add_question(db_question.id, db_question.text, db_question.created_at)
+            logger.info("Question %s created successfully", db_question.id)
             return db_question
         except IntegrityError as e:
             await session.rollback()
-            logger.error(f"Integrity error creating question: {e}")
+            logger.error("Integrity error creating question: %s", e)
             raise ConflictError("Can't create question") from e
 
-    async def get_by_id(self, question_id: int, session: AsyncSession) -> Question | None:
+    @repository_operation
+    async def create_many(self, questions_data: list[QuestionCreate], session: AsyncSession) -> list[Question]:
         """
-        Get question by ID.
+        Create questions with a multi-row INSERT ... RETURNING in one transaction.
 
         Args:
-            question_id: ID of the question to retrieve
+            questions_data: Question creation data
             session: Database session
 
         Returns:
-            Question object or None if not found
+            Created question objects in input order
+
+        Raises:
+            ConflictError: If questions creation fails
         """
-        logger.debug(f"Retrieving question by ID: {question_id}")
-        question = await session.get(Question, question_id)
-        if question:
-            logger.debug(f"Question {question_id} found")
-        else:
-            logger.debug(f"Question {question_id} not found")
-        return question
+        logger.info("Creating %s questions", len(questions_data))
+
+        try:
+            result = await session.scalars(
+                insert(Question).returning(Question, sort_by_parameter_order=True),
+                [{"text": question_data.text} for question_data in questions_data],
+            )
+            questions_list = list(result.all())
+            await self._bump_counter(session, len(questions_list))
+            await session.commit()
+            count_cache.invalidate(QUESTIONS_COUNTER)
+            if self.search_index is not None:
+                for question in questions_list:
+                    self.search_index.add_question(question.id, question.text, question.created_at)
+            logger.info("%s questions created successfully", len(questions_list))
+            return questions_list
+        except IntegrityError as e:
+            await session.rollback()
+            logger.error("Integrity error creating questions: %s", e)
+            raise ConflictError("Can't create questions") from e
+
+    @repository_operation
+    async def get_with_answers(
+            self,
+            session: AsyncSession,
+            question_id: int,
+            limit: int = 10,
+            offset: int = 0,
+            after: CursorKey | None = None,
+            include_total: bool = True,
+    ) -> tuple[Row | None, list[Row], int | None, QuestionVersion | None]:
+        """
+        Get question, a page of its answers, answers total and version in one statement.
+
+        The answers page and the count are LATERAL subqueries joined to the
+        question row, so the whole read is a single round trip. Answers are
+        ordered by (created_at, id); ``after`` switches to keyset pagination.
+        The version is the same as returned by ``get_version``. Only columns
+        are selected: rows never enter the session.
+
+        Args:
+            session: Database session
+            question_id: ID of the question
+            limit: Maximum number of answers to return (max 100)
+            offset: Number of answers to skip
+            after: Keyset position (created_at, id) to continue after
+            include_total: Whether to compute answers total count
+
+        Returns:
+            Tuple of (question row with id, text, created_at or None, answer rows with
+            answer_id, user_id, answer_text, answer_created_at, answers total or None, version or None)
+        """
+        logger.debug("Retrieving question %s with answers, limit: %s, offset: %s, after: %s",
+                     question_id, limit, offset, after)
+
+        limit = min(limit, 100)
+        offset = max(offset, 0)
+
+        # total берется из того же запроса, если стратегия это позволяет
+        strategy = self.answers_count_strategy
+        cache_key = answers_count_key(question_id)
+        total_count = None
+        total_column = None
+        if include_total and strategy == CountStrategy.CACHED:
+            total_count = count_cache.get(cache_key)
+        if include_total and total_count is None and strategy == CountStrategy.COUNTER:
+            total_column = "counter"
+        elif include_total and total_count is None and strategy != CountStrategy.ESTIMATE:
+            total_column = "count"
+
+        stmt = _question_with_answers_stmt(keyset=after is not None, total_column=total_column)
+        params = {"question_id": question_id, "limit": limit, "offset": offset}
+        if after is not None:
+            params["after_created_at"], params["after_id"] = after
+
+        rows = (await session.execute(stmt, params)).all()
+        if not rows:
+            logger.debug("Question %s not found", question_id)
+            return None, [], None, None
 
+        question = first = rows[0]
+        answers_list = [row for row in rows if row.answer_id is not None]
+        version = (first.answer_count, first.newest_answer_id or 0)
+        if total_column is not None:
+            total_count = int((first.answer_count if total_column == "counter" else first.total) or 0)
+            if strategy == CountStrategy.CACHED:
+                count_cache.set(cache_key, total_count)
+        elif include_total and strategy == CountStrategy.ESTIMATE:
+            total_count = await estimate_query_rows(
+                session, select(Answer.id).where(Answer.question_id == question_id)
+            )
+
+        logger.debug("Found question %s with %s answers, total: %s", question_id, len(answers_list), total_count)
+        return question, answers_list, total_count, version
+
+    @repository_operation
+    async def get_version(self, session: AsyncSession, question_id: int) -> QuestionVersion | None:
+        """
+        Get a cheap version token of a question and its answers.
+
+        The token is the denormalized answer_count and the id of the newest
+        answer: the question row and one index entry, without counting.
+
+        Args:
+            session: Database session
+            question_id: ID of the question
+
+        Returns:
+            Tuple of (answers count, newest answer id or 0) or None if question doesn't exist
+        """
+        newest = _newest_answer()
+        stmt = (
+            select(Question.answer_count, newest.c.newest_answer_id)
+            .select_from(Question)
+            .outerjoin(newest, true())
+            .where(Question.id == question_id)
+        )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            logger.debug("Question %s not found", question_id)
+            return None
+        return row.answer_count, row.newest_answer_id or 0
+
+    @repository_operation
     async def get_all(self, session: AsyncSession,
-                      offset: int = 0, limit: int = 100) -> tuple[list[Question], int]:
+                      offset: int = 0, limit: int = 100,
+                      after: CursorKey | None = None,
+                      include_total: bool = True) -> tuple[Sequence[Row], int | None]:
         """
         Get all questions with pagination.
 
+        Questions are ordered by (created_at, id). When ``after`` is given,
+        keyset pagination is used and ``offset`` is ignored. Only the
+        response columns are selected, so rows are plain tuples that never
+        enter the session.
+
         Args:
             session: Database session
             offset: Number of questions to skip
             limit: Maximum number of questions to return (max 100)
+            after: Keyset position (created_at, id) to continue after
+            include_total: Whether to compute total count
 
         Returns:
-            Tuple of (list of questions, total count)
+            Tuple of (question rows with id, text, created_at, total count or None)
         """
-        logger.debug(f"Retrieving all questions, limit: {limit}, offset: {offset}")
+        logger.debug("Retrieving all questions, limit: %s, offset: %s, after: %s", limit, offset, after)
 
         limit = min(limit, 100)
         offset = max(offset, 0)
 
-        stmt = select(Question).offset(offset).limit(limit)
+        stmt = select(*QUESTION_COLUMNS).order_by(Question.created_at, Question.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(tuple_(Question.created_at, Question.id) > tuple_(*after))
+        else:
+            stmt = stmt.offset(offset)
         result = await session.execute(stmt)
-        questions_list = result.scalars().all()
+        questions_list = result.all()
 
-        total_count = await session.scalar(select(func.count(Question.id)))
-        total_count = int(total_count or 0)
+        total_count = await self.count_all(session) if include_total else None
 
-        logger.debug(f"Found {len(questions_list)} questions, total: {total_count}")
+        logger.debug("Found %s questions, total: %s", len(questions_list), total_count)
         return questions_list, total_count
 
-    async def delete(self, db_question: Question, session: AsyncSession) -> None:
+    @repository_operation
+    async def get_latest_answers(
+            self, session: AsyncSession, question_ids: Sequence[int], limit: int
+    ) -> tuple[dict[int, list[Row]], dict[int, int]]:
+        """
+        Get the latest answers and answers count of every question of a page in one statement.
+
+        Answers are a LATERAL subquery with LIMIT per question, so each
+        question reads at most ``limit`` entries of the
+        (question_id, created_at, id) index backwards, however many answers
+        it has. The count is the answer_count column with the counter
+        strategy and an index-only COUNT per question otherwise.
+
+        Args:
+            session: Database session
+            question_ids: IDs of the questions on the page
+            limit: Maximum number of answers per question, newest first
+
+        Returns:
+            Tuple of (answer rows by question id, answers count by question id);
+            rows have answer_id, user_id, answer_text and answer_created_at
+        """
+        logger.debug("Retrieving %s latest answers of %s questions", limit, len(question_ids))
+
+        total_column = "counter" if self.answers_count_strategy == CountStrategy.COUNTER else "count"
+        stmt = _latest_answers_stmt(total_column)
+        rows = (await session.execute(stmt, {"question_ids": list(question_ids), "limit": limit})).all()
+
+        answers: dict[int, list[Row]] = {question_id: [] for question_id in question_ids}
+        counts: dict[int, int] = {}
+        for row in rows:
+            counts[row.question_id] = int(row.answer_count or 0)
+            if row.answer_id is not None:
+                answers[row.question_id].append(row)
+        return answers, counts
+
+    @repository_operation
+    async def delete(self, question_id: int, session: AsyncSession) -> None:
         """
-        Delete a question.
+        Delete a question with a single DELETE ... RETURNING.
+
+        Answers are removed by the database ON DELETE CASCADE, so neither
+        the question nor its answers are loaded into the session.
 
         Args:
-            db_question: Question object to delete
+            question_id: ID of the question to delete
             session: Database session
 
         Raises:
+            NotFoundError: If question doesn't exist
             ConflictError: If question deletion fails
         """
-        logger.info(f"Deleting question {db_question.id}")
+        logger.info("Deleting question %s", question_id)
 
         try:
-            await session.delete(db_question)
+            deleted_id = await session.scalar(
+                delete(Question)
+                .where(Question.id == question_id)
+                .returning(Question.id)
+                .execution_options(synchronize_session=False)
+            )
+            if deleted_id is None:
+                await session.rollback()
+                logger.warning("Question %s not found for deletion", question_id)
+                raise NotFoundError(f"Question with id {question_id} not found")
+            await self._bump_counter(session, -1)
             await session.commit()
-            logger.info(f"Question {db_question.id} deleted successfully")
+            count_cache.invalidate(QUESTIONS_COUNTER)
+            count_cache.invalidate(answers_count_key(question_id))
+            if self.search_index is not None:
+                self.search_index.remove_question(question_id)
+            logger.info("Question %s deleted successfully", question_id)
         except IntegrityError as e:
             await session.rollback()
-            logger.error(f"Integrity error deleting question {db_question.id}: {e}")
-            raise ConflictError("Can't delete question") from e
\ No newline at end of file
+            logger.error("Integrity error deleting question %s: %s", question_id, e)
+            raise ConflictError("Can't delete question") from e
+
+    @repository_operation
+    async def count_all(self, session: AsyncSession) -> int:
+        """
+        Count questions using the configured count strategy.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Total (exact or approximate) number of questions
+        """
+        if self.count_strategy == CountStrategy.CACHED:
+            total_count = count_cache.get(QUESTIONS_COUNTER)
+            if total_count is None:
+                total_count = await self._count_exact(session)
+                count_cache.set(QUESTIONS_COUNTER, total_count)
+            return total_count
+
+        if self.count_strategy == CountStrategy.COUNTER:
+            total_count = await session.scalar(
+                select(Counter.value).where(Counter.name == QUESTIONS_COUNTER)
+            )
+            if total_count is not None:
+                return int(total_count)
+            logger.warning("Questions counter row is missing, falling back to exact count")
+
+        if self.count_strategy == CountStrategy.ESTIMATE:
+            total_count = await estimate_table_rows(session, Question.__tablename__)
+            if total_count is not None:
+                return total_count
+
+        return await self._count_exact(session)
+
+    async def _count_exact(self, session: AsyncSession) -> int:
+        total_count = await session.scalar(select(func.count(Question.id)))
+        return int(total_count or 0)
+
+    async def _bump_counter(self, session: AsyncSession, delta: int) -> None:
+        await session.execute(
+            update(Counter)
+            .where(Counter.name == QUESTIONS_COUNTER)
+            .values(value=Counter.value + delta)
+        )
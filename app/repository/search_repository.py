@@ -0,0 +1,218 @@
+from collections.abc import Sequence
+from functools import lru_cache
+
+from sqlalchemy import Float, Integer, Row, Select, String, bindparam, func, literal, literal_column, select, \
+    tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import SEARCH_CONFIG, Answer, Question
+from app.logging_config import setup_logger
+from app.observability import repository_operation
+from app.pagination import SearchCursorKey
+from app.search.inverted_index import ANSWER, QUESTION, IndexHit, InvertedIndex
+
+logger = setup_logger(__name__)
+
+
+# Границы совпадений в сниппете; управляющие символы не встречаются в тексте,
+# поэтому сервис может экранировать сниппет и только потом расставить разметку
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+_HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=30, MinWords=10, MaxFragments=2"
+
+_CONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+@lru_cache(maxsize=None)
+def _search_stmt(keyset: bool, capped: bool) -> Select:
+    """
+    Build the ranked search statement once per shape.
+
+    Matches come from the GIN indexes on both tables; results are
+    ordered by (rank, type, id) descending, and ts_headline runs only
+    for the rows of the returned page.
+
+    Args:
+        keyset: Continue after (after_rank, after_type, after_id)
+        capped: Rank at most max_candidates matches of each table
+    """
+    # Скалярный подзапрос вычисляется один раз (InitPlan), а не на каждую совпавшую строку
+    query = select(func.websearch_to_tsquery(_CONFIG, bindparam("q", type_=String))).scalar_subquery()
+    questions = (
+        select(
+            literal_column("'question'").label("type"),
+            Question.id.label("id"),
+            Question.id.label("question_id"),
+            Question.text.label("text"),
+            Question.created_at.label("created_at"),
+            func.ts_rank(Question.search_vector, query).label("rank"),
+        )
+        .where(Question.search_vector.bool_op("@@")(query))
+    )
+    if capped:
+        questions = questions.limit(bindparam("max_candidates"))
+    answers = (
+        select(
+            literal_column("'answer'").label("type"),
+            Answer.id.label("id"),
+            Answer.question_id.label("question_id"),
+            Answer.text.label("text"),
+            Answer.created_at.label("created_at"),
+            func.ts_rank(Answer.search_vector, query).label("rank"),
+        )
+        .where(Answer.search_vector.bool_op("@@")(query))
+    )
+    if capped:
+        answers = answers.limit(bindparam("max_candidates"))
+    # Ветки в скобках, чтобы LIMIT относился к каждой из них, а не ко всему UNION
+    hits = union_all(questions.subquery().select(), answers.subquery().select()).subquery("hits")
+
+    page = (
+        select(hits)
+        .order_by(hits.c.rank.desc(), hits.c.type.desc(), hits.c.id.desc())
+        .limit(bindparam("limit"))
+    )
+    if keyset:
+        page = page.where(
+            tuple_(hits.c.rank, hits.c.type, hits.c.id)
+            < tuple_(
+                bindparam("after_rank", type_=Float),
+                bindparam("after_type", type_=String),
+                bindparam("after_id", type_=Integer),
+            )
+        )
+    page = page.subquery("page")
+
+    snippet = func.ts_headline(_CONFIG, page.c.text, query, literal(_HEADLINE_OPTIONS))
+    return (
+        select(page.c.type, page.c.id, page.c.question_id, page.c.created_at, page.c.rank, snippet.label("snippet"))
+        .order_by(page.c.rank.desc(), page.c.type.desc(), page.c.id.desc())
+    )
+
+
+class SearchRepository:
+    """Repository for full-text search over questions and answers."""
+
+    def __init__(self, max_candidates: int = 0):
+        # ts_rank считается для каждого совпадения, поэтому частые слова ограничиваются
+        self.max_candidates = max_candidates
+
+    @repository_operation
+    async def search(self, session: AsyncSession, query: str, limit: int = 10,
+                     after: SearchCursorKey | None = None) -> Sequence[Row]:
+        """
+        Search questions and answers with the generated tsvector columns.
+
+        The query uses web search syntax: quoted phrases, ``or`` and
+        ``-word``. Results are ordered by rank; ``after`` continues a
+        previous page. With ``max_candidates`` set, only that many matches
+        of each table are ranked, in index order, so results for very
+        frequent words are the best of a stable subset.
+
+        Args:
+            session: Database session
+            query: Search query
+            limit: Maximum number of results to return (max 100)
+            after: Keyset position (rank, type, id) to continue after
+
+        Returns:
+            Rows with type, id, question_id, created_at, rank and snippet
+        """
+        logger.debug("Searching %r, limit: %s, after: %s", query, limit, after)
+
+        params = {"q": query, "limit": min(limit, 100)}
+        if after is not None:
+            params["after_rank"], params["after_type"], params["after_id"] = after
+        if self.max_candidates > 0:
+            params["max_candidates"] = self.max_candidates
+        stmt = _search_stmt(keyset=after is not None, capped=self.max_candidates > 0)
+        result = await session.execute(stmt, params)
+        rows = result.all()
+
+        logger.debug("Found %s search results for %r", len(rows), query)
+        return rows
+
+
+class IndexSearchRepository:
+    """Full-text search over the in-process inverted index (SEARCH_BACKEND=memory)."""
+
+    def __init__(self, index: InvertedIndex, max_candidates: int = 0):
+        self.index = index
+        self.max_candidates = max_candidates
+
+    @repository_operation
+    async def search(self, session: AsyncSession, query: str, limit: int = 10,
+                     after: SearchCursorKey | None = None) -> list[IndexHit]:
+        """
+        Search questions and answers in the index, without database queries.
+
+        The query is a list of words that must all occur; ``word*`` matches
+        by prefix and ``-word`` excludes documents. Results are ranked with
+        BM25 and have the same attributes and order as SearchRepository rows.
+
+        Args:
+            session: Database session, unused
+            query: Search query
+            limit: Maximum number of results to return (max 100)
+            after: Keyset position (rank, type, id) to continue after
+
+        Returns:
+            Hits with type, id, question_id, created_at, rank and snippet
+        """
+        logger.debug("Searching index for %r, limit: %s, after: %s", query, limit, after)
+
+        hits = self.index.search(query, limit=min(limit, 100), after=after, max_candidates=self.max_candidates,
+                                 highlight=(HIGHLIGHT_START, HIGHLIGHT_STOP))
+
+        logger.debug("Found %s index results for %r", len(hits), query)
+        return hits
+
+    @repository_operation
+    async def sync(self, session: AsyncSession, batch_size: int = 10_000) -> int:
+        """
+        Bring the index up to date with the tables.
+
+        Rows with IDs above the largest indexed one are added; when the
+        number of older rows differs from the index, deleted IDs are
+        found and removed. An empty index is built from scratch.
+
+        Args:
+            session: Database session
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Number of added and removed documents
+        """
+        changed = 0
+        for kind, model, columns in (
+            (QUESTION, Question, (Question.id, Question.id.label("question_id"), Question.text, Question.created_at)),
+            (ANSWER, Answer, (Answer.id, Answer.question_id, Answer.text, Answer.created_at)),
+        ):
+            max_id = self.index.max_id(kind)
+            stored = await session.scalar(select(func.count()).select_from(model).where(model.id <= max_id))
+            if stored != self.index.count(kind):
+                existing = set(await session.scalars(select(model.id).where(model.id <= max_id)))
+                indexed = set(self.index.ids(kind))
+                for doc_id in indexed - existing:
+                    # Ответы удаленного вопроса уже убраны вместе с ним
+                    if self.index.remove(kind, doc_id):
+                        changed += 1
+                # Строки, закоммиченные позже строк с большими id
+                missing = sorted(existing - indexed)
+                for start in range(0, len(missing), batch_size):
+                    changed += await self._add_rows(session, kind, columns,
+                                                    model.id.in_(missing[start:start + batch_size]), batch_size)
+            changed += await self._add_rows(session, kind, columns, model.id > max_id, batch_size)
+
+        logger.info("Search index synced: %s documents changed, %s indexed", changed, len(self.index))
+        return changed
+
+    async def _add_rows(self, session: AsyncSession, kind: str, columns: tuple, condition, batch_size: int) -> int:
+        result = await session.stream(
+            select(*columns).where(condition).order_by(columns[0]).execution_options(yield_per=batch_size)
+        )
+        added = 0
+        async for doc_id, question_id, text, created_at in result:
+            self.index.add(kind, doc_id, question_id, text, created_at)
+            added += 1
+        return added
@@ -0,0 +1,40 @@
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.config import settings
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response that serializes a Pydantic model with pydantic-core straight to bytes."""
+
+    def render(self, content) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
+
+
+def model_response(model: BaseModel, response: Response,
+                   status_code: int = status.HTTP_200_OK) -> BaseModel | Response:
+    """
+    Return a response model through the fast path when FAST_JSON is on.
+
+    FastAPI validates a returned model against ``response_model`` again and
+    encodes it with jsonable_encoder and the stdlib; a returned Response
+    skips both. The model is already built by the service, so it is
+    serialized once as is.
+
+    Args:
+        model: Response model built by the service
+        response: Response injected into the route; its headers and cookies are kept
+        status_code: Status code of the route
+
+    Returns:
+        The model itself with FAST_JSON off, otherwise a ready response
+    """
+    if not settings.fast_json:
+        return model
+    fast = PydanticJSONResponse(model, status_code=response.status_code or status_code)
+    # Заголовки, выставленные зависимостями и маршрутом (ETag, cookie записи), FastAPI сам не переносит
+    fast.headers.raw.extend(response.headers.raw)
+    return fast
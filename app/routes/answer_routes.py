@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_async_session, get_answer_service
-from app.schemes.answer_scheme import AnswerResponse, AnswerCreate
-from app.services.answer_service import AnswerService
+from app.conditional import etag_matches, modified_since, not_modified, set_validators
+from app.dependencies import get_async_session, get_answer_service, get_read_session
+from app.responses import model_response
+from app.schemes.answer_scheme import AnswerResponse, AnswerCreate, AnswerBatchResponse
+from app.schemes.batch_scheme import BatchCreate
+from app.services.answer_service import AnswerService, answer_etag
 
 
 router = APIRouter(prefix="/api/v1", tags=["answers"], redirect_slashes=False)
@@ -13,19 +16,44 @@ router = APIRouter(prefix="/api/v1", tags=["answers"], redirect_slashes=False)
 async def create_answer(
     question_id: int,
     answer: AnswerCreate,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
     service: AnswerService = Depends(get_answer_service),
 ):
-    return await service.create_answer(question_id, answer, session)
+    created = await service.create_answer(question_id, answer, session)
+    return model_response(created, response, status.HTTP_201_CREATED)
 
 
-@router.get("/answers/{answer_id}", response_model=AnswerResponse, summary="Get answer by id")
+@router.post("/questions/{question_id}/answers:batch", response_model=AnswerBatchResponse,
+             summary="Create answers in batch")
+async def create_answers(
+    question_id: int,
+    batch: BatchCreate,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    service: AnswerService = Depends(get_answer_service),
+):
+    return model_response(await service.create_answers(question_id, batch.items, session), response)
+
+
+@router.get("/answers/{answer_id}", response_model=AnswerResponse, summary="Get answer by id",
+            responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}})
 async def get_answer(
         answer_id: int,
-        session: AsyncSession = Depends(get_async_session),
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_read_session),
         service: AnswerService = Depends(get_answer_service)
 ):
-    return await service.get_answer(answer_id, session)
+    # Без условных заголовков валидаторы берутся из загруженного ответа, без отдельного запроса
+    if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+        etag, last_modified = await service.get_answer_validators(answer_id, session)
+        if etag_matches(request, etag) or not modified_since(request, last_modified):
+            return not_modified(etag, last_modified)
+
+    answer = await service.get_answer(answer_id, session)
+    set_validators(response, answer_etag(answer.id, answer.created_at), answer.created_at)
+    return model_response(answer, response)
 
 
 @router.delete("/answers/{answer_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete answer by id")
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dependencies import choose_read_factory, get_export_service
+from app.schemes.export_scheme import ExportParams
+from app.services.export_service import EXPORT_FORMATS, CsvEncoder, ExportService, NdjsonEncoder
+
+
+router = APIRouter(prefix="/api/v1/export", tags=["export"], redirect_slashes=False)
+
+
+@router.get("", response_class=StreamingResponse, summary="Export all questions with answers",
+            responses={200: {"content": {NdjsonEncoder.media_type: {}, CsvEncoder.media_type: {}}}})
+async def export(
+    params: ExportParams = Depends(),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(choose_read_factory),
+    service: ExportService = Depends(get_export_service),
+):
+    encoder = EXPORT_FORMATS[params.format]
+    return StreamingResponse(
+        service.export(session_factory, params.format),
+        media_type=encoder.media_type,
+        headers={"Content-Disposition": f'attachment; filename="export.{encoder.extension}"'},
+    )
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_async_session, get_import_service
+from app.responses import model_response
+from app.schemes.import_scheme import ImportParams, ImportResponse
+from app.services.import_service import ImportService, iter_lines
+
+
+router = APIRouter(prefix="/api/v1/import", tags=["import"], redirect_slashes=False)
+
+
+# Тело читается потоком, поэтому оно не объявлено параметром и описано в OpenAPI вручную
+@router.post("", response_model=ImportResponse, summary="Bulk import questions with answers from NDJSON",
+             openapi_extra={"requestBody": {
+                 "required": True,
+                 "content": {"application/x-ndjson": {"schema": {"type": "string", "format": "binary"}}},
+             }})
+async def import_questions(
+    request: Request,
+    response: Response,
+    params: ImportParams = Depends(),
+    session: AsyncSession = Depends(get_async_session),
+    service: ImportService = Depends(get_import_service),
+):
+    result = await service.import_lines(session, params.job, iter_lines(request.stream()))
+    return model_response(result, response)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_async_session
+
+from app.conditional import etag_matches, not_modified, set_validators
+from app.dependencies import get_async_session, get_read_session
 from app.dependencies import get_question_service
+from app.responses import model_response
 from app.schemes.question_scheme import QuestionCreate, QuestionResponse, PaginationParams, QuestionAnswerResponse
+from app.schemes.question_scheme import QuestionListParams
 from app.services.question_service import QuestionService
-from app.schemes.question_scheme import PaginatedQuestionsResponse
+from app.schemes.question_scheme import PaginatedQuestionsResponse, QuestionBatchResponse
+from app.schemes.batch_scheme import BatchCreate
 
 
 router = APIRouter(prefix="/api/v1/questions", tags=["questions"], redirect_slashes=False)
@@ -14,38 +19,67 @@ router = APIRouter(prefix="/api/v1/questions", tags=["questions"], redirect_slas
              summary="Create question")
 async def create_question(
     question: QuestionCreate,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    service: QuestionService = Depends(get_question_service),
+):
+    created = await service.create_question(question, session)
+    return model_response(created, response, status.HTTP_201_CREATED)
+
+
+@router.post(":batch", response_model=QuestionBatchResponse, summary="Create questions in batch")
+async def create_questions(
+    batch: BatchCreate,
+    response: Response,
     session: AsyncSession = Depends(get_async_session),
     service: QuestionService = Depends(get_question_service),
 ):
-    return await service.create_question(question, session)
+    return model_response(await service.create_questions(batch.items, session), response)
 
 
-@router.get("/{question_id}", response_model=QuestionAnswerResponse, summary="Get question by id with answers")
+@router.get("/{question_id}", response_model=QuestionAnswerResponse, summary="Get question by id with answers",
+            responses={status.HTTP_304_NOT_MODIFIED: {"description": "Not modified"}})
 async def get_question(
     question_id: int,
+    request: Request,
+    response: Response,
     pagination: PaginationParams = Depends(),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     service: QuestionService = Depends(get_question_service),
 ):
-    return await service.get_question(
-        question_id=question_id,
-        session=session,
+    page = dict(
         limit=pagination.limit,
         offset=pagination.offset,
+        cursor=pagination.cursor,
+        include_total=pagination.include_total,
     )
+    # Без If-None-Match версия не читается отдельно: ETag строится по уже загруженной странице
+    if "if-none-match" in request.headers:
+        etag = await service.get_question_etag(question_id, session, **page)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    question, etag = await service.get_question(question_id=question_id, session=session, **page)
+    set_validators(response, etag)
+    return model_response(question, response)
 
 
 @router.get("", response_model=PaginatedQuestionsResponse, summary="Get all questions with pagination")
 async def get_questions(
-    pagination: PaginationParams = Depends(),
-    session: AsyncSession = Depends(get_async_session),
+    response: Response,
+    pagination: QuestionListParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
     service: QuestionService = Depends(get_question_service),
 ):
-    return await service.get_all_questions(
+    questions_page = await service.get_all_questions(
         session,
         offset=pagination.offset,
-        limit=pagination.limit
+        limit=pagination.limit,
+        cursor=pagination.cursor,
+        include_total=pagination.include_total,
+        include_answers=pagination.include_answers,
     )
+    return model_response(questions_page, response)
 
 
 @router.delete("/{question_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete question by id")
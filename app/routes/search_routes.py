@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import get_read_session, get_search_service
+from app.responses import model_response
+from app.schemes.search_scheme import SearchParams, SearchResponse
+from app.services.search_service import SearchService
+
+
+router = APIRouter(prefix="/api/v1/search", tags=["search"], redirect_slashes=False)
+
+
+@router.get("", response_model=SearchResponse, summary="Full-text search over questions and answers")
+async def search(
+    response: Response,
+    params: SearchParams = Depends(),
+    session: AsyncSession = Depends(get_read_session),
+    service: SearchService = Depends(get_search_service),
+):
+    results = await service.search(session, params.q, limit=params.limit, cursor=params.cursor)
+    return model_response(results, response)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends
+
+from app.cache.base import CacheBackend
+from app.database.db import engine
+from app.dependencies import get_cache
+from app.schemes.system_scheme import CacheStatsResponse, PoolStatsResponse
+
+
+router = APIRouter(prefix="/api/v1/system", tags=["system"], redirect_slashes=False)
+
+
+@router.get("/cache", response_model=CacheStatsResponse, summary="Response cache statistics")
+async def get_cache_stats(cache: CacheBackend | None = Depends(get_cache)):
+    if cache is None:
+        return CacheStatsResponse(backend="none", hits=0, misses=0, evictions=0, invalidations=0, hit_ratio=0.0)
+
+    stats = await cache.collect_stats()
+    lookups = stats.hits + stats.misses
+    return CacheStatsResponse(
+        backend=cache.name,
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        invalidations=stats.invalidations,
+        hit_ratio=stats.hits / lookups if lookups else 0.0,
+        size=await cache.size(),
+    )
+
+
+@router.get("/pool", response_model=PoolStatsResponse, summary="Database connection pool statistics")
+async def get_pool_stats():
+    pool = engine.pool
+    stats = pool.usage
+    return PoolStatsResponse(
+        pool_size=pool.size(),
+        max_overflow=pool._max_overflow,
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        # У QueuePool overflow() отрицателен, пока пул не заполнен
+        overflow=max(pool.overflow(), 0),
+        checkouts=stats.checkouts,
+        timeouts=stats.timeouts,
+        wait_avg_ms=stats.wait_total / stats.checkouts * 1000 if stats.checkouts else 0.0,
+        wait_max_ms=stats.wait_max * 1000,
+        hold_avg_ms=stats.hold_total / stats.checkins * 1000 if stats.checkins else 0.0,
+        hold_max_ms=stats.hold_max * 1000,
+    )
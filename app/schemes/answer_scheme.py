@@ -2,10 +2,12 @@ from pydantic import BaseModel, ConfigDict, field_validator, Field
 from datetime import datetime
 from uuid import UUID
 
+from app.schemes.batch_scheme import BatchItemError
+
 
 class AnswerCreate(BaseModel):
     user_id: str = Field(..., description="User UUID")
-    text: str
+    text: str = Field(..., max_length=255)
 
     @field_validator("user_id")
     def validate_uuid_format(cls, v: str) -> str:
@@ -35,7 +37,13 @@ class AnswerResponse(BaseModel):
 
 
 class AnswerPaginationResponse(BaseModel):
-    total: int
+    total: int | None
     items: list[AnswerResponse]
     limit: int
-    offset: int
\ No newline at end of file
+    offset: int
+    next_cursor: str | None = None
+
+
+class AnswerBatchResponse(BaseModel):
+    created: list[AnswerResponse]
+    errors: list[BatchItemError]
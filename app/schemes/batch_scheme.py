@@ -0,0 +1,52 @@
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, Field
+from pydantic import ValidationError as PydanticValidationError
+
+from app.config import settings
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class BatchCreate(BaseModel):
+    # Элементы валидируются по одному в сервисе, чтобы ошибка одного не отменяла весь batch
+    items: list[dict[str, Any]] = Field(
+        ..., min_length=1, max_length=settings.batch_max_size,
+        description=f"Items to create, max {settings.batch_max_size}"
+    )
+
+
+class BatchItemError(BaseModel):
+    index: int
+    code: str
+    message: str
+
+
+def format_validation_error(error: PydanticValidationError) -> str:
+    """Join pydantic errors into one message: ``field: msg; field: msg``."""
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc']))}: {item['msg']}" if item["loc"] else item["msg"]
+        for item in error.errors()
+    )
+
+
+def validate_items(
+        items: list[dict[str, Any]], model: type[ModelT]
+) -> tuple[list[tuple[int, ModelT]], list[BatchItemError]]:
+    """
+    Validate batch items one by one.
+
+    Args:
+        items: Raw batch items
+        model: Pydantic model of a single item
+
+    Returns:
+        Tuple of (valid (index, item) pairs in input order, errors of invalid items)
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item)))
+        except PydanticValidationError as e:
+            errors.append(BatchItemError(index=index, code="validation_error", message=format_validation_error(e)))
+    return valid, errors
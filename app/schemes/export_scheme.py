@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ExportParams(BaseModel):
+    format: Literal["ndjson", "csv"] = Field(
+        "ndjson", description="ndjson — one question with nested answers per line; csv — one row per answer"
+    )
+
+
+class ExportAnswer(BaseModel):
+    id: int
+    user_id: str
+    text: str
+    created_at: datetime
+
+
+class ExportQuestion(BaseModel):
+    id: int
+    text: str
+    created_at: datetime
+    answers: list[ExportAnswer]
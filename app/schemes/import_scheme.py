@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.schemes.answer_scheme import AnswerCreate
+from app.schemes.question_scheme import QuestionCreate
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # Время без часового пояса считается UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class ImportAnswer(AnswerCreate):
+    # id из выгрузки принимается, но не сохраняется: при загрузке id назначаются заново
+    id: int | None = None
+    text: str = Field(..., max_length=255)
+    created_at: datetime | None = None
+
+    _created_at_utc = field_validator("created_at")(_utc)
+
+
+class ImportQuestion(QuestionCreate):
+    """One NDJSON line: a question with its answers, the format of GET /api/v1/export."""
+
+    id: int | None = None
+    text: str = Field(..., max_length=255)
+    created_at: datetime | None = None
+    answers: list[ImportAnswer] = Field(default_factory=list)
+
+    _created_at_utc = field_validator("created_at")(_utc)
+
+
+class ImportParams(BaseModel):
+    job: str = Field(..., min_length=1, max_length=128,
+                     description="Import job name; a repeated request with the same job resumes after its checkpoint")
+
+
+class ImportRejectedLine(BaseModel):
+    line: int
+    code: str
+    message: str
+
+
+class ImportResponse(BaseModel):
+    job: str
+    # Строк входа, обработанных этим и предыдущими запросами задания
+    position: int
+    resumed_from: int
+    questions: int
+    answers: int
+    rejected: int
+    # Первые IMPORT_MAX_ERRORS отклоненных строк этого запроса
+    errors: list[ImportRejectedLine]
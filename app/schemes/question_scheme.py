@@ -1,11 +1,12 @@
 from pydantic import BaseModel, ConfigDict, field_validator, Field
 from datetime import datetime
 
-from app.schemes.answer_scheme import AnswerPaginationResponse
+from app.schemes.answer_scheme import AnswerPaginationResponse, AnswerResponse
+from app.schemes.batch_scheme import BatchItemError
 
 
 class QuestionCreate(BaseModel):
-    text: str
+    text: str = Field(..., max_length=255)
 
     @field_validator("text")
     def text_not_empty(cls, v: str) -> str:
@@ -27,16 +28,44 @@ class QuestionResponse(BaseModel):
 class PaginationParams(BaseModel):
     offset: int = Field(0, ge=0, description="Offset for pagination")
     limit: int = Field(10, ge=1, le=100, description="Limit for pagination, max 100")
+    cursor: str | None = Field(
+        None, description="Opaque cursor from next_cursor; enables keyset pagination, offset is ignored"
+    )
+    include_total: bool = Field(True, description="Compute total count; set false to skip counting")
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class QuestionListParams(PaginationParams):
+    include_answers: int = Field(
+        0, ge=0, le=10, description="Embed up to this many latest answers and answer_count into every question"
+    )
+
+
+class QuestionWithLatestAnswersResponse(QuestionResponse):
+    answer_count: int
+    latest_answers: list[AnswerResponse]
+
+
 class PaginatedQuestionsResponse(BaseModel):
-    total: int
-    items: list[QuestionResponse]
+    total: int | None
+    # С include_answers > 0 элементы содержат answer_count и latest_answers
+    items: list[QuestionWithLatestAnswersResponse | QuestionResponse]
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 class QuestionAnswerResponse(QuestionResponse):
-    answers: AnswerPaginationResponse
\ No newline at end of file
+    answers: AnswerPaginationResponse
+
+
+class CachedQuestionAnswer(BaseModel):
+    """Response cache entry: the body together with the ETag built from the same data."""
+    etag: str
+    question: QuestionAnswerResponse
+
+
+class QuestionBatchResponse(BaseModel):
+    created: list[QuestionResponse]
+    errors: list[BatchItemError]
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SearchParams(BaseModel):
+    # Ограничения Field проверяются при разборе query-параметров (422); field_validator здесь не вызвался бы
+    q: str = Field(..., max_length=200, pattern=r"\S", description="Search query: words, \"phrases\", or, -word")
+    limit: int = Field(10, ge=1, le=100, description="Limit for pagination, max 100")
+    cursor: str | None = Field(None, description="Opaque cursor from next_cursor")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SearchHit(BaseModel):
+    type: Literal["question", "answer"]
+    id: int
+    question_id: int
+    rank: float
+    # HTML-экранированный фрагмент текста, совпадения выделены <mark>
+    snippet: str
+    created_at: datetime
+
+
+class SearchResponse(BaseModel):
+    items: list[SearchHit]
+    limit: int
+    next_cursor: str | None = None
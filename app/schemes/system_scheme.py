@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class CacheStatsResponse(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    hit_ratio: float
+    size: int | None = None
+
+
+class PoolStatsResponse(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    hold_avg_ms: float
+    hold_max_ms: float
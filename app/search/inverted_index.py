@@ -0,0 +1,573 @@
+import bisect
+import contextlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import tempfile
+from array import array
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import groupby, repeat
+from operator import itemgetter
+from typing import NamedTuple
+
+from app.pagination import SearchCursorKey
+
+
+QUESTION = "question"
+ANSWER = "answer"
+# Номер вида документа в массиве _kinds
+_KINDS = (QUESTION, ANSWER)
+
+_WORD_RE = re.compile(r"\w+")
+# -слово исключает документы, слово* — префикс; дефис внутри слова не считается исключением
+_QUERY_RE = re.compile(r"(?:(?<!\w)(-))?(\w+)(\*)?")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Снимок: MAGIC, секции массивов (выровнены по 8 байт), JSON-заголовок, длина заголовка, MAGIC.
+# Заголовок в конце, поэтому секции пишутся потоком и их размеры заранее не нужны
+_MAGIC = b"QAINDEX1"
+_ALIGN = 8
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words."""
+    return _WORD_RE.findall(text.lower())
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + value * _MICROSECOND
+
+
+class IndexHit(NamedTuple):
+    """Search result with the same attributes as rows of SearchRepository."""
+
+    type: str
+    id: int
+    question_id: int
+    created_at: datetime
+    rank: float
+    snippet: str
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over question and answer texts.
+
+    Documents get numbers in insertion order; their fields live in
+    parallel arrays, and every term keeps two arrays of postings:
+    ascending document numbers and term frequencies. Deleted documents
+    are marked dead and dropped by compaction. Results are ranked with
+    BM25; ``word*`` matches words by prefix.
+
+    The index is not thread-safe: it is updated and searched from the
+    event loop of one process.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    # Префикс раскрывается в столько самых частых терминов, не больше
+    max_prefix_terms = 64
+    snippet_words = 30
+    # Компакция, когда мертвых документов больше четверти, но не меньше порога
+    compact_min_dead = 1000
+
+    def __init__(self):
+        self._clear()
+
+    def _clear(self) -> None:
+        previous = getattr(self, "_mmap", None)
+        self._kinds = array("B")
+        self._ids = array("q")
+        self._question_ids = array("q")
+        # Микросекунды от эпохи UTC
+        self._created = array("q")
+        self._lengths = array("I")
+        self._alive = bytearray()
+        # None — текст лежит в снимке и читается из mmap при построении сниппета
+        self._texts: list[str | None] = []
+        self._text_offsets: memoryview | None = None
+        self._text_blob: memoryview | None = None
+        self._mmap: mmap.mmap | None = None
+        # term -> [номера документов, частоты]; после загрузки снимка — memoryview на mmap,
+        # копируются в array при первой записи в термин
+        self._postings: dict[str, list] = {}
+        self._df: dict[str, int] = {}
+        # Отсортированный словарь для префиксов, строится при первом префиксном запросе
+        self._terms: list[str] | None = None
+        # id -> номер документа, отдельно для вопросов и ответов
+        self._docnos: tuple[dict[int, int], dict[int, int]] = ({}, {})
+        # question_id -> номера документов его ответов, для каскадного удаления
+        self._answers: dict[int, list[int]] = {}
+        self._total_length = 0
+        self._dead = 0
+        if previous is not None:
+            # Прежний снимок больше не нужен: ссылки на его memoryview сброшены выше.
+            # Если срез еще где-то жив, close невозможен, и mmap закроет сборщик мусора
+            with contextlib.suppress(BufferError):
+                previous.close()
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._dead
+
+    def count(self, kind: str) -> int:
+        """Number of indexed documents of a kind."""
+        return len(self._docnos[_KINDS.index(kind)])
+
+    def max_id(self, kind: str) -> int:
+        """Largest indexed ID of a kind, 0 if there are none."""
+        return max(self._docnos[_KINDS.index(kind)], default=0)
+
+    def ids(self, kind: str) -> Iterator[int]:
+        """IDs of indexed documents of a kind."""
+        return iter(list(self._docnos[_KINDS.index(kind)]))
+
+    def add(self, kind: str, doc_id: int, question_id: int, text: str, created_at: datetime) -> None:
+        """
+        Index a question or an answer; an already indexed document is replaced.
+
+        Args:
+            kind: "question" or "answer"
+            doc_id: Question or answer ID
+            question_id: Question ID, the same as doc_id for questions
+            text: Document text
+            created_at: Creation time, timezone-aware
+        """
+        self._add(_KINDS.index(kind), doc_id, question_id, text, created_at)
+
+    def add_question(self, question_id: int, text: str, created_at: datetime) -> None:
+        """Index a question."""
+        self._add(0, question_id, question_id, text, created_at)
+
+    def add_answer(self, answer_id: int, question_id: int, text: str, created_at: datetime) -> None:
+        """Index an answer."""
+        self._add(1, answer_id, question_id, text, created_at)
+
+    def remove(self, kind: str, doc_id: int) -> bool:
+        """
+        Remove a document; a question is removed with all its answers.
+
+        Returns:
+            True if the document was indexed
+        """
+        return self.remove_question(doc_id) if kind == QUESTION else self.remove_answer(doc_id)
+
+    def remove_question(self, question_id: int) -> bool:
+        """Remove a question and its answers, as ON DELETE CASCADE does."""
+        for docno in self._answers.pop(question_id, []):
+            self._remove(1, self._ids[docno])
+        removed = self._remove(0, question_id)
+        self._maybe_compact()
+        return removed
+
+    def remove_answer(self, answer_id: int) -> bool:
+        """Remove an answer."""
+        removed = self._remove(1, answer_id)
+        self._maybe_compact()
+        return removed
+
+    def _add(self, kind: int, doc_id: int, question_id: int, text: str, created_at: datetime) -> None:
+        if doc_id in self._docnos[kind]:
+            self._remove(kind, doc_id)
+        docno = len(self._ids)
+        tokens = tokenize(text)
+        for term, tf in Counter(tokens).items():
+            docs, tfs = self._writable_postings(term)
+            docs.append(docno)
+            tfs.append(min(tf, 0xFFFF))
+            self._df[term] = self._df.get(term, 0) + 1
+
+        self._kinds.append(kind)
+        self._ids.append(doc_id)
+        self._question_ids.append(question_id)
+        self._created.append(_to_micros(created_at))
+        self._lengths.append(len(tokens))
+        self._alive.append(1)
+        self._texts.append(text)
+        self._total_length += len(tokens)
+        self._docnos[kind][doc_id] = docno
+        if kind == 1:
+            self._answers.setdefault(question_id, []).append(docno)
+
+    def _writable_postings(self, term: str) -> list:
+        entry = self._postings.get(term)
+        if entry is None:
+            entry = self._postings[term] = [array("I"), array("H")]
+            if self._terms is not None:
+                bisect.insort(self._terms, term)
+        elif not isinstance(entry[0], array):
+            entry[0] = array("I", entry[0].tobytes())
+            entry[1] = array("H", entry[1].tobytes())
+        return entry
+
+    def _remove(self, kind: int, doc_id: int) -> bool:
+        docno = self._docnos[kind].pop(doc_id, None)
+        if docno is None:
+            return False
+        # Постинги не трогаются: мертвый документ пропускается при поиске до компакции
+        for term in set(tokenize(self._text(docno))):
+            self._df[term] -= 1
+        self._alive[docno] = 0
+        self._total_length -= self._lengths[docno]
+        self._dead += 1
+        if kind == 1:
+            answers = self._answers.get(self._question_ids[docno])
+            if answers is not None:
+                answers.remove(docno)
+                if not answers:
+                    del self._answers[self._question_ids[docno]]
+        return True
+
+    def _text(self, docno: int) -> str:
+        text = self._texts[docno]
+        if text is None:
+            text = str(self._text_blob[self._text_offsets[docno]:self._text_offsets[docno + 1]], "utf-8")
+        return text
+
+    def _maybe_compact(self) -> None:
+        if self._dead >= max(self.compact_min_dead, len(self._ids) // 4):
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop dead documents and renumber the rest, reading all snapshot data into memory."""
+        alive = self._alive
+        remap = array("q", [-1]) * len(self._ids)
+        live = [docno for docno in range(len(self._ids)) if alive[docno]]
+        for new, old in enumerate(live):
+            remap[old] = new
+
+        postings = {}
+        for term, (docs, tfs) in self._postings.items():
+            if not self._df.get(term):
+                continue
+            new_docs, new_tfs = array("I"), array("H")
+            for docno, tf in zip(docs, tfs):
+                if alive[docno]:
+                    new_docs.append(remap[docno])
+                    new_tfs.append(tf)
+            postings[term] = [new_docs, new_tfs]
+
+        texts = [self._text(docno) for docno in live]
+        kinds = array("B", (self._kinds[docno] for docno in live))
+        ids = array("q", (self._ids[docno] for docno in live))
+        question_ids = array("q", (self._question_ids[docno] for docno in live))
+        created = array("q", (self._created[docno] for docno in live))
+        lengths = array("I", (self._lengths[docno] for docno in live))
+        df = {term: self._df[term] for term in postings}
+        total_length = self._total_length
+
+        self._clear()
+        self._kinds, self._ids, self._question_ids = kinds, ids, question_ids
+        self._created, self._lengths = created, lengths
+        self._alive = bytearray(b"\x01") * len(ids)
+        self._texts = texts
+        self._postings, self._df = postings, df
+        self._total_length = total_length
+        self._rebuild_lookups()
+
+    def _rebuild_lookups(self) -> None:
+        kinds, ids, question_ids, alive = self._kinds, self._ids, self._question_ids, self._alive
+        questions, answers = self._docnos
+        for docno in range(len(ids)):
+            if not alive[docno]:
+                continue
+            if kinds[docno] == 0:
+                questions[ids[docno]] = docno
+            else:
+                answers[ids[docno]] = docno
+                self._answers.setdefault(question_ids[docno], []).append(docno)
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        terms = self._terms
+        matches = []
+        for position in range(bisect.bisect_left(terms, prefix), len(terms)):
+            term = terms[position]
+            if not term.startswith(prefix):
+                break
+            if self._df.get(term):
+                matches.append(term)
+        if len(matches) > self.max_prefix_terms:
+            matches = heapq.nlargest(self.max_prefix_terms, matches, key=self._df.__getitem__)
+        return matches
+
+    def search(self, query: str, limit: int = 10, after: SearchCursorKey | None = None,
+               max_candidates: int = 0, highlight: tuple[str, str] = ("", "")) -> list[IndexHit]:
+        """
+        Search documents containing every query word.
+
+        ``word*`` matches words starting with ``word``, ``-word`` excludes
+        documents containing it. Results are ordered by (rank, type, id)
+        descending, like SearchRepository, so the same cursors work.
+
+        Args:
+            query: Search query
+            limit: Maximum number of results to return
+            after: Keyset position (rank, type, id) to continue after
+            max_candidates: Rank only the first N matches in insertion order, 0 — all
+            highlight: Markers put around matched words in the snippet
+
+        Returns:
+            Ranked hits with snippets
+        """
+        groups, excluded, words, prefixes = [], [], set(), []
+        for minus, word, star in _QUERY_RE.findall(query.lower()):
+            terms = self._expand_prefix(word) if star else [word] if self._df.get(word) else []
+            if minus:
+                excluded.extend(self._postings[term][0] for term in terms)
+                continue
+            if not terms:
+                return []
+            groups.append(terms)
+            if star:
+                prefixes.append(word)
+            else:
+                words.add(word)
+        if not groups:
+            return []
+
+        documents = len(self)
+        average_length = self._total_length / documents
+        k1, b = self.k1, self.b
+
+        def weighted(term: str) -> tuple:
+            df = self._df[term]
+            docs, tfs = self._postings[term]
+            return docs, tfs, math.log(1 + (documents - df + 0.5) / (df + 0.5))
+
+        # Документы перебираются по самой короткой группе; слияние раскрытий префикса
+        # медленнее перебора одного термина, поэтому такие группы считаются длиннее
+        groups = sorted(
+            ([weighted(term) for term in terms] for terms in groups),
+            key=lambda group: sum(len(docs) for docs, _, _ in group) * (1 if len(group) == 1 else 4),
+        )
+        driver, others = groups[0], groups[1:]
+        if len(driver) == 1:
+            docs, tfs, idf = driver[0]
+            candidates = zip(docs, zip(zip(tfs, repeat(idf))))
+        else:
+            # Слияние лениво, чтобы max_candidates останавливал его на первых совпадениях
+            merged = heapq.merge(*(zip(docs, tfs, repeat(idf)) for docs, tfs, idf in driver))
+            candidates = (
+                (docno, [(tf, idf) for _, tf, idf in postings])
+                for docno, postings in groupby(merged, key=itemgetter(0))
+            )
+        # В остальных группах один термин ищется бинарным поиском, а раскрытия префикса
+        # собираются в словарь номер документа -> (tf, idf)
+        lookups = [group[0] if len(group) == 1 else self._postings_map(group) for group in others]
+
+        alive, lengths = self._alive, self._lengths
+        scored = []
+        for docno, matches in candidates:
+            if not alive[docno]:
+                continue
+            found = [matches]
+            for lookup in lookups:
+                if isinstance(lookup, dict):
+                    pairs = lookup.get(docno)
+                else:
+                    docs, tfs, idf = lookup
+                    position = bisect.bisect_left(docs, docno)
+                    pairs = ((tfs[position], idf),) if position < len(docs) and docs[position] == docno else None
+                if pairs is None:
+                    break
+                found.append(pairs)
+            else:
+                if excluded and any(self._contains(docs, docno) for docs in excluded):
+                    continue
+                norm = k1 * (1 - b + b * lengths[docno] / average_length)
+                score = 0.0
+                for pairs in found:
+                    # Для префикса в счет идет лучшее из раскрытий, найденных в документе
+                    best = 0.0
+                    for tf, idf in pairs:
+                        value = idf * tf * (k1 + 1) / (tf + norm)
+                        if value > best:
+                            best = value
+                    score += best
+                scored.append((score, _KINDS[self._kinds[docno]], self._ids[docno], docno))
+                if max_candidates and len(scored) >= max_candidates:
+                    break
+
+        if after is not None:
+            scored = [hit for hit in scored if hit[:3] < tuple(after)]
+        page = heapq.nlargest(limit, scored)
+
+        start, stop = highlight
+        return [
+            IndexHit(
+                type=hit_type,
+                id=hit_id,
+                question_id=self._question_ids[docno],
+                created_at=_from_micros(self._created[docno]),
+                rank=score,
+                snippet=self._snippet(self._text(docno), words, tuple(prefixes), start, stop),
+            )
+            for score, hit_type, hit_id, docno in page
+        ]
+
+    @staticmethod
+    def _postings_map(group: list[tuple]) -> dict[int, list[tuple[int, float]]]:
+        postings = {}
+        for docs, tfs, idf in group:
+            for docno, tf in zip(docs, tfs):
+                postings.setdefault(docno, []).append((tf, idf))
+        return postings
+
+    @staticmethod
+    def _contains(docs, docno: int) -> bool:
+        position = bisect.bisect_left(docs, docno)
+        return position < len(docs) and docs[position] == docno
+
+    def _snippet(self, text: str, words: set[str], prefixes: tuple[str, ...], start: str, stop: str) -> str:
+        tokens = list(_WORD_RE.finditer(text))
+        if not tokens:
+            return text
+        matched = [
+            position for position, token in enumerate(tokens)
+            if (word := token.group().lower()) in words or word.startswith(prefixes)
+        ]
+        # Окно из snippet_words слов, начинается чуть раньше первого совпадения
+        first = max(0, (matched[0] if matched else 0) - 5)
+        last = min(len(tokens), first + self.snippet_words)
+        first = max(0, last - self.snippet_words)
+
+        parts, cursor = [], tokens[first].start()
+        for position in matched:
+            if first <= position < last:
+                token = tokens[position]
+                parts += (text[cursor:token.start()], start, token.group(), stop)
+                cursor = token.end()
+        parts.append(text[cursor:tokens[last - 1].end()])
+        return "".join(parts)
+
+    def save(self, path: str) -> None:
+        """
+        Write a snapshot atomically: to a temporary file, then rename over ``path``.
+
+        Args:
+            path: Snapshot file path
+        """
+        # У каждого процесса свой временный файл: общий path.tmp перезаписывали бы все воркеры сразу.
+        # Каталог тот же, что у снимка, иначе os.replace не атомарен
+        file = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.",
+                                           suffix=".tmp", delete=False)
+        try:
+            with file:
+                self._write_snapshot(file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(file.name, path)
+        except BaseException:
+            os.unlink(file.name)
+            raise
+
+    def _write_snapshot(self, file) -> None:
+        sections, terms = {}, []
+        file.write(_MAGIC)
+
+        def write_section(name: str, typecode: str, chunks) -> None:
+            offset, size = file.tell(), 0
+            for chunk in chunks:
+                size += file.write(chunk)
+            sections[name] = [offset, size, typecode]
+            file.write(b"\x00" * (-file.tell() % _ALIGN))
+
+        write_section("kinds", "B", [self._kinds])
+        write_section("ids", "q", [self._ids])
+        write_section("question_ids", "q", [self._question_ids])
+        write_section("created", "q", [self._created])
+        write_section("lengths", "I", [self._lengths])
+        write_section("alive", "B", [self._alive])
+
+        # Термины без живых документов не сохраняются
+        live_terms = [term for term, df in self._df.items() if df]
+        start = 0
+        for term in live_terms:
+            count = len(self._postings[term][0])
+            terms.append([term, start, count, self._df[term]])
+            start += count
+        write_section("docs", "I", (self._postings[term][0] for term in live_terms))
+        write_section("tfs", "H", (self._postings[term][1] for term in live_terms))
+
+        offsets = array("Q", [0])
+
+        def encoded_texts():
+            for docno in range(len(self._ids)):
+                text = self._texts[docno]
+                chunk = (self._text_blob[self._text_offsets[docno]:self._text_offsets[docno + 1]]
+                         if text is None else text.encode())
+                offsets.append(offsets[-1] + len(chunk))
+                yield chunk
+
+        write_section("texts", "B", encoded_texts())
+        write_section("text_offsets", "Q", [offsets])
+
+        header = json.dumps({
+            "total_length": self._total_length,
+            "dead": self._dead,
+            "sections": sections,
+            "terms": terms,
+        }, ensure_ascii=False, separators=(",", ":")).encode()
+        file.write(header)
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(_MAGIC)
+
+    def load(self, path: str) -> None:
+        """
+        Replace the index contents with a snapshot.
+
+        The file is memory-mapped: postings and texts are read from the
+        mapping and copied into memory only when a term gets a new
+        document or on compaction.
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            ValueError: If the file is not an index snapshot
+        """
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < 2 * len(_MAGIC) + 8 or mapping[:8] != _MAGIC or mapping[-8:] != _MAGIC:
+            mapping.close()
+            raise ValueError(f"{path} is not a search index snapshot")
+        header_length = int.from_bytes(mapping[-16:-8], "little")
+        header = json.loads(mapping[-16 - header_length:-16])
+        view = memoryview(mapping)
+
+        def section(name: str) -> memoryview:
+            offset, size, typecode = header["sections"][name]
+            return view[offset:offset + size].cast(typecode)
+
+        self._clear()
+        self._mmap = mapping
+        # Поля документов дополняются при записи, поэтому копируются сразу
+        self._kinds = array("B", section("kinds").tobytes())
+        self._ids = array("q", section("ids").tobytes())
+        self._question_ids = array("q", section("question_ids").tobytes())
+        self._created = array("q", section("created").tobytes())
+        self._lengths = array("I", section("lengths").tobytes())
+        self._alive = bytearray(section("alive"))
+        self._texts = [None] * len(self._ids)
+        self._text_blob = section("texts")
+        self._text_offsets = section("text_offsets")
+
+        docs, tfs = section("docs"), section("tfs")
+        for term, start, count, df in header["terms"]:
+            self._postings[term] = [docs[start:start + count], tfs[start:start + count]]
+            self._df[term] = df
+        self._total_length = header["total_length"]
+        self._dead = header["dead"]
+        self._rebuild_lookups()
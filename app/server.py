@@ -0,0 +1,58 @@
+# Production-запуск: python -m app.server [--workers N]
+# Все параметры берутся из app.config.Settings (env и .env), флаги их переопределяют
+
+
+import argparse
+import importlib.util
+import os
+import tempfile
+
+import uvicorn
+
+from app.config import settings
+
+
+def resolve_loop(loop: str) -> str:
+    """uvloop when installed, unless a loop is set explicitly."""
+    if loop != "auto":
+        return loop
+    return "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio"
+
+
+def resolve_http(http: str) -> str:
+    """httptools when installed, unless a parser is set explicitly."""
+    if http != "auto":
+        return http
+    return "httptools" if importlib.util.find_spec("httptools") is not None else "h11"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the QA API with multiple uvicorn workers")
+    parser.add_argument("--host", default=settings.web_host)
+    parser.add_argument("--port", type=int, default=settings.web_port)
+    parser.add_argument("--workers", type=int, default=settings.web_workers)
+    args = parser.parse_args()
+
+    # Воркеры читают настройки заново при импорте app.main: число воркеров нужно им для
+    # деления DB_POOL_TOTAL
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    if args.workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        # Метрики воркеров собираются через общий каталог; новый на каждый запуск, без старых файлов
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="qa-metrics-")
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=resolve_loop(settings.web_loop),
+        http=resolve_http(settings.web_http),
+        backlog=settings.web_backlog,
+        timeout_keep_alive=settings.web_keepalive,
+        timeout_graceful_shutdown=settings.web_graceful_timeout,
+        access_log=settings.web_access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,32 @@
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.base import CacheBackend
+from app.cache.keys import answer_tag, question_tag
+from app.conditional import make_etag
+from app.database.db import release_connection
 from app.errors import NotFoundError
 from app.logging_config import setup_logger
+from app.pagination import encode_cursor
 from app.repository.answer_repository import AnswerRepository
-from app.schemes.answer_scheme import AnswerResponse, AnswerPaginationResponse, AnswerCreate
+from app.schemes.answer_scheme import AnswerResponse, AnswerPaginationResponse, AnswerCreate, AnswerBatchResponse
+from app.schemes.batch_scheme import BatchItemError, validate_items
 
 logger = setup_logger(__name__)
 
 
+def answer_etag(answer_id: int, created_at: datetime) -> str:
+    """ETag of an answer; answers are immutable, so their creation time is the version."""
+    return make_etag("answer", answer_id, created_at.isoformat())
+
+
 class AnswerService:
     """Service for answer business logic."""
 
-    def __init__(self, repository: AnswerRepository):
+    def __init__(self, repository: AnswerRepository, cache: CacheBackend | None = None):
         self.repository = repository
+        self.cache = cache
 
     async def create_answer(self, question_id: int, answer_data: AnswerCreate, session: AsyncSession) -> AnswerResponse:
         """
@@ -31,33 +45,63 @@ class AnswerService:
             ConflictError: If answer creation fails
         """
         db_answer = await self.repository.create(question_id, answer_data, session)
+        await self.invalidate(question_tag(question_id))
         return AnswerResponse.model_validate(db_answer)
 
-    async def get_answers(self, session: AsyncSession, question_id: int,
-                          offset: int = 0, limit: int = 10) -> AnswerPaginationResponse:
+    async def create_answers(self, question_id: int, items: list[dict], session: AsyncSession) -> AnswerBatchResponse:
         """
-        Get paginated answers for a question.
+        Create a batch of answers for a question; failed items are reported, not fatal.
 
         Args:
+            question_id: ID of the question to answer
+            items: Raw answer creation data
             session: Database session
-            question_id: ID of the question
+
+        Returns:
+            Created answers and per-item errors
+
+        Raises:
+            ConflictError: If answers creation fails
+        """
+        valid, errors = validate_items(items, AnswerCreate)
+        created = []
+        if valid:
+            db_answers = await self.repository.create_many(question_id, [item for _, item in valid], session)
+            if db_answers is None:
+                errors.extend(
+                    BatchItemError(index=index, code="not_found", message=f"question {question_id} not found")
+                    for index, _ in valid
+                )
+                errors.sort(key=lambda error: error.index)
+            else:
+                created = [AnswerResponse.model_validate(answer) for answer in db_answers]
+                await self.invalidate(question_tag(question_id))
+        return AnswerBatchResponse(created=created, errors=errors)
+
+    def build_page(self, answers: list[AnswerResponse], total_count: int | None,
+                   limit: int, offset: int) -> AnswerPaginationResponse:
+        """
+        Build paginated answers response from loaded answers.
+
+        Args:
+            answers: Answers of the current page
+            total_count: Total answers count or None
+            limit: Pagination limit
             offset: Pagination offset
-            limit: Pagination limit (max 10)
 
         Returns:
             Paginated answers response
         """
-        db_answers, total_count = await self.repository.get_by_question_id(
-            session, question_id, limit=limit, offset=offset
-        )
-
-        answers = [AnswerResponse.model_validate(answer) for answer in db_answers]
+        next_cursor = None
+        if len(answers) == limit:
+            next_cursor = encode_cursor(answers[-1].created_at, answers[-1].id)
 
         return AnswerPaginationResponse(
             total=total_count,
             items=answers,
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_cursor=next_cursor
         )
 
     async def get_answer(self, answer_id: int, session: AsyncSession) -> AnswerResponse:
@@ -74,10 +118,46 @@ class AnswerService:
         Raises:
             NotFoundError: If answer doesn't exist
         """
+        cache_key = f"answer:{answer_id}"
+        if self.cache is not None:
+            cached = await self.cache.get_model(cache_key, AnswerResponse)
+            if cached is not None:
+                return cached
+            # Тег вопроса известен только после чтения; поколение покрывает и его
+            generation = await self.cache.generation()
+
         db_answer = await self.repository.get_by_id(answer_id, session)
+        await release_connection(session)
         if not db_answer:
             raise NotFoundError(f"Answer with id {answer_id} not found")
-        return AnswerResponse.model_validate(db_answer)
+        answer = AnswerResponse.model_validate(db_answer)
+
+        if self.cache is not None:
+            await self.cache.set_model(
+                cache_key, answer, tags=(answer_tag(answer_id), question_tag(answer.question_id)),
+                generation=generation,
+            )
+        return answer
+
+    async def get_answer_validators(self, answer_id: int, session: AsyncSession) -> tuple[str, datetime]:
+        """
+        Get ETag and Last-Modified of an answer without loading it.
+
+        Args:
+            answer_id: ID of the answer
+            session: Database session
+
+        Returns:
+            Tuple of (ETag header value, last modification time)
+
+        Raises:
+            NotFoundError: If answer doesn't exist
+        """
+        created_at = await self.repository.get_created_at(answer_id, session)
+        await release_connection(session)
+        if created_at is None:
+            raise NotFoundError(f"Answer with id {answer_id} not found")
+        return answer_etag(answer_id, created_at), created_at
 
     async def delete_answer(self, answer_id: int, session: AsyncSession) -> None:
         """
@@ -91,7 +171,15 @@ class AnswerService:
             NotFoundError: If answer doesn't exist
             ConflictError: If deletion fails
         """
-        db_answer = await self.repository.get_by_id(answer_id, session)
-        if not db_answer:
-            raise NotFoundError(f"Answer with id {answer_id} not found")
-        await self.repository.delete(db_answer, session)
\ No newline at end of file
+        question_id = await self.repository.delete(answer_id, session)
+        await self.invalidate(answer_tag(answer_id), question_tag(question_id))
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        Drop cached responses registered in the given tags.
+
+        Args:
+            tags: Cache tags, see app.cache.keys
+        """
+        if self.cache is not None:
+            await self.cache.invalidate_tags(*tags)
\ No newline at end of file
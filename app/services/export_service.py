@@ -0,0 +1,123 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.logging_config import setup_logger
+from app.repository.export_repository import ExportRepository
+from app.schemes.export_scheme import ExportAnswer, ExportQuestion
+
+logger = setup_logger(__name__)
+
+
+class NdjsonEncoder:
+    """One JSON object per line: a question with all its answers."""
+
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self):
+        # Ответы вопроса могут прийти в нескольких пачках курсора, поэтому вопрос
+        # пишется, только когда начался следующий
+        self._question: ExportQuestion | None = None
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        lines = []
+        question = self._question
+        for row in rows:
+            if question is None or question.id != row.question_id:
+                if question is not None:
+                    lines.append(self._dump(question))
+                # Данные из БД не валидируются повторно
+                question = ExportQuestion.model_construct(
+                    id=row.question_id, text=row.question_text, created_at=row.question_created_at, answers=[]
+                )
+            if row.answer_id is not None:
+                question.answers.append(ExportAnswer.model_construct(
+                    id=row.answer_id, user_id=row.answer_user_id, text=row.answer_text,
+                    created_at=row.answer_created_at,
+                ))
+        self._question = question
+        return b"".join(lines)
+
+    def finish(self) -> bytes:
+        return self._dump(self._question) if self._question is not None else b""
+
+    @staticmethod
+    def _dump(question: ExportQuestion) -> bytes:
+        return ExportQuestion.__pydantic_serializer__.to_json(question) + b"\n"
+
+
+class CsvEncoder:
+    """One row per answer with the question columns repeated; a question without answers is one row."""
+
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+    columns = ("question_id", "question_text", "question_created_at",
+               "answer_id", "answer_user_id", "answer_text", "answer_created_at")
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(self.columns)
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        self._writer.writerows(
+            (
+                row.question_id, row.question_text, row.question_created_at.isoformat(),
+                row.answer_id, row.answer_user_id, row.answer_text,
+                row.answer_created_at.isoformat() if row.answer_created_at is not None else None,
+            )
+            for row in rows
+        )
+        return self.finish()
+
+    def finish(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data.encode()
+
+
+EXPORT_FORMATS = {"ndjson": NdjsonEncoder, "csv": CsvEncoder}
+
+
+class ExportService:
+    """Service for streaming export of all questions with answers."""
+
+    def __init__(self, repository: ExportRepository, batch_size: int = 1000):
+        self.repository = repository
+        self.batch_size = batch_size
+
+    async def export(self, session_factory: async_sessionmaker[AsyncSession],
+                     export_format: str = "ndjson") -> AsyncIterator[bytes]:
+        """
+        Stream all questions with their answers, one chunk per cursor batch.
+
+        The generator owns its session: a StreamingResponse body is sent
+        after request dependencies have exited. Memory use depends on the
+        batch size, not on the table size; the connection is held until
+        the last row is sent or the client disconnects.
+
+        Args:
+            session_factory: Factory of the session to read from
+            export_format: "ndjson" or "csv"
+
+        Yields:
+            Encoded chunks of the export
+        """
+        encoder = EXPORT_FORMATS[export_format]()
+        rows_count = 0
+        async with session_factory() as session:
+            result = await self.repository.stream_questions_with_answers(session, batch_size=self.batch_size)
+            async for rows in result.partitions():
+                rows_count += len(rows)
+                chunk = encoder.encode(rows)
+                if chunk:
+                    yield chunk
+        chunk = encoder.finish()
+        if chunk:
+            yield chunk
+        logger.info("Export finished: %s rows as %s", rows_count, export_format)
@@ -0,0 +1,110 @@
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.base import CacheBackend
+from app.cache.keys import QUESTIONS_LIST_TAG
+from app.logging_config import setup_logger
+from app.repository.import_repository import ImportRepository
+from app.schemes.batch_scheme import format_validation_error
+from app.schemes.import_scheme import ImportQuestion, ImportRejectedLine, ImportResponse
+
+logger = setup_logger(__name__)
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Split a stream of byte chunks, e.g. a request body, into lines."""
+    tail = b""
+    async for chunk in chunks:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line
+    if tail:
+        yield tail
+
+
+class ImportService:
+    """Service for resumable bulk import of questions with answers."""
+
+    def __init__(self, repository: ImportRepository, cache: CacheBackend | None = None,
+                 batch_size: int = 1000, max_errors: int = 1000):
+        self.repository = repository
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    async def import_lines(
+            self, session: AsyncSession, job: str, lines: AsyncIterable[bytes],
+            on_reject: Callable[[ImportRejectedLine, bytes], None] | None = None,
+    ) -> ImportResponse:
+        """
+        Validate NDJSON lines and load them in batches of ``batch_size`` lines.
+
+        Every line is a question with its answers, in the format of
+        GET /api/v1/export; blank lines are skipped. Invalid lines are
+        rejected one by one and don't stop the import. Each batch is
+        committed together with the job checkpoint, so after a failure the
+        same input can be sent again: lines up to the checkpoint are
+        skipped without parsing.
+
+        Args:
+            session: Database session
+            job: Import job name
+            lines: Input lines
+            on_reject: Called with every rejected line and its raw bytes
+
+        Returns:
+            Import summary with the first ``max_errors`` rejected lines
+
+        Raises:
+            ConflictError: If another request loads the same job concurrently
+        """
+        checkpoint = await self.repository.get_checkpoint(session, job)
+        resumed_from = position = checkpoint.position
+        if resumed_from:
+            logger.info("Import job %s: resuming after line %s", job, resumed_from)
+
+        result = ImportResponse(job=job, position=position, resumed_from=resumed_from,
+                                questions=0, answers=0, rejected=0, errors=[])
+        batch: list[ImportQuestion] = []
+        batch_rejected = 0
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if line_number <= resumed_from:
+                continue
+            line = line.strip()
+            if line:
+                try:
+                    batch.append(ImportQuestion.model_validate_json(line))
+                except PydanticValidationError as e:
+                    rejected = ImportRejectedLine(line=line_number, code="validation_error",
+                                                  message=format_validation_error(e))
+                    batch_rejected += 1
+                    if len(result.errors) < self.max_errors:
+                        result.errors.append(rejected)
+                    if on_reject is not None:
+                        on_reject(rejected, line)
+
+            if len(batch) + batch_rejected >= self.batch_size:
+                await self._load(session, job, batch, position, line_number, batch_rejected, result)
+                position = line_number
+                batch, batch_rejected = [], 0
+
+        if line_number > position:
+            await self._load(session, job, batch, position, line_number, batch_rejected, result)
+        logger.info("Import job %s finished at line %s: %s questions, %s answers, %s rejected",
+                    job, result.position, result.questions, result.answers, result.rejected)
+        return result
+
+    async def _load(self, session: AsyncSession, job: str, batch: list[ImportQuestion], position: int,
+                    new_position: int, rejected: int, result: ImportResponse) -> None:
+        answers = await self.repository.load_batch(session, job, batch, position, new_position, rejected)
+        result.position = new_position
+        result.questions += len(batch)
+        result.answers += answers
+        result.rejected += rejected
+        if batch and self.cache is not None:
+            await self.cache.invalidate_tags(QUESTIONS_LIST_TAG)
@@ -1,18 +1,43 @@
+from collections.abc import Sequence
+
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.base import CacheBackend
+from app.cache.keys import QUESTIONS_LIST_TAG, question_tag
+from app.conditional import make_etag
+from app.database.db import release_connection
 from app.errors import NotFoundError
+from app.pagination import decode_cursor, encode_cursor
+from app.schemes.batch_scheme import validate_items
+from app.schemes.answer_scheme import AnswerResponse
 from app.schemes.question_scheme import QuestionCreate, QuestionResponse, PaginatedQuestionsResponse, \
-    QuestionAnswerResponse
-from app.repository.question_repository import QuestionRepository
+    QuestionAnswerResponse, QuestionBatchResponse, QuestionWithLatestAnswersResponse, CachedQuestionAnswer
+from app.repository.question_repository import QuestionRepository, QuestionVersion
 from app.services.answer_service import AnswerService
 
 
+def question_etag(question_id: int, version: QuestionVersion, limit: int, offset: int,
+                  cursor: str | None, include_total: bool) -> str:
+    """ETag of a question-with-answers page: the answers version and the page parameters."""
+    answers_count, newest_answer_id = version
+    return make_etag("question", question_id, answers_count, newest_answer_id, limit, offset, cursor, include_total)
+
+
+def embedded_answer(question_id: int, row: Row) -> AnswerResponse:
+    """Answer response from a row of EMBEDDED_ANSWER_COLUMNS read together with its question."""
+    return AnswerResponse(id=row.answer_id, question_id=question_id, user_id=row.user_id,
+                          text=row.answer_text, created_at=row.answer_created_at)
+
+
 class QuestionService:
     """Service for question business logic."""
 
-    def __init__(self, repository: QuestionRepository, answer_service: AnswerService):
+    def __init__(self, repository: QuestionRepository, answer_service: AnswerService,
+                 cache: CacheBackend | None = None):
         self.repository = repository
         self.answer_service = answer_service
+        self.cache = cache
 
     async def create_question(self, question_data: QuestionCreate, session: AsyncSession) -> QuestionResponse:
         """
@@ -26,68 +51,205 @@ class QuestionService:
             Created question response
         """
         db_question = await self.repository.create(question_data, session)
+        await self.invalidate(QUESTIONS_LIST_TAG)
         return QuestionResponse.model_validate(db_question)
 
+    async def create_questions(self, items: list[dict], session: AsyncSession) -> QuestionBatchResponse:
+        """
+        Create a batch of questions; invalid items are reported, not fatal.
+
+        Args:
+            items: Raw question creation data
+            session: Database session
+
+        Returns:
+            Created questions and per-item errors
+
+        Raises:
+            ConflictError: If questions creation fails
+        """
+        valid, errors = validate_items(items, QuestionCreate)
+        created = []
+        if valid:
+            db_questions = await self.repository.create_many([item for _, item in valid], session)
+            created = [QuestionResponse.model_validate(question) for question in db_questions]
+            await self.invalidate(QUESTIONS_LIST_TAG)
+        return QuestionBatchResponse(created=created, errors=errors)
+
     async def get_question(
             self,
             question_id: int,
             session: AsyncSession,
             limit: int = 10,
             offset: int = 0,
-    ) -> QuestionAnswerResponse:
+            cursor: str | None = None,
+            include_total: bool = True,
+    ) -> tuple[QuestionAnswerResponse, str]:
         """
-        Get question with paginated answers.
+        Get question with paginated answers and the ETag of this representation.
+
+        The ETag is built from the version read together with the page and
+        is cached along with the body, so a cached body is never sent under
+        the ETag of newer data.
 
         Args:
             question_id: ID of the question
             session: Database session
             limit: Answers pagination limit
             offset: Answers pagination offset
+            cursor: Answers keyset cursor, takes precedence over offset
+            include_total: Whether to compute total answers count
 
         Returns:
-            Question with answers response
+            Tuple of (question with answers response, ETag header value)
 
         Raises:
             NotFoundError: If question doesn't exist
+            ValidationError: If cursor is malformed
         """
-        db_question = await self.repository.get_by_id(question_id=question_id, session=session)
+        cache_key = f"question:{question_id}:{limit}:{offset}:{cursor}:{include_total}"
+        if self.cache is not None:
+            cached = await self.cache.get_model(cache_key, CachedQuestionAnswer)
+            if cached is not None:
+                return cached.question, cached.etag
+            # Поколение берется до чтения: инвалидация после него не даст положить в кэш старое тело
+            generation = await self.cache.generation()
+
+        after = decode_cursor(cursor) if cursor else None
+        db_question, db_answers, total_count, version = await self.repository.get_with_answers(
+            session, question_id, limit=limit, offset=offset, after=after, include_total=include_total
+        )
+        await release_connection(session)
         if not db_question:
             raise NotFoundError(f"Question with id={question_id} not found")
 
-        answers_page = await self.answer_service.get_answers(
-            session=session, question_id=question_id, limit=limit, offset=offset
-        )
+        answers = [embedded_answer(question_id, row) for row in db_answers]
+        answers_page = self.answer_service.build_page(answers, total_count, limit=limit, offset=offset)
 
-        return QuestionAnswerResponse(
+        question = QuestionAnswerResponse(
             id=db_question.id,
             text=db_question.text,
             created_at=db_question.created_at,
             answers=answers_page
         )
+        etag = question_etag(question_id, version, limit, offset, cursor, include_total)
+
+        if self.cache is not None:
+            await self.cache.set_model(cache_key, CachedQuestionAnswer(etag=etag, question=question),
+                                       tags=(question_tag(question_id),), generation=generation)
+        return question, etag
+
+    async def get_question_etag(
+            self,
+            question_id: int,
+            session: AsyncSession,
+            limit: int = 10,
+            offset: int = 0,
+            cursor: str | None = None,
+            include_total: bool = True,
+    ) -> str:
+        """
+        Get ETag of the question-with-answers representation without loading answers.
+
+        Reads answer_count and the newest answer id: the question row and
+        one index entry. Meant for requests with If-None-Match only.
+
+        Args:
+            question_id: ID of the question
+            session: Database session
+            limit: Answers pagination limit
+            offset: Answers pagination offset
+            cursor: Answers keyset cursor
+            include_total: Whether total answers count is included
+
+        Returns:
+            ETag header value
+
+        Raises:
+            NotFoundError: If question doesn't exist
+        """
+        version = await self.repository.get_version(session, question_id)
+        await release_connection(session)
+        if version is None:
+            raise NotFoundError(f"Question with id={question_id} not found")
+        return question_etag(question_id, version, limit, offset, cursor, include_total)
 
     async def get_all_questions(self, session: AsyncSession,
-                                offset: int = 0, limit: int = 10) -> PaginatedQuestionsResponse:
+                                offset: int = 0, limit: int = 10,
+                                cursor: str | None = None,
+                                include_total: bool = True,
+                                include_answers: int = 0) -> PaginatedQuestionsResponse:
         """
         Get paginated list of all questions.
 
+        With ``include_answers`` every question carries its latest answers
+        and answers count, read for the whole page with one more statement.
+
         Args:
             session: Database session
             offset: Pagination offset
             limit: Pagination limit
+            cursor: Opaque keyset cursor, takes precedence over offset
+            include_total: Whether to compute total count
+            include_answers: Number of latest answers to embed, 0 for none
 
         Returns:
             Paginated questions response
+
+        Raises:
+            ValidationError: If cursor is malformed
         """
-        db_questions, total = await self.repository.get_all(session=session, limit=limit, offset=offset)
-        questions = [QuestionResponse.model_validate(question) for question in db_questions]
+        cache_key = f"questions:{limit}:{offset}:{cursor}:{include_total}:{include_answers}"
+        if self.cache is not None:
+            cached = await self.cache.get_model(cache_key, PaginatedQuestionsResponse)
+            if cached is not None:
+                return cached
+            generation = await self.cache.generation()
 
-        return PaginatedQuestionsResponse(
+        after = decode_cursor(cursor) if cursor else None
+        db_questions, total = await self.repository.get_all(
+            session=session, limit=limit, offset=offset, after=after, include_total=include_total
+        )
+        if include_answers and db_questions:
+            questions = await self._with_latest_answers(session, db_questions, include_answers)
+        else:
+            await release_connection(session)
+            # Строки содержат ровно поля ответа, from_attributes не нужен
+            questions = [QuestionResponse(**row._mapping) for row in db_questions]
+        next_cursor = None
+        if len(questions) == limit:
+            next_cursor = encode_cursor(questions[-1].created_at, questions[-1].id)
+
+        questions_page = PaginatedQuestionsResponse(
             total=total,
             items=questions,
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_cursor=next_cursor
         )
 
+        if self.cache is not None:
+            tags = (QUESTIONS_LIST_TAG,)
+            if include_answers:
+                # Новый или удаленный ответ любого вопроса страницы сбрасывает ее
+                tags += tuple(question_tag(question.id) for question in questions)
+            await self.cache.set_model(cache_key, questions_page, tags=tags, generation=generation)
+        return questions_page
+
+    async def _with_latest_answers(self, session: AsyncSession, db_questions: Sequence[Row],
+                                   limit: int) -> list[QuestionWithLatestAnswersResponse]:
+        question_ids = [row.id for row in db_questions]
+        answers, counts = await self.repository.get_latest_answers(session, question_ids, limit)
+        await release_connection(session)
+        return [
+            QuestionWithLatestAnswersResponse(
+                **row._mapping,
+                answer_count=counts.get(row.id, 0),
+                latest_answers=[embedded_answer(row.id, answer) for answer in answers.get(row.id, ())],
+            )
+            for row in db_questions
+        ]
+
     async def delete_question(self, question_id: int, session: AsyncSession) -> None:
         """
         Delete question by ID.
@@ -100,7 +262,15 @@ class QuestionService:
             NotFoundError: If question doesn't exist
             ConflictError: If deletion fails
         """
-        db_question = await self.repository.get_by_id(question_id, session)
-        if not db_question:
-            raise NotFoundError(f"Question with id {question_id} not found")
-        await self.repository.delete(db_question, session)
\ No newline at end of file
+        await self.repository.delete(question_id, session)
+        await self.invalidate(question_tag(question_id), QUESTIONS_LIST_TAG)
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        Drop cached responses registered in the given tags.
+
+        Args:
+            tags: Cache tags, see app.cache.keys
+        """
+        if self.cache is not None:
+            await self.cache.invalidate_tags(*tags)
@@ -0,0 +1,59 @@
+import html
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.db import release_connection
+from app.pagination import decode_search_cursor, encode_search_cursor
+from app.repository.search_repository import HIGHLIGHT_START, HIGHLIGHT_STOP, IndexSearchRepository, \
+    SearchRepository
+from app.schemes.search_scheme import SearchHit, SearchResponse
+
+
+def render_snippet(snippet: str) -> str:
+    """Escape the snippet text and turn highlight markers into <mark> tags."""
+    return html.escape(snippet).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+
+class SearchService:
+    """Service for full-text search."""
+
+    def __init__(self, repository: SearchRepository | IndexSearchRepository):
+        self.repository = repository
+
+    async def search(self, session: AsyncSession, query: str, limit: int = 10,
+                     cursor: str | None = None) -> SearchResponse:
+        """
+        Search questions and answers.
+
+        Args:
+            session: Database session
+            query: Search query
+            limit: Pagination limit
+            cursor: Opaque cursor of the previous page
+
+        Returns:
+            Ranked search results
+
+        Raises:
+            ValidationError: If cursor is malformed
+        """
+        after = decode_search_cursor(cursor) if cursor else None
+        rows = await self.repository.search(session, query, limit=limit, after=after)
+        await release_connection(session)
+
+        hits = [
+            SearchHit(
+                type=row.type,
+                id=row.id,
+                question_id=row.question_id,
+                rank=row.rank,
+                snippet=render_snippet(row.snippet),
+                created_at=row.created_at,
+            )
+            for row in rows
+        ]
+        next_cursor = None
+        if len(hits) == limit:
+            next_cursor = encode_search_cursor(hits[-1].rank, hits[-1].type, hits[-1].id)
+
+        return SearchResponse(items=hits, limit=limit, next_cursor=next_cursor)
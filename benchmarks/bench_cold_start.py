@@ -0,0 +1,67 @@
+# Время холодного старта python -m app.server до первого обслуженного запроса к БД
+# Запуск: python -m benchmarks.bench_cold_start --workers 4 --runs 5
+
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from app.database.db import DSN, create_engine
+from app.database.models import Base
+from app.database.schema_check import check_schema_revision
+from benchmarks.bench_workers import wait_ready
+from benchmarks.common import print_summary, timed
+
+
+async def startup_step(schema_check: str) -> float:
+    """Только шаг проверки схемы в lifespan, на новом движке — как в свежем воркере"""
+    engine = create_engine(DSN)
+    samples: list[float] = []
+    try:
+        async with timed(samples):
+            if schema_check == "create_all":
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+            else:
+                await check_schema_revision(engine)
+    finally:
+        await engine.dispose()
+    return samples[0]
+
+
+async def cold_start(port: int, workers: int, schema_check: str, path: str) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        env={**os.environ, "DB_SCHEMA_CHECK": schema_check},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        await wait_ready(f"http://127.0.0.1:{port}", path, interval=0.01)
+        return time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Cold start to first served request: create_all vs Alembic head check")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--path", default="/api/v1/questions?limit=1")
+    args = parser.parse_args()
+
+    for schema_check in ("create_all", "alembic"):
+        samples = [await startup_step(schema_check) for _ in range(args.runs)]
+        print_summary(f"lifespan step: {schema_check}", samples)
+        samples = [await cold_start(args.port, args.workers, schema_check, args.path) for _ in range(args.runs)]
+        print_summary(f"first request: {schema_check}", samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
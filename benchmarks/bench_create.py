@@ -0,0 +1,116 @@
+# Бенчмарк пропускной способности POST /questions и POST /questions/{id}/answers
+# Запуск: python -m benchmarks.bench_create --requests 2000 --concurrency 20
+
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete, select, update
+
+from app.database.db import async_session_factory, close_db
+from app.database.models import Counter, Question
+from app.dependencies import get_answer_service, get_question_service
+from app.main import app
+from app.repository.answer_repository import AnswerRepository
+from app.repository.question_repository import QUESTIONS_COUNTER, QuestionRepository
+from app.services.answer_service import AnswerService
+from app.services.question_service import QuestionService
+from benchmarks.common import print_summary, timed
+
+
+class RefreshQuestionRepository(QuestionRepository):
+    """Прежнее поведение: SELECT после commit, чтобы прочитать id и created_at"""
+
+    async def create(self, question_data, session):
+        question = await super().create(question_data, session)
+        await session.refresh(question)
+        return question
+
+
+class RefreshAnswerRepository(AnswerRepository):
+    async def create(self, question_id, answer_data, session):
+        answer = await super().create(question_id, answer_data, session)
+        await session.refresh(answer)
+        return answer
+
+
+def use_refresh_repositories() -> None:
+    def answer_service() -> AnswerService:
+        return AnswerService(repository=RefreshAnswerRepository())
+
+    def question_service() -> QuestionService:
+        return QuestionService(repository=RefreshQuestionRepository(), answer_service=answer_service())
+
+    app.dependency_overrides[get_answer_service] = answer_service
+    app.dependency_overrides[get_question_service] = question_service
+
+
+async def run(client: httpx.AsyncClient, requests: int, concurrency: int, make_request) -> tuple[list[float], float]:
+    samples: list[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def worker():
+        while not queue.empty():
+            i = queue.get_nowait()
+            async with timed(samples):
+                response = await make_request(client, i)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="POST question/answer throughput: refresh SELECT vs RETURNING")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    async with async_session_factory() as session:
+        # Новые вопросы удаляются по id после прогона
+        max_id_before = await session.scalar(select(Question.id).order_by(Question.id.desc()).limit(1)) or 0
+
+    transport = httpx.ASGITransport(app=app)
+    user_id = str(uuid.uuid4())
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            question = (await client.post("/api/v1/questions", json={"text": "Benchmark question"})).json()
+
+            def post_question(client, i):
+                return client.post("/api/v1/questions", json={"text": f"Benchmark question {i}"})
+
+            def post_answer(client, i):
+                return client.post(f"/api/v1/questions/{question['id']}/answers",
+                                   json={"user_id": user_id, "text": f"Benchmark answer {i}"})
+
+            for mode in ("refresh", "returning"):
+                app.dependency_overrides.clear()
+                if mode == "refresh":
+                    use_refresh_repositories()
+                for name, make_request in (("POST /questions", post_question), ("POST /answers", post_answer)):
+                    # Прогрев пула соединений
+                    await run(client, args.concurrency, args.concurrency, make_request)
+                    samples, elapsed = await run(client, args.requests, args.concurrency, make_request)
+                    print_summary(f"{mode}: {name}", samples)
+                    print(f"{'':<32} {args.requests / elapsed:.0f} req/s")
+    finally:
+        app.dependency_overrides.clear()
+        async with async_session_factory() as session:
+            deleted = await session.scalars(delete(Question).where(Question.id > max_id_before).returning(Question.id))
+            await session.execute(
+                update(Counter)
+                .where(Counter.name == QUESTIONS_COUNTER)
+                .values(value=Counter.value - len(deleted.all()))
+            )
+            await session.commit()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
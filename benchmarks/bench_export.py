@@ -0,0 +1,125 @@
+# Бенчмарк выгрузки всех вопросов с ответами: обход API (список + GET на каждый вопрос)
+# против потоковой GET /api/v1/export
+# Память и время до первого байта меряются на генераторе сервиса: ASGITransport httpx
+# собирает тело ответа целиком. Запуск: python -m benchmarks.bench_export --questions 2000 --answers 20
+
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import httpx
+
+from app.config import settings
+from app.database.db import async_session_factory, close_db
+from app.repository.export_repository import ExportRepository
+from app.services.export_service import ExportService
+from benchmarks.load import API, Dataset, cleanup, make_client, seed_question
+
+
+async def crawl(client: httpx.AsyncClient) -> tuple[int, int]:
+    """Обход, которым пользовалась аналитика; возвращает (запросов, ответов)"""
+    requests = answers = 0
+    cursor = None
+    while True:
+        params = {"limit": 100, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get(f"{API}/questions", params=params)).json()
+        requests += 1
+        for question in page["items"]:
+            answers_cursor = None
+            while True:
+                params = {"limit": 100, "include_total": "false"}
+                if answers_cursor:
+                    params["cursor"] = answers_cursor
+                detail = (await client.get(f"{API}/questions/{question['id']}", params=params)).json()
+                requests += 1
+                answers += len(detail["answers"]["items"])
+                answers_cursor = detail["answers"]["next_cursor"]
+                if not answers_cursor:
+                    break
+        cursor = page["next_cursor"]
+        if not cursor:
+            return requests, answers
+
+
+async def export_http(client: httpx.AsyncClient, export_format: str) -> int:
+    size = 0
+    async with client.stream("GET", f"{API}/export", params={"format": export_format}) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+    return size
+
+
+async def export_direct(export_format: str, batch_size: int) -> tuple[float, float]:
+    """Генератор сервиса без HTTP: (до первого чанка, всего), секунды"""
+    service = ExportService(ExportRepository(), batch_size=batch_size)
+    first = None
+    started = time.perf_counter()
+    async for _ in service.export(async_session_factory, export_format):
+        if first is None:
+            first = time.perf_counter() - started
+    total = time.perf_counter() - started
+    return first or total, total
+
+
+async def export_peak_memory(export_format: str, batch_size: int) -> int:
+    # tracemalloc замедляет код в разы, поэтому память меряется отдельным проходом
+    service = ExportService(ExportRepository(), batch_size=batch_size)
+    tracemalloc.start()
+    try:
+        async for _ in service.export(async_session_factory, export_format):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="API crawl vs streaming export")
+    parser.add_argument("--url", help="base URL of a running server; in-process app if omitted")
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--answers", type=int, default=20, help="answers per seeded question")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent seeding requests")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, settings.export_batch_size, 10_000],
+                        help="EXPORT_BATCH_SIZE values for the memory measurement")
+    args = parser.parse_args()
+
+    dataset = Dataset()
+    async with make_client(args.url, args.concurrency) as client:
+        try:
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def one() -> int:
+                async with semaphore:
+                    return await seed_question(client, args.answers, 500)
+
+            dataset.created_ids = list(await asyncio.gather(*(one() for _ in range(args.questions))))
+            print(f"Seeded {args.questions} questions x {args.answers} answers\n")
+
+            started = time.perf_counter()
+            requests, answers = await crawl(client)
+            print(f"{'API crawl':<24} {time.perf_counter() - started:8.2f}s  {requests} requests, {answers} answers")
+            for export_format in ("ndjson", "csv"):
+                started = time.perf_counter()
+                size = await export_http(client, export_format)
+                print(f"{'export ' + export_format:<24} {time.perf_counter() - started:8.2f}s  "
+                      f"1 request, {size / 2 ** 20:.1f} MiB")
+
+            print()
+            for batch_size in args.batch_sizes:
+                for export_format in ("ndjson", "csv"):
+                    first, total = await export_direct(export_format, batch_size)
+                    peak = await export_peak_memory(export_format, batch_size)
+                    print(f"{export_format + ', batch ' + str(batch_size):<24} first chunk {first * 1000:7.1f}ms  "
+                          f"total {total:6.2f}s  peak memory {peak / 2 ** 20:6.2f} MiB")
+        finally:
+            await cleanup(client, dataset, args.concurrency)
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
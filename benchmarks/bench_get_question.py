@@ -0,0 +1,88 @@
+# Бенчмарк чтения вопроса с ответами: три запроса против одного
+# Запуск: python -m benchmarks.bench_get_question --answers 1000 --iterations 500
+
+
+import argparse
+import asyncio
+import uuid
+
+from sqlalchemy import delete, func, insert, select
+
+from app.database.db import async_session_factory, close_db
+from app.database.models import Answer, Question
+from app.repository.question_repository import QuestionRepository
+from benchmarks.common import print_summary, timed
+
+
+async def seed_question(answers: int) -> int:
+    """Создает вопрос с заданным числом ответов"""
+    async with async_session_factory() as session:
+        question = Question(text="Benchmark question")
+        session.add(question)
+        await session.flush()
+        if answers:
+            await session.execute(
+                insert(Answer),
+                [
+                    {"question_id": question.id, "user_id": str(uuid.uuid4()), "text": f"Answer {i}"}
+                    for i in range(answers)
+                ],
+            )
+        await session.commit()
+        return question.id
+
+
+async def drop_question(question_id: int) -> None:
+    async with async_session_factory() as session:
+        await session.execute(delete(Question).where(Question.id == question_id))
+        await session.commit()
+
+
+async def old_path(question_id: int, limit: int, offset: int) -> None:
+    """Вопрос по id + страница ответов + COUNT: три обращения к БД"""
+    async with async_session_factory() as session:
+        await session.get(Question, question_id)
+        await session.execute(
+            select(Answer)
+            .where(Answer.question_id == question_id)
+            .order_by(Answer.created_at, Answer.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        await session.scalar(select(func.count(Answer.id)).where(Answer.question_id == question_id))
+
+
+async def new_path(question_id: int, limit: int, offset: int) -> None:
+    """Вопрос, страница и total одним запросом"""
+    async with async_session_factory() as session:
+        await QuestionRepository().get_with_answers(session, question_id, limit=limit, offset=offset)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="GET question with answers: 3 round trips vs 1")
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--offset", type=int, default=0)
+    args = parser.parse_args()
+
+    question_id = await seed_question(args.answers)
+    try:
+        paths = {"old: 3 round trips": old_path, "new: single statement": new_path}
+        for name, path in paths.items():
+            # Прогрев пула соединений и кэша планов
+            for _ in range(10):
+                await path(question_id, args.limit, args.offset)
+
+            samples: list[float] = []
+            for _ in range(args.iterations):
+                async with timed(samples):
+                    await path(question_id, args.limit, args.offset)
+            print_summary(name, samples)
+    finally:
+        await drop_question(question_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+# Бенчмарк загрузки: вопросы и ответы по одному через репозитории против импорта NDJSON через COPY
+# Запуск: python -m benchmarks.bench_import --questions 20000 --answers 20 --row-sample 2000
+
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from sqlalchemy import delete, text
+
+from app.database.db import async_session_factory, close_db
+from app.database.models import ImportCheckpoint
+from app.repository.answer_repository import AnswerRepository
+from app.repository.import_repository import ImportRepository
+from app.repository.question_repository import QuestionRepository
+from app.schemes.answer_scheme import AnswerCreate
+from app.schemes.question_scheme import QuestionCreate
+from app.services.import_service import ImportService
+
+MARKER = "import bench"
+JOB = "bench-import"
+
+
+def make_lines(questions: int, answers: int) -> list[bytes]:
+    user_id = str(uuid.uuid4())
+    return [
+        json.dumps({
+            "text": f"{MARKER} question {i}",
+            "answers": [{"user_id": user_id, "text": f"{MARKER} answer {i}.{j}"} for j in range(answers)],
+        }).encode()
+        for i in range(questions)
+    ]
+
+
+async def row_by_row(lines: list[bytes]) -> int:
+    """Прежний путь: валидация схем и create на каждую строку"""
+    questions, answers = QuestionRepository(), AnswerRepository()
+    rows = 0
+    async with async_session_factory() as session:
+        for line in lines:
+            record = json.loads(line)
+            question = await questions.create(QuestionCreate(text=record["text"]), session)
+            rows += 1
+            for answer in record["answers"]:
+                await answers.create(question.id, AnswerCreate.model_validate(answer), session)
+                rows += 1
+    return rows
+
+
+async def copy_import(lines: list[bytes], batch_size: int) -> int:
+    async def stream():
+        for line in lines:
+            yield line
+
+    service = ImportService(ImportRepository(), batch_size=batch_size)
+    async with async_session_factory() as session:
+        result = await service.import_lines(session, JOB, stream())
+    return result.questions + result.answers
+
+
+async def cleanup() -> None:
+    async with async_session_factory() as session:
+        deleted = await session.execute(text(f"DELETE FROM questions WHERE text LIKE '{MARKER} %'"))
+        await session.execute(text("UPDATE counters SET value = value - :n WHERE name = 'questions'"),
+                              {"n": deleted.rowcount})
+        await session.execute(delete(ImportCheckpoint).where(ImportCheckpoint.job == JOB))
+        await session.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Row-by-row inserts vs COPY import")
+    parser.add_argument("--questions", type=int, default=20_000)
+    parser.add_argument("--answers", type=int, default=20, help="answers per question")
+    parser.add_argument("--row-sample", type=int, default=2000,
+                        help="questions loaded row by row; the slow path is measured on a sample")
+    parser.add_argument("--batch-size", type=int, default=1000, help="IMPORT_BATCH_SIZE")
+    args = parser.parse_args()
+
+    lines = make_lines(args.questions, args.answers)
+    try:
+        await cleanup()
+        started = time.perf_counter()
+        rows = await row_by_row(lines[:args.row_sample])
+        elapsed = time.perf_counter() - started
+        print(f"{'row by row':<12} {rows:>9} rows in {elapsed:7.2f}s  {rows / elapsed:>9.0f} rows/s")
+        await cleanup()
+
+        started = time.perf_counter()
+        rows = await copy_import(lines, args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"{'COPY import':<12} {rows:>9} rows in {elapsed:7.2f}s  {rows / elapsed:>9.0f} rows/s")
+    finally:
+        await cleanup()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+# Бенчмарк поиска SEARCH_BACKEND=memory: индекс в памяти процесса без БД
+# Документы собираются из того же словаря, что и в bench_search, поэтому числа сравнимы.
+# Меряются построение индекса, запросы, запись снимка и старт из снимка против построения заново.
+# Запуск: python -m benchmarks.bench_index_search --answers 1000000 --iterations 50
+
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.search.inverted_index import InvertedIndex
+from benchmarks.bench_search import ANSWERS_PER_QUESTION, VOCABULARY, WORDS_PER_ANSWER, word
+from benchmarks.common import print_summary
+
+
+QUERIES = {
+    "rare word": word(20_000),
+    "medium word": word(300),
+    "two medium words": f"{word(150)} {word(250)}",
+    "frequent word": word(5),
+    "prefix": f"{word(12)}*",
+    "frequent -word": f"{word(5)} -{word(6)}",
+}
+
+
+def random_text(rng: random.Random) -> str:
+    # Ранг слова floor(N ^ random()), как в bench_search
+    return " ".join(word(int(VOCABULARY ** rng.random())) for _ in range(WORDS_PER_ANSWER))
+
+
+def build(answers: int) -> InvertedIndex:
+    rng = random.Random(42)
+    index = InvertedIndex()
+    now = datetime.now(timezone.utc)
+    answer_id = 0
+    for question_id in range(1, answers // ANSWERS_PER_QUESTION + 1):
+        index.add_question(question_id, random_text(rng), now)
+        for _ in range(ANSWERS_PER_QUESTION):
+            answer_id += 1
+            index.add_answer(answer_id, question_id, random_text(rng), now)
+    return index
+
+
+def measure(index: InvertedIndex, query: str, max_candidates: int, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        index.search(query, limit=10, max_candidates=max_candidates)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process inverted index search")
+    parser.add_argument("--answers", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--max-candidates", type=int, nargs="+", default=[0, settings.search_max_candidates],
+                        help="SEARCH_MAX_CANDIDATES values to compare, 0 ranks every match")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = build(args.answers)
+    build_time = time.perf_counter() - started
+    print(f"Built index of {len(index)} documents in {build_time:.1f}s, "
+          f"max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB\n")
+
+    for name, query in QUERIES.items():
+        for max_candidates in args.max_candidates:
+            measure(index, query, max_candidates, 3)
+            print_summary(f"{name}, cap {max_candidates}", measure(index, query, max_candidates, args.iterations))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "search_index.bin")
+        started = time.perf_counter()
+        index.save(path)
+        print(f"\nSnapshot saved in {time.perf_counter() - started:.2f}s, {os.path.getsize(path) / 2 ** 20:.0f} MiB")
+
+        started = time.perf_counter()
+        restored = InvertedIndex()
+        restored.load(path)
+        print(f"Snapshot loaded in {time.perf_counter() - started:.2f}s vs rebuild in {build_time:.1f}s")
+        for name, query in QUERIES.items():
+            # Первый запрос после загрузки читает страницы снимка с диска
+            print_summary(f"{name}, after load", measure(restored, query, settings.search_max_candidates, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Бенчмарк задержек event loop при логировании: синхронные обработчики против очереди
+# Запуск: python -m benchmarks.bench_logging --records 50000 --burst 20 --pause 0.002
+
+
+import argparse
+import asyncio
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+
+from app.logging_config import BoundedQueueHandler
+from benchmarks.common import print_summary
+
+
+def file_handlers(directory: str, max_bytes: int) -> list[logging.Handler]:
+    """Те же обработчики, что в приложении: консоль (здесь /dev/null) и файл с ротацией"""
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    stream_handler = logging.StreamHandler(open(os.devnull, "w"))
+    file_handler = RotatingFileHandler(os.path.join(directory, "bench.log"), maxBytes=max_bytes, backupCount=5)
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+    return [stream_handler, file_handler]
+
+
+async def measure_stalls(stop: asyncio.Event, interval: float = 0.001) -> list[float]:
+    """Насколько позже запланированного просыпается задача — это и есть простой event loop"""
+    stalls: list[float] = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(max(0.0, time.perf_counter() - started - interval))
+    return stalls
+
+
+async def write_logs(logger: logging.Logger, records: int, burst: int, pause: float) -> None:
+    # Как запросы на создание: несколько записей подряд, затем ожидание БД
+    for i in range(0, records, burst):
+        for j in range(burst):
+            logger.info("Answer %s created successfully for question %s", i + j, i)
+        await asyncio.sleep(pause)
+
+
+async def run(logger: logging.Logger, records: int, burst: int, pause: float) -> tuple[list[float], float]:
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(measure_stalls(stop))
+    started = time.perf_counter()
+    await write_logs(logger, records, burst, pause)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return await monitor, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event loop stalls caused by logging: sync handlers vs queue")
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--burst", type=int, default=20)
+    parser.add_argument("--pause", type=float, default=0.002, help="seconds between bursts, 0 for a flood")
+    parser.add_argument("--max-bytes", type=int, default=1_000_000, help="rotate log file after this size")
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("sync handlers", "queue + writer thread"):
+            logger = logging.getLogger(f"bench.logging.{mode}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            handlers = file_handlers(directory, args.max_bytes)
+            listener = None
+            queue_handler = None
+            if mode == "sync handlers":
+                for handler in handlers:
+                    logger.addHandler(handler)
+            else:
+                queue_handler = BoundedQueueHandler(queue.Queue(maxsize=args.queue_size), "drop")
+                listener = QueueListener(queue_handler.queue, *handlers)
+                listener.start()
+                logger.addHandler(queue_handler)
+
+            stalls, elapsed = await run(logger, args.records, args.burst, args.pause)
+            if listener is not None:
+                listener.stop()
+            for handler in handlers:
+                handler.close()
+
+            print_summary(f"{mode}: loop stall", stalls)
+            dropped = queue_handler.dropped if queue_handler is not None else 0
+            print(f"{'':<32} {args.records / elapsed:.0f} records/s on loop, dropped={dropped}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
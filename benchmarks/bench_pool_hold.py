@@ -0,0 +1,74 @@
+# Бенчмарк времени удержания соединения пула на запрос чтения
+# Запуск: python -m benchmarks.bench_pool_hold --requests 2000 --concurrency 50
+
+
+import argparse
+import asyncio
+from contextlib import contextmanager, nullcontext
+
+import httpx
+
+from app.database.db import engine, close_db
+from app.database.pool import PoolUsageStats
+from app.main import app
+from app.services import answer_service, question_service
+from benchmarks.bench_get_question import drop_question, seed_question
+from benchmarks.common import print_summary, timed
+
+
+@contextmanager
+def hold_until_request_end():
+    """Прежнее поведение: соединение возвращается в пул только при закрытии сессии"""
+    async def keep_connection(session):
+        pass
+
+    originals = question_service.release_connection, answer_service.release_connection
+    question_service.release_connection = answer_service.release_connection = keep_connection
+    try:
+        yield
+    finally:
+        question_service.release_connection, answer_service.release_connection = originals
+
+
+async def run(client: httpx.AsyncClient, url: str, requests: int, concurrency: int) -> list[float]:
+    samples: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore, timed(samples):
+            response = await client.get(url)
+        response.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return samples
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Pool hold time per GET request: session end vs early release")
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    question_id = await seed_question(args.answers)
+    url = f"/api/v1/questions/{question_id}?limit={args.limit}"
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for mode in ("hold until request end", "release after read"):
+                with hold_until_request_end() if mode.startswith("hold") else nullcontext():
+                    await run(client, url, args.concurrency, args.concurrency)
+                    engine.pool.usage = PoolUsageStats()
+                    samples = await run(client, url, args.requests, args.concurrency)
+                usage = engine.pool.usage
+                print_summary(mode, samples)
+                print(f"{'':<32} pool hold avg={usage.hold_total / max(usage.checkins, 1) * 1000:.2f}ms "
+                      f"max={usage.hold_max * 1000:.2f}ms, wait avg={usage.wait_total / max(usage.checkouts, 1) * 1000:.2f}ms "
+                      f"checkouts={usage.checkouts}")
+    finally:
+        await drop_question(question_id)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+# Бенчмарк списков при limit=100: ORM-объекты против выборки только колонок ответа.
+# Ответы читаются запросом GET /questions/{id}: вопрос, страница ответов и версия одним запросом
+# Запуск: python -m benchmarks.bench_projection --limit 100 --iterations 500
+
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import delete, insert, select, true
+from sqlalchemy.orm import aliased
+
+from app.database.db import async_session_factory, close_db
+from app.database.models import Answer, Question
+from app.repository.question_repository import QuestionRepository
+from app.schemes.answer_scheme import AnswerResponse
+from app.schemes.question_scheme import QuestionResponse
+from app.services.question_service import embedded_answer
+from benchmarks.bench_get_question import drop_question, seed_question
+from benchmarks.common import print_summary
+
+
+async def seed_questions(count: int) -> list[int]:
+    async with async_session_factory() as session:
+        ids = await session.scalars(
+            insert(Question).returning(Question.id),
+            [{"text": f"Projection question {i}"} for i in range(count)],
+        )
+        ids = list(ids)
+        await session.commit()
+        return ids
+
+
+async def drop_questions(ids: list[int]) -> None:
+    async with async_session_factory() as session:
+        await session.execute(delete(Question).where(Question.id.in_(ids)))
+        await session.commit()
+
+
+async def orm_questions(question_id: int, limit: int) -> list[QuestionResponse]:
+    """Прежний путь: select(Question), объекты в identity map, model_validate(from_attributes)"""
+    async with async_session_factory() as session:
+        stmt = select(Question).order_by(Question.created_at, Question.id).limit(limit)
+        questions = (await session.execute(stmt)).scalars().all()
+        return [QuestionResponse.model_validate(question) for question in questions]
+
+
+async def column_questions(question_id: int, limit: int) -> list[QuestionResponse]:
+    async with async_session_factory() as session:
+        rows, _ = await QuestionRepository().get_all(session, limit=limit, include_total=False)
+        return [QuestionResponse(**row._mapping) for row in rows]
+
+
+async def orm_answers(question_id: int, limit: int) -> list[AnswerResponse]:
+    """Прежний путь: вопрос и страница ответов как ORM-объекты из одного запроса"""
+    async with async_session_factory() as session:
+        page = (
+            select(Answer)
+            .where(Answer.question_id == Question.id)
+            .order_by(Answer.created_at, Answer.id)
+            .limit(limit)
+            .lateral("answers_page")
+        )
+        stmt = (
+            select(Question, aliased(Answer, page))
+            .select_from(Question)
+            .outerjoin(page, true())
+            .where(Question.id == question_id)
+            .order_by(page.c.created_at, page.c.id)
+        )
+        rows = (await session.execute(stmt)).all()
+        return [AnswerResponse.model_validate(row[1]) for row in rows if row[1] is not None]
+
+
+async def column_answers(question_id: int, limit: int) -> list[AnswerResponse]:
+    async with async_session_factory() as session:
+        _, rows, _, _ = await QuestionRepository().get_with_answers(
+            session, question_id, limit=limit, include_total=False
+        )
+        return [embedded_answer(question_id, row) for row in rows]
+
+
+async def measure(name: str, path, question_id: int, limit: int, iterations: int) -> None:
+    # Прогрев пула соединений и кэша скомпилированных запросов
+    for _ in range(20):
+        await path(question_id, limit)
+
+    wall, cpu = [], []
+    for _ in range(iterations):
+        started, started_cpu = time.perf_counter(), time.process_time()
+        await path(question_id, limit)
+        wall.append(time.perf_counter() - started)
+        cpu.append(time.process_time() - started_cpu)
+
+    # Пик выделенной памяти за один вызов; tracemalloc замедляет код, поэтому отдельным проходом
+    peaks = []
+    tracemalloc.start()
+    for _ in range(20):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await path(question_id, limit)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    print_summary(f"{name}: wall", wall)
+    print(f"{name + ': cpu':<32} mean={sum(cpu) / len(cpu) * 1000:8.3f}ms  "
+          f"peak memory={sorted(peaks)[len(peaks) // 2] / 1024:8.1f} KiB")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="List reads: ORM entities vs column projection")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    question_ids = await seed_questions(args.limit)
+    answered_id = await seed_question(args.limit)
+    try:
+        paths = {
+            "questions ORM": orm_questions,
+            "questions columns": column_questions,
+            "answers ORM": orm_answers,
+            "answers columns": column_answers,
+        }
+        for name, path in paths.items():
+            await measure(name, path, answered_id, args.limit, args.iterations)
+    finally:
+        await drop_question(answered_id)
+        await drop_questions(question_ids)
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
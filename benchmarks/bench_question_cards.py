@@ -0,0 +1,89 @@
+# Бенчмарк страницы карточек вопросов (вопрос, число ответов, последние ответы):
+# список + GET /questions/{id} на каждую карточку против GET /questions?include_answers=N
+# Запуск: python -m benchmarks.bench_question_cards --answers 200 --include-answers 3 --iterations 50
+
+
+import argparse
+import asyncio
+
+import httpx
+from sqlalchemy import text
+
+from app.database.db import async_session_factory, close_db
+from benchmarks.common import print_summary, timed
+from benchmarks.load import API, make_client
+
+MARKER = "cards bench"
+
+
+async def seed(questions: int, answers: int) -> None:
+    # Даты в прошлом: засеянные вопросы составляют первую страницу списка
+    async with async_session_factory() as session:
+        await session.execute(
+            text("INSERT INTO questions (text, created_at, answer_count) "
+                 "SELECT :marker || ' ' || g, timestamptz '2000-01-01' + make_interval(secs => g), :m "
+                 "FROM generate_series(1, :n) AS g"),
+            {"marker": MARKER, "n": questions, "m": answers},
+        )
+        await session.execute(
+            text("INSERT INTO answers (question_id, user_id, text, created_at) "
+                 "SELECT q.id, gen_random_uuid()::text, 'answer ' || g, q.created_at + make_interval(secs => g) "
+                 "FROM questions q CROSS JOIN generate_series(1, :m) AS g "
+                 "WHERE q.text LIKE :marker || ' %'"),
+            {"marker": MARKER, "m": answers},
+        )
+        await session.execute(text("ANALYZE answers"))
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with async_session_factory() as session:
+        await session.execute(text("DELETE FROM questions WHERE text LIKE :marker || ' %'"), {"marker": MARKER})
+        await session.commit()
+
+
+async def per_card(client: httpx.AsyncClient, limit: int, answers: int) -> int:
+    """Список и GET вопроса на каждую карточку; возвращает число запросов"""
+    page = (await client.get(f"{API}/questions", params={"limit": limit, "include_total": "false"})).json()
+    for question in page["items"]:
+        response = await client.get(f"{API}/questions/{question['id']}", params={"limit": answers})
+        response.raise_for_status()
+    return 1 + len(page["items"])
+
+
+async def embedded(client: httpx.AsyncClient, limit: int, answers: int) -> int:
+    response = await client.get(f"{API}/questions", params={
+        "limit": limit, "include_total": "false", "include_answers": answers,
+    })
+    response.raise_for_status()
+    return 1
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Question cards page: N+1 requests vs include_answers")
+    parser.add_argument("--url", help="base URL of a running server; in-process app if omitted")
+    parser.add_argument("--limit", type=int, default=100, help="questions per page")
+    parser.add_argument("--answers", type=int, default=200, help="answers per seeded question")
+    parser.add_argument("--include-answers", type=int, default=3)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    await cleanup()
+    await seed(args.limit, args.answers)
+    try:
+        async with make_client(args.url, 1) as client:
+            paths = {"per card: list + GET each": per_card, f"include_answers={args.include_answers}": embedded}
+            for name, path in paths.items():
+                requests = await path(client, args.limit, args.include_answers)
+                samples: list[float] = []
+                for _ in range(args.iterations):
+                    async with timed(samples):
+                        await path(client, args.limit, args.include_answers)
+                print_summary(f"{name} ({requests} req)", samples)
+    finally:
+        await cleanup()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+# Бенчмарк полнотекстового поиска на засеянном миллионе ответов
+# Текст собирается из синтетического словаря с распределением частот, близким к закону Ципфа,
+# поэтому запросы разной избирательности находят от десятков до сотен тысяч строк.
+# Запуск: python -m benchmarks.bench_search --answers 1000000 --iterations 200
+# С --keep данные остаются в базе и следующий запуск с --reuse не засевает их заново.
+
+
+import argparse
+import asyncio
+import math
+import time
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database.db import async_session_factory, close_db, engine
+from app.repository.search_repository import SearchRepository
+from benchmarks.common import print_summary, timed
+
+SEED_MARKER = "search bench"
+VOCABULARY = 50_000
+WORDS_PER_ANSWER = 12
+ANSWERS_PER_QUESTION = 100
+
+
+def word(rank: int) -> str:
+    return f"w{rank}"
+
+
+# Запросы от редкого слова до частого; имя -> текст запроса
+QUERIES = {
+    "rare word": word(20_000),
+    "medium word": word(300),
+    "two medium words": f"{word(150)} {word(250)}",
+    "phrase": f'"{word(40)} {word(60)}"',
+    "word or word": f"{word(5_000)} or {word(7_000)}",
+    "frequent word": word(5),
+}
+
+
+async def seed(answers: int, batch_questions: int = 1000) -> None:
+    questions = math.ceil(answers / ANSWERS_PER_QUESTION)
+    # Ранг слова floor(N ^ random()) распределен log-uniform: частота слова ~ 1 / ранг.
+    # Ссылка на g делает подзапрос коррелированным, иначе он выполнился бы один раз на весь INSERT
+    random_text = (
+        "(SELECT string_agg('w' || floor(power(:vocabulary, random()))::int, ' ') "
+        "FROM generate_series(1, :words + g * 0))"
+    )
+    params = {"m": ANSWERS_PER_QUESTION, "vocabulary": VOCABULARY, "words": WORDS_PER_ANSWER}
+    for start in range(0, questions, batch_questions):
+        count = min(batch_questions, questions - start)
+        async with async_session_factory() as session:
+            await session.execute(
+                text(f"WITH q AS ("
+                     f"  INSERT INTO questions (text, answer_count) "
+                     f"  SELECT '{SEED_MARKER} ' || {random_text}, :m FROM generate_series(1, :n) AS g "
+                     f"  RETURNING id) "
+                     f"INSERT INTO answers (question_id, user_id, text) "
+                     f"SELECT q.id, gen_random_uuid()::text, {random_text} "
+                     f"FROM q CROSS JOIN generate_series(1, :m) AS g"),
+                {"n": count, **params},
+            )
+            await session.commit()
+        print(f"  seeded {(start + count) * ANSWERS_PER_QUESTION} answers", flush=True)
+    await vacuum()
+
+
+async def vacuum() -> None:
+    # VACUUM переносит pending list GIN-индексов в индекс и обновляет статистику
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE questions"))
+        await conn.execute(text("VACUUM ANALYZE answers"))
+
+
+async def seeded_answers() -> int:
+    async with async_session_factory() as session:
+        return int(await session.scalar(
+            text(f"SELECT coalesce(sum(answer_count), 0) FROM questions WHERE text LIKE '{SEED_MARKER} %'")
+        ))
+
+
+async def drop_seed() -> None:
+    async with async_session_factory() as session:
+        await session.execute(text(f"DELETE FROM questions WHERE text LIKE '{SEED_MARKER} %'"))
+        await session.commit()
+
+
+async def count_matches(query: str) -> int:
+    async with async_session_factory() as session:
+        return int(await session.scalar(
+            text("SELECT count(*) FROM answers WHERE search_vector @@ websearch_to_tsquery('russian', :q)"),
+            {"q": query},
+        ))
+
+
+async def measure(repository: SearchRepository, query: str, limit: int, iterations: int,
+                  pages: int) -> tuple[list[float], list[float]]:
+    first, deep = [], []
+    for _ in range(iterations):
+        async with async_session_factory() as session:
+            async with timed(first):
+                rows = await repository.search(session, query, limit=limit)
+            # Следующие страницы по курсору из последней строки
+            after = None
+            for _ in range(pages - 1):
+                if len(rows) < limit:
+                    break
+                after = (rows[-1].rank, rows[-1].type, rows[-1].id)
+                async with timed(deep):
+                    rows = await repository.search(session, query, limit=limit, after=after)
+    return first, deep
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Full-text search latency on seeded answers")
+    parser.add_argument("--answers", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=3, help="pages fetched per iteration via cursor")
+    parser.add_argument("--max-candidates", type=int, nargs="+", default=[0, settings.search_max_candidates],
+                        help="SEARCH_MAX_CANDIDATES values to compare, 0 ranks every match")
+    parser.add_argument("--reuse", action="store_true", help="use answers seeded by a previous --keep run")
+    parser.add_argument("--keep", action="store_true", help="leave seeded data in the database")
+    args = parser.parse_args()
+
+    try:
+        existing = await seeded_answers()
+        if not (args.reuse and existing):
+            if existing:
+                await drop_seed()
+            started = time.perf_counter()
+            print(f"Seeding {args.answers} answers...")
+            await seed(args.answers)
+            print(f"Seeded in {time.perf_counter() - started:.0f}s")
+        total = await seeded_answers()
+        print(f"\n{total} seeded answers, limit={args.limit}\n")
+
+        for name, query in QUERIES.items():
+            matches = await count_matches(query)
+            print(f"{name} ({query!r}): {matches} matching answers")
+            for max_candidates in args.max_candidates:
+                repository = SearchRepository(max_candidates=max_candidates)
+                # Прогрев кэша страниц и подготовленных запросов
+                await measure(repository, query, args.limit, 5, args.pages)
+                first, deep = await measure(repository, query, args.limit, args.iterations, args.pages)
+                print_summary(f"  first page, cap {max_candidates}", first)
+                if deep:
+                    print_summary(f"  next pages, cap {max_candidates}", deep)
+    finally:
+        if not args.keep:
+            await drop_seed()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
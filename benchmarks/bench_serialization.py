@@ -0,0 +1,96 @@
+# Микробенчмарк сериализации ответа GET /api/v1/questions при limit=100:
+# путь FastAPI по response_model против FAST_JSON (pydantic-core сразу в байты)
+# Запуск: python -m benchmarks.bench_serialization --limit 100 --iterations 2000
+
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.main import app
+from app.responses import PydanticJSONResponse
+from app.schemes.question_scheme import PaginatedQuestionsResponse, QuestionResponse
+from benchmarks.common import print_summary
+
+
+def make_rows(limit: int) -> list[dict]:
+    """Колонки вопросов, как их возвращает репозиторий; БД не нужна"""
+    now = datetime.now(timezone.utc)
+    return [
+        {"id": i, "text": f"Question number {i} about serialization overhead",
+         "created_at": now - timedelta(seconds=i)}
+        for i in range(limit, 0, -1)
+    ]
+
+
+def build_page(rows: list[dict], limit: int) -> PaginatedQuestionsResponse:
+    # То же, что делает QuestionService.get_all_questions
+    items = [QuestionResponse(**row) for row in rows]
+    return PaginatedQuestionsResponse(total=10_000, items=items, limit=limit, offset=0, next_cursor="cursor")
+
+
+def questions_route() -> APIRoute:
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == "/api/v1/questions" and "GET" in route.methods:
+            return route
+    raise RuntimeError("GET /api/v1/questions route not found")
+
+
+async def fastapi_path(route: APIRoute, page: PaginatedQuestionsResponse) -> bytes:
+    # Повторная валидация по response_model, jsonable_encoder и json.dumps
+    content = await serialize_response(field=route.response_field, response_content=page, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def fast_path(route: APIRoute, page: PaginatedQuestionsResponse) -> bytes:
+    return PydanticJSONResponse(page).body
+
+
+async def measure(encode, route: APIRoute, rows: list[dict], limit: int,
+                  iterations: int) -> dict[str, list[float]]:
+    build_samples, encode_samples, total_samples = [], [], []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        page = build_page(rows, limit)
+        built = time.perf_counter()
+        await encode(route, page)
+        finished = time.perf_counter()
+        build_samples.append(built - started)
+        encode_samples.append(finished - built)
+        total_samples.append(finished - started)
+    return {"build": build_samples, "serialize": encode_samples, "total": total_samples}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    route = questions_route()
+    rows = make_rows(args.limit)
+
+    # Оба пути должны отдавать один и тот же JSON
+    page = build_page(rows, args.limit)
+    body = await fast_path(route, page)
+    assert json.loads(body) == json.loads(await fastapi_path(route, page))
+    print(f"Payload: {len(body)} bytes, {args.limit} items\n")
+
+    paths = (("response_model", fastapi_path), ("FAST_JSON", fast_path))
+    for _, encode in paths:
+        # Прогрев
+        await measure(encode, route, rows, args.limit, 50)
+    for name, encode in paths:
+        samples = await measure(encode, route, rows, args.limit, args.iterations)
+        for stage, stage_samples in samples.items():
+            print_summary(f"{name}: {stage}", stage_samples)
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
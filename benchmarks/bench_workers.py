@@ -0,0 +1,84 @@
+# Нагрузочное сравнение одного воркера и N воркеров python -m app.server
+# Запуск: python -m benchmarks.bench_workers --workers 1 4 --duration 20 --concurrency 64
+
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import print_summary
+
+
+async def wait_ready(base_url: str, path: str = "/", timeout: float = 30.0, interval: float = 0.2) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(path)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(interval)
+    raise RuntimeError(f"Server at {base_url} didn't start in {timeout}s")
+
+
+async def load(base_url: str, path: str, duration: float, concurrency: int) -> tuple[list[float], int]:
+    """Постоянная нагрузка: concurrency клиентов шлют запросы без пауз в течение duration"""
+    samples: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                samples.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Throughput of app.server with different worker counts")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/api/v1/questions?limit=10")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    for workers in args.workers:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--host", "127.0.0.1",
+             "--port", str(args.port), "--workers", str(workers)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            await wait_ready(base_url)
+            # Прогрев пулов соединений во всех воркерах
+            await load(base_url, args.path, 2.0, args.concurrency)
+            samples, errors = await load(base_url, args.path, args.duration, args.concurrency)
+        finally:
+            server.terminate()
+            server.wait()
+        print_summary(f"workers={workers}", samples)
+        print(f"{'':<32} {len(samples) / args.duration:.0f} req/s, errors={errors}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
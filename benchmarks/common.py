@@ -0,0 +1,39 @@
+import math
+import time
+from contextlib import asynccontextmanager
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Percentile by nearest-rank method; samples don't have to be sorted."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Latency summary in milliseconds."""
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples, default=0.0) * 1000,
+    }
+
+
+def print_summary(name: str, samples: list[float]) -> None:
+    stats = summarize(samples)
+    print(f"{name:<32} n={stats['count']:<6} p50={stats['p50_ms']:8.2f}ms "
+          f"p95={stats['p95_ms']:8.2f}ms p99={stats['p99_ms']:8.2f}ms max={stats['max_ms']:8.2f}ms")
+
+
+@asynccontextmanager
+async def timed(samples: list[float]):
+    """Append elapsed wall time of the block to samples."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - started)
@@ -0,0 +1,294 @@
+# Нагрузочный прогон API: засев N вопросов x M ответов и смешанная конкурентная нагрузка
+# Запуск (в процессе, БД из .env):
+#   python -m benchmarks.load --questions 200 --answers 50 --duration 30 --concurrency 32 --save baseline.json
+# Против запущенного сервера и сравнение с сохраненным прогоном:
+#   python -m benchmarks.load --url http://localhost:8000 --compare baseline.json
+
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.common import summarize
+
+API = "/api/v1"
+
+# Доли операций в смешанной нагрузке
+DEFAULT_MIX = {
+    "POST /questions": 10,
+    "POST /questions/{id}/answers": 15,
+    "GET /questions?offset (deep)": 10,
+    "GET /questions?cursor (deep)": 10,
+    "GET /questions/{id}": 50,
+    "DELETE /questions/{id} (cascade)": 5,
+}
+
+
+@dataclass
+class Dataset:
+    """Ids and cursors the workload works with."""
+
+    question_ids: list[int] = field(default_factory=list)
+    # Отдельные вопросы с ответами, которые удаляет DELETE
+    deletable_ids: list[int] = field(default_factory=list)
+    deep_offset: int = 0
+    deep_cursor: str | None = None
+    # Все созданные за прогон вопросы удаляются в конце
+    created_ids: list[int] = field(default_factory=list)
+
+
+async def seed_question(client: httpx.AsyncClient, answers: int, batch_size: int) -> int:
+    response = await client.post(f"{API}/questions", json={"text": f"Load question {uuid.uuid4().hex[:8]}"})
+    response.raise_for_status()
+    question_id = response.json()["id"]
+    for start in range(0, answers, batch_size):
+        items = [{"user_id": str(uuid.uuid4()), "text": f"Load answer {i}"}
+                 for i in range(start, min(start + batch_size, answers))]
+        response = await client.post(f"{API}/questions/{question_id}/answers:batch", json={"items": items})
+        response.raise_for_status()
+    return question_id
+
+
+async def seed(client: httpx.AsyncClient, questions: int, answers: int, deletable: int,
+               concurrency: int, batch_size: int, page_limit: int) -> Dataset:
+    """Засев через batch-эндпоинты, чтобы работал и против удаленного сервера"""
+    dataset = Dataset()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> int:
+        async with semaphore:
+            return await seed_question(client, answers, batch_size)
+
+    dataset.question_ids = list(await asyncio.gather(*(one() for _ in range(questions))))
+    dataset.deletable_ids = list(await asyncio.gather(*(one() for _ in range(deletable))))
+    dataset.created_ids = dataset.question_ids + dataset.deletable_ids
+
+    # Глубокая страница — последние page_limit вопросов; курсор к ней находится проходом по страницам
+    total = (await client.get(f"{API}/questions", params={"limit": 1})).json()["total"] or questions
+    dataset.deep_offset = max(0, total - page_limit)
+    cursor = None
+    walked = 0
+    while walked + 100 <= dataset.deep_offset:
+        params = {"limit": 100, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get(f"{API}/questions", params=params)).json()
+        if not page["next_cursor"]:
+            break
+        cursor = page["next_cursor"]
+        walked += 100
+    dataset.deep_cursor = cursor
+    return dataset
+
+
+def make_operations(dataset: Dataset, page_limit: int):
+    """Операции нагрузки: имя -> корутина, возвращающая ответ"""
+    user_id = str(uuid.uuid4())
+
+    async def create_question(client):
+        response = await client.post(f"{API}/questions", json={"text": "Load question"})
+        if response.status_code == 201:
+            dataset.created_ids.append(response.json()["id"])
+        return response
+
+    async def create_answer(client):
+        question_id = random.choice(dataset.question_ids)
+        return await client.post(f"{API}/questions/{question_id}/answers",
+                                 json={"user_id": user_id, "text": "Load answer"})
+
+    async def list_offset(client):
+        return await client.get(f"{API}/questions", params={"limit": page_limit, "offset": dataset.deep_offset})
+
+    async def list_cursor(client):
+        params = {"limit": page_limit, "include_total": "false"}
+        if dataset.deep_cursor:
+            params["cursor"] = dataset.deep_cursor
+        return await client.get(f"{API}/questions", params=params)
+
+    async def get_question(client):
+        question_id = random.choice(dataset.question_ids)
+        return await client.get(f"{API}/questions/{question_id}", params={"limit": page_limit})
+
+    async def delete_question(client):
+        if not dataset.deletable_ids:
+            # Удалять больше нечего — удаляется свежий вопрос без ответов
+            return await create_and_delete(client)
+        return await client.delete(f"{API}/questions/{dataset.deletable_ids.pop()}")
+
+    async def create_and_delete(client):
+        response = await client.post(f"{API}/questions", json={"text": "Load question"})
+        return await client.delete(f"{API}/questions/{response.json()['id']}")
+
+    return {
+        "POST /questions": create_question,
+        "POST /questions/{id}/answers": create_answer,
+        "GET /questions?offset (deep)": list_offset,
+        "GET /questions?cursor (deep)": list_cursor,
+        "GET /questions/{id}": get_question,
+        "DELETE /questions/{id} (cascade)": delete_question,
+    }
+
+
+async def run_load(client: httpx.AsyncClient, operations, mix: dict[str, int],
+                   duration: float, concurrency: int) -> dict[str, dict]:
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    samples: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = {name: 0 for name in names}
+    deadline = time.monotonic() + duration
+
+    async def worker():
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await operations[name](client)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            samples[name].append(time.perf_counter() - started)
+            errors[name] += failed
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    results = {}
+    for name in names:
+        stats = summarize(samples[name])
+        stats["rps"] = stats["count"] / elapsed
+        stats["errors"] = errors[name]
+        results[name] = stats
+    return results
+
+
+def print_results(results: dict[str, dict]) -> None:
+    print(f"{'endpoint':<36} {'n':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, stats in results.items():
+        print(f"{name:<36} {stats['count']:>7} {stats['rps']:>8.1f} {stats['p50_ms']:>8.2f} "
+              f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['errors']:>7}")
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, dict], baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare a run with a saved baseline.
+
+    Args:
+        results: Current per-endpoint stats
+        baseline: Loaded baseline JSON
+        threshold: Allowed relative regression, e.g. 0.2 for 20%
+
+    Returns:
+        Human-readable regressions, empty if none
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[metric] > 0 and stats[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {base[metric]:.2f} -> {stats[metric]:.2f}")
+        if base["rps"] > 0 and stats["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {base['rps']:.1f} -> {stats['rps']:.1f}")
+    return regressions
+
+
+async def cleanup(client: httpx.AsyncClient, dataset: Dataset, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def drop(question_id: int):
+        async with semaphore:
+            await client.delete(f"{API}/questions/{question_id}")
+
+    await asyncio.gather(*(drop(question_id) for question_id in dataset.created_ids))
+
+
+def make_client(url: str | None, concurrency: int) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0)
+    # Без --url приложение работает в этом же процессе, с БД из .env
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=60.0)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Mixed concurrent load against the QA API")
+    parser.add_argument("--url", help="base URL of a running server; in-process app if omitted")
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--answers", type=int, default=50, help="answers per seeded question")
+    parser.add_argument("--deletable", type=int, default=50, help="extra seeded questions for DELETE")
+    parser.add_argument("--batch-size", type=int, default=500, help="answers per seeding batch request")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=20, help="page size of list and get requests")
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX, help="JSON {endpoint: weight}")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the workload")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare with; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression, 0.2 = 20%%")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    async with make_client(args.url, args.concurrency) as client:
+        seed_started = time.perf_counter()
+        dataset = await seed(client, args.questions, args.answers, args.deletable,
+                             args.concurrency, batch_size=args.batch_size, page_limit=args.limit)
+        print(f"Seeded {args.questions + args.deletable} questions x {args.answers} answers "
+              f"in {time.perf_counter() - seed_started:.1f}s")
+        try:
+            # Прогрев соединений и кэшей
+            await run_load(client, make_operations(dataset, args.limit), args.mix, 2.0, args.concurrency)
+            results = await run_load(client, make_operations(dataset, args.limit), args.mix,
+                                     args.duration, args.concurrency)
+        finally:
+            await cleanup(client, dataset, args.concurrency)
+            if not args.url:
+                from app.database.db import close_db
+                await close_db()
+
+    print_results(results)
+    report = {
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("save", "compare")},
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (revision {baseline.get('revision')}):")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("  no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
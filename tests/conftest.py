@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Тесты работают с отдельной базой TEST_DB_NAME. Переменная задается до импорта app:
+# настройки и движок создаются при импорте
+os.environ["DB_NAME"] = os.environ.get("TEST_DB_NAME", "qa_test")
+# Лог прогона пишется во временный каталог, а не в app.log в корне репозитория
+os.environ["LOG_FILE"] = os.path.join(tempfile.mkdtemp(prefix="qa-tests-"), "app.log")
+
+import asyncpg
+import httpx
+import pytest
+from sqlalchemy import event, text
+
+from app.config import settings
+from app.database.db import engine
+from app.main import app
+from app.repository.counting import count_cache
+
+ROOT = Path(__file__).resolve().parent.parent
+API = "/api/v1"
+USER_ID = "7d3c3f4e-2f0a-4b8e-9a53-1c2d4e5f6a7b"
+
+
+async def _create_database() -> None:
+    connection = await asyncpg.connect(
+        host=settings.db_host, port=settings.db_port, user=settings.db_user,
+        password=settings.db_password, database="postgres", timeout=5,
+    )
+    try:
+        if not await connection.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", settings.db_name):
+            await connection.execute(f'CREATE DATABASE "{settings.db_name}"')
+    finally:
+        await connection.close()
+
+
+@pytest.fixture(scope="session")
+async def database():
+    """Test database migrated to head; tests are skipped when PostgreSQL is not reachable."""
+    try:
+        await _create_database()
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL is not available: {e}")
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=ROOT, env=os.environ, check=True,
+                   stdout=subprocess.DEVNULL)
+    yield
+    await engine.dispose()
+
+
+async def truncate() -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text("TRUNCATE questions, answers, import_checkpoints RESTART IDENTITY CASCADE"))
+        await connection.execute(text("UPDATE counters SET value = 0"))
+    count_cache.clear()
+
+
+@pytest.fixture
+async def db(database):
+    """Empty tables before every test."""
+    await truncate()
+    yield
+
+
+@pytest.fixture
+def statements():
+    """SQL statements sent through the engine while the test runs."""
+    recorded: list[tuple[str, tuple]] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "DELETE", "UPDATE")):
+            recorded.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    yield recorded
+    event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
+
+
+@pytest.fixture
+async def client(db):
+    """HTTP client to the application, without lifespan."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+async def create_question(client: httpx.AsyncClient, text: str = "question") -> dict:
+    response = await client.post(f"{API}/questions", json={"text": text})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def create_answer(client: httpx.AsyncClient, question_id: int, text: str = "answer") -> dict:
+    response = await client.post(f"{API}/questions/{question_id}/answers", json={"user_id": USER_ID, "text": text})
+    assert response.status_code == 201, response.text
+    return response.json()
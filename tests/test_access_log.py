@@ -0,0 +1,70 @@
+import dataclasses
+import json
+import logging
+
+import pytest
+
+from app import observability
+from app.logging_config import JsonFormatter
+from tests.conftest import API, create_question
+
+
+@pytest.fixture
+def records():
+    """Records of the access and slow-query loggers while the test runs."""
+    captured: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = captured.append
+    loggers = [observability.access_logger, observability.query_logger]
+    for logger in loggers:
+        logger.addHandler(handler)
+    yield captured
+    for logger in loggers:
+        logger.removeHandler(handler)
+
+
+def configure(monkeypatch, **changes) -> None:
+    monkeypatch.setattr(observability, "settings", dataclasses.replace(observability.settings, **changes))
+
+
+async def test_access_record_per_request(client, records):
+    question = await create_question(client)
+    records.clear()
+
+    await client.get(f"{API}/questions/{question['id']}")
+
+    record, = [record for record in records if record.name == "app.access"]
+    fields = record.fields
+    assert fields["event"] == "request"
+    # Шаблон маршрута, а не путь с id
+    assert (fields["method"], fields["route"], fields["status"]) == ("GET", "/api/v1/questions/{question_id}", 200)
+    assert fields["queries"] == 1
+    assert fields["db_ms"] > 0 and fields["duration_ms"] >= fields["db_ms"]
+
+    line = json.loads(JsonFormatter().format(record))
+    assert line["logger"] == "app.access" and line["route"] == fields["route"]
+
+
+async def test_unmatched_route_is_logged_with_its_path(client, records):
+    await client.get("/no/such/path")
+
+    record, = [record for record in records if record.name == "app.access"]
+    assert (record.fields["route"], record.fields["status"]) == ("/no/such/path", 404)
+
+
+async def test_slow_queries_are_sampled(client, records, monkeypatch):
+    question = await create_question(client)
+    configure(monkeypatch, slow_query_ms=0, slow_query_sample_rate=1.0)
+    records.clear()
+
+    await client.get(f"{API}/questions/{question['id']}")
+
+    slow, = [record for record in records if record.name == "app.queries"]
+    assert slow.fields["event"] == "slow_query"
+    assert slow.fields["operation"] == "QuestionRepository.get_with_answers"
+    assert slow.fields["statement"].startswith("SELECT")
+
+    configure(monkeypatch, slow_query_ms=0, slow_query_sample_rate=0.0)
+    records.clear()
+    await client.get(f"{API}/questions/{question['id']}")
+    assert not [record for record in records if record.name == "app.queries"]
@@ -0,0 +1,197 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.database.db import engine
+from tests.conftest import API, USER_ID, create_answer, create_question
+
+
+async def collect_pages(client, url: str, page_of=lambda body: body) -> list[list[int]]:
+    """Follow next_cursor from the first page to the last one; ids of every page."""
+    pages, params = [], {"limit": 10, "include_total": "false"}
+    while True:
+        response = await client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        page = page_of(response.json())
+        pages.append([item["id"] for item in page["items"]])
+        if page["next_cursor"] is None:
+            return pages
+        params["cursor"] = page["next_cursor"]
+
+
+async def test_questions_cursor_round_trip(client):
+    created = [(await create_question(client, f"question {i}"))["id"] for i in range(25)]
+
+    pages = await collect_pages(client, f"{API}/questions")
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    # Порядок создания, ни один вопрос не потерян и не повторен на границе страниц
+    assert sum(pages, []) == created
+
+
+async def test_cursor_ignores_offset_and_matches_offset_pages(client):
+    for i in range(15):
+        await create_question(client, f"question {i}")
+    first = (await client.get(f"{API}/questions", params={"limit": 10})).json()
+
+    by_cursor = await client.get(f"{API}/questions", params={"limit": 10, "offset": 3, "cursor": first["next_cursor"]})
+    by_offset = await client.get(f"{API}/questions", params={"limit": 10, "offset": 10})
+
+    assert [q["id"] for q in by_cursor.json()["items"]] == [q["id"] for q in by_offset.json()["items"]]
+
+
+async def test_answers_cursor_round_trip(client):
+    question = await create_question(client)
+    created = [(await create_answer(client, question["id"], f"answer {i}"))["id"] for i in range(12)]
+
+    pages = await collect_pages(client, f"{API}/questions/{question['id']}", lambda body: body["answers"])
+
+    assert [len(page) for page in pages] == [10, 2]
+    assert sum(pages, []) == created
+
+
+async def test_malformed_cursor_is_rejected(client):
+    response = await client.get(f"{API}/questions", params={"cursor": "not a cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "validation_error"
+
+
+async def test_question_page_and_total_in_one_statement(client, statements):
+    question = await create_question(client)
+    answers = [(await create_answer(client, question["id"], f"answer {i}"))["id"] for i in range(3)]
+    statements.clear()
+
+    response = await client.get(f"{API}/questions/{question['id']}", params={"limit": 2})
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body["id"], body["text"]) == (question["id"], question["text"])
+    assert [answer["id"] for answer in body["answers"]["items"]] == answers[:2]
+    assert body["answers"]["total"] == 3
+    assert len(statements) == 1
+
+
+async def test_question_without_answers_in_one_statement(client, statements):
+    question = await create_question(client)
+    statements.clear()
+
+    body = (await client.get(f"{API}/questions/{question['id']}")).json()
+
+    assert body["answers"] == {"total": 0, "items": [], "limit": 10, "offset": 0, "next_cursor": None}
+    assert len(statements) == 1
+
+
+async def test_missing_question_is_404(client):
+    response = await client.get(f"{API}/questions/1")
+
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "not_found"
+
+
+async def test_create_returns_generated_columns_without_select(client, statements):
+    response = await client.post(f"{API}/questions", json={"text": "new question"})
+    question = response.json()
+    answer = await create_answer(client, question["id"], "new answer")
+
+    # id и created_at приходят из INSERT ... RETURNING, без повторного SELECT
+    assert not [statement for statement, _ in statements if statement.lstrip().upper().startswith("SELECT")]
+    stored = (await client.get(f"{API}/questions/{question['id']}")).json()
+    assert (stored["id"], stored["created_at"]) == (question["id"], question["created_at"])
+    assert stored["answers"]["items"] == [answer]
+
+
+async def test_create_answer_for_missing_question_is_404(client):
+    response = await client.post(f"{API}/questions/1/answers", json={"user_id": USER_ID, "text": "answer"})
+
+    assert response.status_code == 404
+
+
+def statement_kinds(statements) -> list[str]:
+    return [statement.lstrip().split(None, 1)[0].upper() for statement, _ in statements]
+
+
+async def test_delete_question_in_one_statement(client, statements):
+    question = await create_question(client)
+    answer = await create_answer(client, question["id"])
+    statements.clear()
+
+    response = await client.delete(f"{API}/questions/{question['id']}")
+
+    assert response.status_code == 204
+    # Без предварительного SELECT; ответы удаляет каскад
+    assert "SELECT" not in statement_kinds(statements)
+    assert statement_kinds(statements).count("DELETE") == 1
+    assert (await client.get(f"{API}/questions/{question['id']}")).status_code == 404
+    assert (await client.get(f"{API}/answers/{answer['id']}")).status_code == 404
+    assert (await client.get(f"{API}/questions")).json()["total"] == 0
+
+
+async def test_delete_answer_in_one_statement(client, statements):
+    question = await create_question(client)
+    answers = [await create_answer(client, question["id"]) for _ in range(2)]
+    statements.clear()
+
+    response = await client.delete(f"{API}/answers/{answers[0]['id']}")
+
+    assert response.status_code == 204
+    assert "SELECT" not in statement_kinds(statements)
+    assert statement_kinds(statements).count("DELETE") == 1
+    page = (await client.get(f"{API}/questions/{question['id']}")).json()["answers"]
+    assert [item["id"] for item in page["items"]] == [answers[1]["id"]]
+    assert page["total"] == 1
+
+
+async def test_delete_missing_is_404(client):
+    assert (await client.delete(f"{API}/questions/1")).status_code == 404
+    assert (await client.delete(f"{API}/answers/1")).status_code == 404
+
+
+async def test_answer_delete_concurrent_with_question_delete(client):
+    question = await create_question(client)
+    answer = await create_answer(client, question["id"])
+
+    async with engine.connect() as connection:
+        # Удаление вопроса уже взяло строку вопроса и еще не дошло до каскада по ответам
+        await connection.execute(text("SELECT id FROM questions WHERE id = :id FOR UPDATE"), {"id": question["id"]})
+        answer_delete = asyncio.create_task(client.delete(f"{API}/answers/{answer['id']}"))
+        await asyncio.sleep(0.3)
+        assert not answer_delete.done()
+        await connection.execute(text("DELETE FROM questions WHERE id = :id"), {"id": question["id"]})
+        await connection.commit()
+
+    # Оба удаления берут вопрос раньше ответа: взаимоблокировки нет, ответ ушел каскадом
+    assert (await answer_delete).status_code == 404
+
+
+async def test_include_answers_embeds_latest_answers(client, statements):
+    questions = [await create_question(client, f"question {i}") for i in range(3)]
+    answers = [await create_answer(client, questions[0]["id"], f"answer {i}") for i in range(3)]
+    only = await create_answer(client, questions[1]["id"])
+    statements.clear()
+
+    response = await client.get(f"{API}/questions", params={"include_answers": 2, "include_total": "false"})
+
+    items = response.json()["items"]
+    assert [item["answer_count"] for item in items] == [3, 1, 0]
+    # Последние ответы — самые новые первыми
+    assert items[0]["latest_answers"] == [answers[2], answers[1]]
+    assert items[1]["latest_answers"] == [only]
+    assert items[2]["latest_answers"] == []
+    # Страница вопросов и ответы всех вопросов страницы: два запроса, а не 1 + N
+    assert len(statements) == 2
+
+
+async def test_list_without_include_answers_has_plain_items(client):
+    question = await create_question(client)
+    await create_answer(client, question["id"])
+
+    items = (await client.get(f"{API}/questions")).json()["items"]
+
+    assert set(items[0]) == {"id", "text", "created_at"}
+
+
+async def test_include_answers_is_limited(client):
+    response = await client.get(f"{API}/questions", params={"include_answers": 11})
+
+    assert response.status_code == 422
@@ -0,0 +1,75 @@
+from app.config import settings
+from tests.conftest import API, USER_ID, create_question
+
+
+async def test_question_batch_reports_invalid_items(client):
+    response = await client.post(f"{API}/questions:batch", json={"items": [
+        {"text": "first"}, {"text": "   "}, {"text": "third", "extra": 1}, {"text": "fourth"},
+    ]})
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [question["text"] for question in body["created"]] == ["first", "fourth"]
+    assert all(question["id"] and question["created_at"] for question in body["created"])
+    assert [(error["index"], error["code"]) for error in body["errors"]] == [
+        (1, "validation_error"), (2, "validation_error"),
+    ]
+    assert (await client.get(f"{API}/questions")).json()["total"] == 2
+
+
+async def test_batch_rejects_text_longer_than_column(client):
+    # text — VARCHAR(255): длинный элемент отсекается валидацией, а не падением всего INSERT
+    response = await client.post(f"{API}/questions:batch", json={"items": [
+        {"text": "first"}, {"text": "q" * 256}, {"text": "q" * 255},
+    ]})
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [len(question["text"]) for question in body["created"]] == [5, 255]
+    assert [(error["index"], error["code"]) for error in body["errors"]] == [(1, "validation_error")]
+
+    answers = await client.post(f"{API}/questions/{body['created'][0]['id']}/answers:batch", json={"items": [
+        {"user_id": USER_ID, "text": "a" * 300}, {"user_id": USER_ID, "text": "second"},
+    ]})
+
+    assert answers.status_code == 200
+    assert [answer["text"] for answer in answers.json()["created"]] == ["second"]
+    assert [error["index"] for error in answers.json()["errors"]] == [0]
+
+
+async def test_answer_batch_reports_invalid_items(client):
+    question = await create_question(client)
+
+    response = await client.post(f"{API}/questions/{question['id']}/answers:batch", json={"items": [
+        {"user_id": USER_ID, "text": "first"}, {"user_id": "not-a-uuid", "text": "second"},
+        {"user_id": USER_ID, "text": "third"},
+    ]})
+
+    body = response.json()
+    assert [answer["text"] for answer in body["created"]] == ["first", "third"]
+    assert [error["index"] for error in body["errors"]] == [1]
+    assert "user_id" in body["errors"][0]["message"]
+    page = (await client.get(f"{API}/questions/{question['id']}")).json()["answers"]
+    assert page["total"] == 2
+
+
+async def test_answer_batch_for_missing_question(client):
+    response = await client.post(f"{API}/questions/1/answers:batch", json={"items": [
+        {"user_id": USER_ID, "text": "first"}, {"text": "no user"}, {"user_id": USER_ID, "text": "third"},
+    ]})
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["created"] == []
+    assert [(error["index"], error["code"]) for error in body["errors"]] == [
+        (0, "not_found"), (1, "validation_error"), (2, "not_found"),
+    ]
+
+
+async def test_batch_size_is_limited(client):
+    empty = await client.post(f"{API}/questions:batch", json={"items": []})
+    too_large = await client.post(f"{API}/questions:batch",
+                                  json={"items": [{"text": "q"}] * (settings.batch_max_size + 1)})
+
+    assert empty.status_code == too_large.status_code == 422
+    assert (await client.get(f"{API}/questions")).json()["total"] == 0
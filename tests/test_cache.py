@@ -0,0 +1,135 @@
+import pytest
+
+from app.cache import redis_cache
+from app.cache.memory import MemoryCache
+from app.dependencies import get_cache
+from app.main import app
+from app.repository.question_repository import QuestionRepository
+from tests.conftest import API, create_answer, create_question
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def cache(request, client, monkeypatch):
+    """Every cache test runs against the in-process LRU and against Redis (fakeredis)."""
+    if request.param == "memory":
+        cache = MemoryCache(max_entries=100, ttl=60)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        monkeypatch.setattr(redis_cache.redis_asyncio, "from_url",
+                            lambda url: fakeredis.FakeAsyncRedis(server=server))
+        cache = redis_cache.RedisCache(url="redis://fake", ttl=60)
+    app.dependency_overrides[get_cache] = lambda: cache
+    yield cache
+    await cache.close()
+
+
+async def answer_ids(client, question_id: int) -> list[int]:
+    response = await client.get(f"{API}/questions/{question_id}")
+    return [answer["id"] for answer in response.json()["answers"]["items"]]
+
+
+async def test_repeated_read_is_served_from_cache(client, cache, statements):
+    question = await create_question(client)
+    first = await client.get(f"{API}/questions/{question['id']}")
+    statements.clear()
+
+    second = await client.get(f"{API}/questions/{question['id']}")
+
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    assert statements == []
+    assert cache.stats.hits == 1
+
+
+async def test_answer_create_and_delete_invalidate_question(client, cache):
+    question = await create_question(client)
+    assert await answer_ids(client, question["id"]) == []
+
+    answer = await create_answer(client, question["id"])
+    assert await answer_ids(client, question["id"]) == [answer["id"]]
+
+    await client.get(f"{API}/answers/{answer['id']}")
+    assert (await client.delete(f"{API}/answers/{answer['id']}")).status_code == 204
+    assert await answer_ids(client, question["id"]) == []
+    assert (await client.get(f"{API}/answers/{answer['id']}")).status_code == 404
+
+
+async def test_question_create_and_delete_invalidate_lists(client, cache):
+    question = await create_question(client)
+    await client.get(f"{API}/questions/{question['id']}")
+    assert (await client.get(f"{API}/questions")).json()["total"] == 1
+
+    other = await create_question(client)
+    assert (await client.get(f"{API}/questions")).json()["total"] == 2
+
+    assert (await client.delete(f"{API}/questions/{question['id']}")).status_code == 204
+    listed = (await client.get(f"{API}/questions")).json()
+    assert [item["id"] for item in listed["items"]] == [other["id"]]
+    assert (await client.get(f"{API}/questions/{question['id']}")).status_code == 404
+
+
+async def test_new_answer_invalidates_embedded_answers(client, cache):
+    question = await create_question(client)
+    params = {"include_answers": 3}
+    assert (await client.get(f"{API}/questions", params=params)).json()["items"][0]["latest_answers"] == []
+
+    answer = await create_answer(client, question["id"])
+
+    items = (await client.get(f"{API}/questions", params=params)).json()["items"]
+    assert [latest["id"] for latest in items[0]["latest_answers"]] == [answer["id"]]
+
+
+async def test_write_during_read_is_not_overwritten_by_stale_body(client, cache, monkeypatch):
+    question = await create_question(client)
+    get_with_answers = QuestionRepository.get_with_answers
+
+    async def answered_meanwhile(self, session, question_id, **kwargs):
+        result = await get_with_answers(self, session, question_id, **kwargs)
+        # Ответ создан и кэш инвалидирован после чтения, но до записи тела в кэш
+        monkeypatch.setattr(QuestionRepository, "get_with_answers", get_with_answers)
+        await create_answer(client, question_id)
+        return result
+
+    monkeypatch.setattr(QuestionRepository, "get_with_answers", answered_meanwhile)
+
+    assert await answer_ids(client, question["id"]) == []
+    assert len(await answer_ids(client, question["id"])) == 1
+
+
+async def test_set_is_dropped_when_its_tag_was_invalidated_after_generation(cache):
+    generation = await cache.generation()
+    await cache.invalidate_tags("question:1")
+
+    await cache.set("stale", "old body", tags=("question:1", "questions"), generation=generation)
+    await cache.set("other", "body", tags=("question:2",), generation=generation)
+    await cache.set("fresh", "new body", tags=("question:1",), generation=await cache.generation())
+
+    assert await cache.get("stale") is None
+    assert await cache.get("other") == "body"
+    assert await cache.get("fresh") == "new body"
+
+
+async def test_invalidate_drops_entries_of_every_tag(cache):
+    await cache.set("a", "1", tags=("t1",))
+    await cache.set("b", "2", tags=("t1", "t2"))
+    await cache.set("c", "3", tags=("t3",))
+
+    await cache.invalidate_tags("t1", "t2")
+
+    assert [await cache.get(key) for key in "abc"] == [None, None, "3"]
+    assert cache.stats.invalidations == 2
+
+
+async def test_evicted_invalidation_stamps_reject_older_generations():
+    cache = MemoryCache(max_entries=2, ttl=60)
+    generation = await cache.generation()
+    for tag in ("t1", "t2", "t3"):
+        await cache.invalidate_tags(tag)
+
+    # Отметка t1 вытеснена: неизвестно, менялся ли тег, запись со старым снимком не принимается
+    await cache.set("stale", "old body", tags=("t1",), generation=generation)
+    await cache.set("fresh", "body", tags=("t1",), generation=await cache.generation())
+
+    assert await cache.get("stale") is None
+    assert await cache.get("fresh") == "body"
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+from tests.conftest import API, create_answer, create_question
+
+
+async def test_question_not_modified(client, statements):
+    question = await create_question(client)
+    await create_answer(client, question["id"])
+    url = f"{API}/questions/{question['id']}"
+    statements.clear()
+    first = await client.get(url)
+    # Без If-None-Match версия не читается отдельным запросом
+    assert len(statements) == 1
+    etag = first.headers["etag"]
+    statements.clear()
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert len(statements) == 1
+
+
+async def test_question_etag_changes_with_answers_and_page(client):
+    question = await create_question(client)
+    url = f"{API}/questions/{question['id']}"
+    etag = (await client.get(url)).headers["etag"]
+    assert (await client.get(url, params={"limit": 5})).headers["etag"] != etag
+
+    answer = await create_answer(client, question["id"])
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [item["id"] for item in response.json()["answers"]["items"]] == [answer["id"]]
+
+    # Удаление меняет версию так же, как добавление
+    etag = response.headers["etag"]
+    await client.delete(f"{API}/answers/{answer['id']}")
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 200
+
+
+async def test_etag_matches_the_body_it_came_with(client):
+    question = await create_question(client)
+    url = f"{API}/questions/{question['id']}"
+    plain = await client.get(url)
+    conditional = await client.get(url, headers={"If-None-Match": 'W/"stale"'})
+
+    assert conditional.status_code == 200
+    assert conditional.headers["etag"] == plain.headers["etag"]
+
+
+async def test_missing_question_with_if_none_match_is_404(client):
+    response = await client.get(f"{API}/questions/1", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+async def test_answer_validators(client):
+    question = await create_question(client)
+    answer = await create_answer(client, question["id"])
+    url = f"{API}/answers/{answer['id']}"
+    response = await client.get(url)
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    assert (await client.get(url, headers={"If-None-Match": etag})).status_code == 304
+    assert (await client.get(url, headers={"If-Modified-Since": last_modified})).status_code == 304
+    earlier = format_datetime(parsedate_to_datetime(last_modified) - timedelta(seconds=1), usegmt=True)
+    assert (await client.get(url, headers={"If-Modified-Since": earlier})).status_code == 200
+    # If-None-Match важнее If-Modified-Since
+    assert (await client.get(url, headers={"If-None-Match": 'W/"stale"',
+                                           "If-Modified-Since": last_modified})).status_code == 200
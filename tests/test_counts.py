@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import text
+
+from app.database.db import engine
+from app.dependencies import get_question_service
+from app.main import app
+from app.repository.answer_repository import AnswerRepository
+from app.repository.counting import CountStrategy
+from app.repository.question_repository import QuestionRepository
+from app.services.answer_service import AnswerService
+from app.services.question_service import QuestionService
+from tests.conftest import API, create_answer, create_question
+
+
+def use_strategy(strategy: CountStrategy) -> None:
+    app.dependency_overrides[get_question_service] = lambda: QuestionService(
+        repository=QuestionRepository(count_strategy=strategy, answers_count_strategy=strategy),
+        answer_service=AnswerService(repository=AnswerRepository()),
+    )
+
+
+async def totals(client, question_id: int) -> tuple[int | None, int | None]:
+    questions = (await client.get(f"{API}/questions")).json()
+    question = (await client.get(f"{API}/questions/{question_id}")).json()
+    return questions["total"], question["answers"]["total"]
+
+
+@pytest.mark.parametrize("strategy", [CountStrategy.EXACT, CountStrategy.CACHED, CountStrategy.COUNTER])
+async def test_totals_follow_writes(client, strategy):
+    use_strategy(strategy)
+    question = await create_question(client)
+    await create_question(client)
+    answers = [await create_answer(client, question["id"]) for _ in range(3)]
+    assert await totals(client, question["id"]) == (2, 3)
+
+    await client.delete(f"{API}/answers/{answers[0]['id']}")
+    await create_question(client)
+
+    assert await totals(client, question["id"]) == (3, 2)
+
+
+async def test_cached_total_is_reused_within_ttl(client):
+    use_strategy(CountStrategy.CACHED)
+    question = await create_question(client)
+    assert await totals(client, question["id"]) == (1, 0)
+
+    # Строки, вставленные в обход приложения, не сбрасывают кэш: total остается прежним до конца TTL
+    async with engine.begin() as connection:
+        await connection.execute(text("INSERT INTO questions (text) VALUES ('bypass')"))
+
+    assert await totals(client, question["id"]) == (1, 0)
+
+
+async def test_estimate_returns_a_number(client):
+    use_strategy(CountStrategy.ESTIMATE)
+    question = await create_question(client)
+    await create_answer(client, question["id"])
+
+    questions_total, answers_total = await totals(client, question["id"])
+
+    assert isinstance(questions_total, int) and questions_total >= 0
+    assert isinstance(answers_total, int) and answers_total >= 0
+
+
+@pytest.mark.parametrize("strategy", list(CountStrategy))
+async def test_include_total_false_skips_counting(client, statements, strategy):
+    use_strategy(strategy)
+    question = await create_question(client)
+    statements.clear()
+
+    questions = (await client.get(f"{API}/questions", params={"include_total": "false"})).json()
+    answers = (await client.get(f"{API}/questions/{question['id']}", params={"include_total": "false"})).json()
+
+    assert questions["total"] is None and answers["answers"]["total"] is None
+    assert not [statement for statement, _ in statements if "count(" in statement.lower()]
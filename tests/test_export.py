@@ -0,0 +1,57 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.dependencies import get_export_service
+from app.main import app
+from app.repository.export_repository import ExportRepository
+from app.services.export_service import CsvEncoder, ExportService
+from tests.conftest import API, create_answer, create_question
+
+
+@pytest.fixture
+async def data(client) -> list[tuple[dict, list[dict]]]:
+    # Пачка курсора меньше числа ответов: ответы одного вопроса приходят в разных пачках
+    app.dependency_overrides[get_export_service] = lambda: ExportService(ExportRepository(), batch_size=2)
+    answered = await create_question(client, "answered, with \"quotes\"")
+    answers = [await create_answer(client, answered["id"], f"answer {i}\nsecond line") for i in range(3)]
+    empty = await create_question(client, "no answers")
+    return [(answered, answers), (empty, [])]
+
+
+async def test_ndjson_export(client, data):
+    response = await client.get(f"{API}/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="export.ndjson"' in response.headers["content-disposition"]
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["id"], line["text"]) for line in lines] == [(q["id"], q["text"]) for q, _ in data]
+    for line, (_, answers) in zip(lines, data):
+        assert line["answers"] == [{key: answer[key] for key in ("id", "user_id", "text", "created_at")}
+                                   for answer in answers]
+
+
+async def test_csv_export(client, data):
+    response = await client.get(f"{API}/export", params={"format": "csv"})
+
+    assert response.headers["content-type"] == CsvEncoder.media_type
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert tuple(header) == CsvEncoder.columns
+    (answered, answers), (empty, _) = data
+    assert [(int(row[0]), row[1], row[5]) for row in rows] == [
+        *((answered["id"], answered["text"], answer["text"]) for answer in answers),
+        (empty["id"], empty["text"], ""),
+    ]
+
+
+async def test_empty_export(client):
+    assert (await client.get(f"{API}/export")).content == b""
+    rows = list(csv.reader(io.StringIO((await client.get(f"{API}/export", params={"format": "csv"})).text)))
+    assert rows == [list(CsvEncoder.columns)]
+
+
+async def test_unknown_format(client):
+    assert (await client.get(f"{API}/export", params={"format": "xml"})).status_code == 422
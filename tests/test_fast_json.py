@@ -0,0 +1,44 @@
+import dataclasses
+
+from app import responses
+from tests.conftest import API, create_answer, create_question
+
+
+def fast_json(monkeypatch, enabled: bool) -> None:
+    monkeypatch.setattr(responses, "settings", dataclasses.replace(responses.settings, fast_json=enabled))
+
+
+async def test_fast_json_matches_default_output(client, monkeypatch):
+    question = await create_question(client)
+    answer = await create_answer(client, question["id"])
+    urls = [
+        f"{API}/questions",
+        f"{API}/questions?include_total=false&limit=1",
+        f"{API}/questions/{question['id']}",
+        f"{API}/answers/{answer['id']}",
+    ]
+
+    outputs = {}
+    for enabled in (False, True):
+        fast_json(monkeypatch, enabled)
+        outputs[enabled] = [await client.get(url) for url in urls]
+
+    for default, fast in zip(outputs[False], outputs[True]):
+        assert fast.status_code == default.status_code == 200
+        assert fast.json() == default.json()
+        assert fast.headers["content-type"] == default.headers["content-type"]
+        # ETag и Last-Modified, выставленные маршрутом, сохраняются
+        assert fast.headers.get("etag") == default.headers.get("etag")
+        assert fast.headers.get("last-modified") == default.headers.get("last-modified")
+
+
+async def test_fast_json_keeps_status_of_created(client, monkeypatch):
+    fast_json(monkeypatch, True)
+
+    response = await client.post(f"{API}/questions", json={"text": "fast"})
+
+    assert response.status_code == 201
+    assert response.json()["text"] == "fast"
+    batch = await client.post(f"{API}/questions:batch", json={"items": [{"text": "a"}, {"text": ""}]})
+    assert batch.status_code == 200
+    assert [error["index"] for error in batch.json()["errors"]] == [1]
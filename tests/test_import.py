@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from app.database.models import ImportCheckpoint
+from app.dependencies import get_import_service
+from app.main import app
+from app.repository.import_repository import ImportRepository
+from app.services.import_service import ImportService
+from tests.conftest import API, USER_ID
+
+
+def ndjson(count: int) -> list[bytes]:
+    return [
+        json.dumps({"text": f"imported {i}", "answers": [{"user_id": USER_ID, "text": f"answer {i}.{j}"}
+                                                         for j in range(i % 3)]}).encode()
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def batches(client) -> None:
+    """Import in batches of two lines, so one request commits several checkpoints."""
+    app.dependency_overrides[get_import_service] = lambda: ImportService(ImportRepository(), batch_size=2)
+
+
+async def post(client, job: str, lines: list[bytes]):
+    return await client.post(f"{API}/import", params={"job": job}, content=b"\n".join(lines) + b"\n",
+                             headers={"Content-Type": "application/x-ndjson"})
+
+
+async def imported_texts(client) -> list[str]:
+    page = (await client.get(f"{API}/questions", params={"limit": 100})).json()
+    return [question["text"] for question in page["items"]]
+
+
+async def test_import_loads_questions_and_rejects_invalid_lines(client, batches):
+    lines = ndjson(3)
+    lines[1:1] = [b"", b'{"text": ""}', b"not json"]
+
+    response = await post(client, "first", lines)
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body["position"], body["resumed_from"]) == (6, 0)
+    assert (body["questions"], body["answers"], body["rejected"]) == (3, 3, 2)
+    assert [(error["line"], error["code"]) for error in body["errors"]] == [(3, "validation_error"),
+                                                                           (4, "validation_error")]
+    assert await imported_texts(client) == ["imported 0", "imported 1", "imported 2"]
+    question_id = (await client.get(f"{API}/questions")).json()["items"][2]["id"]
+    answers = (await client.get(f"{API}/questions/{question_id}")).json()["answers"]
+    assert [answer["text"] for answer in answers["items"]] == ["answer 2.0", "answer 2.1"]
+    assert answers["total"] == 2
+
+
+async def test_interrupted_import_resumes_after_checkpoint(client, batches, monkeypatch):
+    lines = ndjson(7)
+    load_batch = ImportRepository.load_batch
+    calls = 0
+
+    async def failing_load_batch(self, *args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise RuntimeError("connection lost")
+        return await load_batch(self, *args, **kwargs)
+
+    monkeypatch.setattr(ImportRepository, "load_batch", failing_load_batch)
+    with pytest.raises(RuntimeError, match="connection lost"):
+        await post(client, "resumable", lines)
+    # Закоммичены две пачки, третья откатилась целиком
+    assert await imported_texts(client) == [f"imported {i}" for i in range(4)]
+
+    response = await post(client, "resumable", lines)
+
+    body = response.json()
+    assert (body["resumed_from"], body["position"], body["questions"]) == (4, 7, 3)
+    assert await imported_texts(client) == [f"imported {i}" for i in range(7)]
+    assert (await client.get(f"{API}/questions")).json()["total"] == 7
+
+    # Повтор завершенного задания ничего не загружает
+    again = (await post(client, "resumable", lines)).json()
+    assert (again["resumed_from"], again["questions"]) == (7, 0)
+
+
+async def test_concurrent_load_of_the_same_job_conflicts(client, monkeypatch):
+    lines = ndjson(2)
+    await post(client, "shared", lines)
+    get_checkpoint = ImportRepository.get_checkpoint
+
+    async def stale_checkpoint(self, session, job):
+        # Другой запрос успел сдвинуть контрольную точку после того, как этот ее прочитал
+        checkpoint = await get_checkpoint(self, session, job)
+        return ImportCheckpoint(job=checkpoint.job, position=0)
+
+    monkeypatch.setattr(ImportRepository, "get_checkpoint", stale_checkpoint)
+    response = await post(client, "shared", lines)
+
+    assert response.status_code == 409
+    assert response.json()["error"]["code"] == "conflict"
+    assert await imported_texts(client) == ["imported 0", "imported 1"]
@@ -0,0 +1,44 @@
+import random
+
+from benchmarks.load import DEFAULT_MIX, cleanup, compare, make_operations, run_load, seed
+from tests.conftest import API
+
+
+def stats(p50: float, rps: float) -> dict:
+    return {"count": 100, "rps": rps, "p50_ms": p50, "p95_ms": p50 * 2, "p99_ms": p50 * 3, "errors": 0}
+
+
+def test_compare_reports_latency_and_throughput_regressions():
+    baseline = {"results": {"GET /questions/{id}": stats(2.0, 1000), "POST /questions": stats(5.0, 100)}}
+    results = {
+        "GET /questions/{id}": stats(2.2, 950),
+        "POST /questions": stats(7.0, 70),
+        "DELETE /questions/{id} (cascade)": stats(50.0, 1),
+    }
+
+    regressions = compare(results, baseline, threshold=0.2)
+
+    # В пределах порога и эндпоинты без базовой линии не считаются регрессией
+    assert regressions == [
+        "POST /questions: p50_ms 5.00 -> 7.00",
+        "POST /questions: p95_ms 10.00 -> 14.00",
+        "POST /questions: p99_ms 15.00 -> 21.00",
+        "POST /questions: rps 100.0 -> 70.0",
+    ]
+
+
+async def test_short_mixed_run_against_the_app(client):
+    random.seed(0)
+    dataset = await seed(client, questions=3, answers=4, deletable=2, concurrency=2, batch_size=3, page_limit=2)
+    assert len(dataset.created_ids) == 5
+    assert dataset.deep_offset == 3
+
+    results = await run_load(client, make_operations(dataset, page_limit=2), DEFAULT_MIX,
+                             duration=0.5, concurrency=2)
+
+    assert set(results) == set(DEFAULT_MIX)
+    assert sum(result["count"] for result in results.values()) > 0
+    assert all(result["errors"] == 0 for result in results.values())
+
+    await cleanup(client, dataset, concurrency=2)
+    assert (await client.get(f"{API}/questions")).json()["total"] == 0
@@ -0,0 +1,79 @@
+import logging
+import queue
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.logging_config import BoundedQueueHandler, DrainingQueueListener
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"tests.logging.{id(handler)}")
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def test_full_queue_drops_and_counts_records():
+    dropped_before = REGISTRY.get_sample_value("log_records_dropped_total")
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, "drop")
+    logger = make_logger(handler)
+
+    for i in range(5):
+        logger.info("record %s", i)
+
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
+    assert REGISTRY.get_sample_value("log_records_dropped_total") - dropped_before == 3
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == ["record 0", "record 1"]
+
+
+def test_message_is_rendered_when_logged():
+    log_queue = queue.Queue()
+    logger = make_logger(BoundedQueueHandler(log_queue))
+    items = ["before"]
+
+    logger.info("items: %s", items)
+    items[0] = "after"
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("failed")
+
+    first, second = log_queue.get_nowait(), log_queue.get_nowait()
+    assert first.getMessage() == "items: ['before']"
+    # Traceback уже строка: объекты исключения в очередь не попадают
+    assert second.exc_info is None and "RuntimeError: boom" in second.exc_text
+
+
+def test_block_policy_delivers_every_record():
+    log_queue = queue.Queue(maxsize=1)
+    target = ListHandler()
+    listener = DrainingQueueListener(log_queue, target)
+    listener.start()
+    handler = BoundedQueueHandler(log_queue, "block")
+    logger = make_logger(handler)
+    try:
+        for i in range(50):
+            logger.info("record %s", i)
+    finally:
+        listener.stop()
+
+    assert handler.dropped == 0
+    assert [record.getMessage() for record in target.records] == [f"record {i}" for i in range(50)]
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError, match="LOG_OVERFLOW_POLICY"):
+        BoundedQueueHandler(queue.Queue(), "wait")
@@ -0,0 +1,54 @@
+from prometheus_client.parser import text_string_to_metric_families
+
+from tests.conftest import API, create_question
+
+QUESTION_ROUTE = "/api/v1/questions/{question_id}"
+
+
+async def scrape(client) -> dict[tuple[str, frozenset], float]:
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return {
+        (sample.name, frozenset(sample.labels.items())): sample.value
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+
+
+def sample(samples, name: str, **labels) -> float:
+    return samples.get((name, frozenset(labels.items())), 0.0)
+
+
+async def test_request_and_repository_metrics(client):
+    question = await create_question(client)
+    before = await scrape(client)
+
+    await client.get(f"{API}/questions/{question['id']}")
+    await client.get(f"{API}/questions/{question['id'] + 1}")
+
+    after = await scrape(client)
+
+    def delta(name: str, **labels) -> float:
+        return sample(after, name, **labels) - sample(before, name, **labels)
+
+    # Метка маршрута — шаблон, а не путь с id
+    assert delta("http_requests_total", method="GET", route=QUESTION_ROUTE, status="200") == 1
+    assert delta("http_requests_total", method="GET", route=QUESTION_ROUTE, status="404") == 1
+    assert delta("http_request_duration_seconds_count", method="GET", route=QUESTION_ROUTE) == 2
+    assert delta("http_errors_total", route=QUESTION_ROUTE, code="not_found") == 1
+    assert delta("db_repository_call_duration_seconds_count",
+                 operation="QuestionRepository.get_with_answers") == 2
+    assert sample(after, "db_pool_size", pool="primary") > 0
+    assert delta("db_pool_wait_seconds_count", pool="primary") >= 2
+
+
+async def test_unmatched_routes_share_one_label(client):
+    before = await scrape(client)
+
+    await client.get("/no/such/path/1")
+    await client.get("/no/such/path/2")
+
+    after = await scrape(client)
+    labels = dict(method="GET", route="unmatched", status="404")
+    assert sample(after, "http_requests_total", **labels) - sample(before, "http_requests_total", **labels) == 2
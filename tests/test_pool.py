@@ -0,0 +1,34 @@
+from app.config import Settings
+from app.database import db
+from app.database.db import connect_args
+from tests.conftest import API, create_question
+
+
+async def test_pool_stats_count_checkouts(client):
+    before = (await client.get(f"{API}/system/pool")).json()
+
+    await create_question(client)
+    await client.get(f"{API}/questions")
+
+    after = (await client.get(f"{API}/system/pool")).json()
+    assert after["pool_size"] == db.settings.db_pool_size
+    assert after["checkouts"] >= before["checkouts"] + 2
+    # Соединения возвращены в пул к концу запросов
+    assert after["checked_out"] == 0
+    assert after["timeouts"] == 0
+
+
+def test_pool_and_asyncpg_settings_from_env(monkeypatch):
+    for name, value in {"DB_POOL_SIZE": "4", "DB_MAX_OVERFLOW": "2", "DB_POOL_TIMEOUT": "1.5",
+                        "DB_STATEMENT_CACHE_SIZE": "0", "DB_STATEMENT_TIMEOUT_MS": "250",
+                        "DB_COMMAND_TIMEOUT": "3"}.items():
+        monkeypatch.setenv(name, value)
+    settings = Settings.from_env()
+    monkeypatch.setattr(db, "settings", settings)
+
+    assert (settings.db_pool_size, settings.db_max_overflow, settings.db_pool_timeout) == (4, 2, 1.5)
+    args = connect_args()
+    assert args["statement_cache_size"] == 0
+    assert args["command_timeout"] == 3.0
+    assert args["server_settings"]["statement_timeout"] == "250"
+
@@ -0,0 +1,28 @@
+from app.database.db import async_session_factory
+from app.repository.question_repository import QuestionRepository
+from tests.conftest import API, USER_ID, create_answer, create_question
+
+
+async def test_list_items_carry_only_response_fields(client):
+    question = await create_question(client)
+
+    items = (await client.get(f"{API}/questions")).json()["items"]
+
+    assert items == [question]
+
+
+async def test_reads_do_not_load_orm_entities(client):
+    question = await create_question(client)
+    await create_answer(client, question["id"])
+    repository = QuestionRepository()
+
+    async with async_session_factory() as session:
+        rows, _ = await repository.get_all(session, limit=10)
+        db_question, answers, total, _ = await repository.get_with_answers(session, question["id"])
+        # Строки колонок, а не сущности: identity map не наполняется
+        assert len(session.identity_map) == 0
+
+    assert [row.id for row in rows] == [question["id"]]
+    assert db_question.text == question["text"]
+    assert [(answer.answer_text, answer.user_id) for answer in answers] == [("answer", USER_ID)]
+    assert total == 1
@@ -0,0 +1,124 @@
+"""EXPLAIN every read query of the repositories on seeded tables: no Seq Scan on questions or answers."""
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.db import async_session_factory, engine
+from app.repository.answer_repository import AnswerRepository
+from app.repository.counting import CountStrategy
+from app.repository.question_repository import QuestionRepository
+from app.repository.search_repository import SearchRepository
+from tests.conftest import truncate
+
+LARGE_TABLES = {"questions", "answers"}
+QUESTIONS = 20_000
+ANSWERS_PER_QUESTION = 20
+
+AFTER = (datetime.now(timezone.utc), 0)
+
+
+def _strategy_checks():
+    for strategy in CountStrategy:
+        questions = QuestionRepository(count_strategy=strategy, answers_count_strategy=strategy)
+        if strategy not in (CountStrategy.EXACT, CountStrategy.CACHED):
+            # Точный COUNT(*) по всей таблице — всегда полный проход, ради него и есть остальные стратегии
+            yield f"QuestionRepository.count_all[{strategy.value}]", \
+                lambda session, question_id, repository=questions: repository.count_all(session)
+        yield f"QuestionRepository.get_with_answers[{strategy.value}]", \
+            lambda session, question_id, repository=questions: repository.get_with_answers(
+                session, question_id, limit=10, offset=50)
+        yield f"QuestionRepository.get_latest_answers[{strategy.value}]", \
+            lambda session, question_id, repository=questions: repository.get_latest_answers(
+                session, list(range(question_id, question_id + 100)), limit=3)
+
+
+CHECKS = {
+    "AnswerRepository.get_by_id": lambda session, question_id: AnswerRepository().get_by_id(question_id, session),
+    "QuestionRepository.get_version": lambda session, question_id: QuestionRepository().get_version(
+        session, question_id),
+    **dict(_strategy_checks()),
+    "QuestionRepository.get_all[offset]": lambda session, question_id: QuestionRepository().get_all(
+        session, offset=1000, limit=10, include_total=False),
+    "QuestionRepository.get_all[keyset]": lambda session, question_id: QuestionRepository().get_all(
+        session, limit=10, after=AFTER, include_total=False),
+    "QuestionRepository.get_with_answers[keyset]": lambda session, question_id: QuestionRepository().get_with_answers(
+        session, question_id, limit=10, after=AFTER),
+    # Совпадения должны браться из GIN-индексов search_vector
+    "SearchRepository.search": lambda session, question_id: SearchRepository().search(
+        session, "answer 42", limit=10),
+    "SearchRepository.search[keyset]": lambda session, question_id: SearchRepository().search(
+        session, "answer 42", limit=10, after=(1.0, "question", 0)),
+}
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    """Large tables scanned sequentially anywhere in the plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def explain(session: AsyncSession, statement: str, parameters) -> dict:
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def analyze() -> None:
+    async with engine.begin() as connection:
+        # Строки, вставленные пачкой, лежат в pending list GIN-индексов, и планировщик оценивает
+        # индекс как дорогой; в рабочей базе список переносит в индекс autovacuum
+        for index in ("ix_questions_search_vector", "ix_answers_search_vector"):
+            await connection.execute(text("SELECT gin_clean_pending_list(CAST(:index AS regclass))"),
+                                     {"index": index})
+        await connection.execute(text("ANALYZE questions"))
+        await connection.execute(text("ANALYZE answers"))
+
+
+@pytest.fixture(scope="module")
+async def seeded(database) -> int:
+    """Seed questions with answers, analyze and return the id of a question in the middle."""
+    await truncate()
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("INSERT INTO questions (text, created_at, answer_count) "
+                 "SELECT 'plan check ' || g, now() - make_interval(secs => g), :m "
+                 "FROM generate_series(1, :n) AS g"),
+            {"n": QUESTIONS, "m": ANSWERS_PER_QUESTION},
+        )
+        await connection.execute(
+            text("INSERT INTO answers (question_id, user_id, text, created_at) "
+                 "SELECT q.id, gen_random_uuid()::text, 'answer ' || g, q.created_at + make_interval(secs => g) "
+                 "FROM questions q CROSS JOIN generate_series(1, :m) AS g"),
+            {"m": ANSWERS_PER_QUESTION},
+        )
+    await analyze()
+    yield QUESTIONS // 2
+    await truncate()
+    await analyze()
+
+
+@pytest.mark.parametrize("name", CHECKS)
+async def test_repository_query_uses_indexes(name, seeded, statements):
+    async with async_session_factory() as session:
+        await CHECKS[name](session, seeded)
+        # Стратегия estimate отправляет только EXPLAIN, его план не проверяется
+        for statement, parameters in list(statements):
+            scans = find_seq_scans(await explain(session, statement, parameters))
+            assert not scans, f"{name}: Seq Scan on {', '.join(scans)}\n{statement}"
+
+
+async def test_cascade_delete_uses_answers_index(seeded):
+    # ON DELETE CASCADE выполняется внутренним запросом по answers.question_id
+    async with async_session_factory() as session:
+        plan = await explain(session, "DELETE FROM answers WHERE question_id = $1::INTEGER", (seeded,))
+        assert not find_seq_scans(plan)
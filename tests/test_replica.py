@@ -0,0 +1,100 @@
+import dataclasses
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import dependencies
+from app.cache.memory import MemoryCache
+from app.database.db import create_engine, create_session_factory
+from app.database.replica import LAST_WRITE_COOKIE, ReplicaLagMonitor
+from app.dependencies import get_cache
+from app.main import app
+from tests.conftest import API, create_question
+
+REPLICA_TEXT = "from replica"
+LIST = {"include_total": "false"}
+
+
+@pytest.fixture
+async def replica(client, tmp_path, monkeypatch):
+    """SQLite stand-in for the read replica, with one question the primary doesn't have."""
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", "replica")
+    async with engine.begin() as connection:
+        # Модели с tsvector-колонками в SQLite не создаются, таблица описана вручную
+        await connection.execute(text(
+            "CREATE TABLE questions (id INTEGER PRIMARY KEY, text TEXT NOT NULL, "
+            "created_at TIMESTAMP NOT NULL, answer_count INTEGER NOT NULL DEFAULT 0)"
+        ))
+        await connection.execute(text("INSERT INTO questions (id, text, created_at) "
+                                      "VALUES (1, :text, '2024-01-01 00:00:00')"), {"text": REPLICA_TEXT})
+    monitor = ReplicaLagMonitor(engine, check_interval=0)
+    monkeypatch.setattr(dependencies, "replica_monitor", monitor)
+    monkeypatch.setattr(dependencies, "replica_session_factory", create_session_factory(engine))
+    yield monitor
+    await engine.dispose()
+
+
+def configure(monkeypatch, **changes) -> None:
+    monkeypatch.setattr(dependencies, "settings", dataclasses.replace(dependencies.settings, **changes))
+
+
+async def listed_texts(client) -> list[str]:
+    response = await client.get(f"{API}/questions", params=LIST)
+    assert response.status_code == 200, response.text
+    return [question["text"] for question in response.json()["items"]]
+
+
+async def test_reads_go_to_replica(client, replica):
+    assert await listed_texts(client) == [REPLICA_TEXT]
+
+
+async def test_reads_after_own_write_go_to_primary(client, replica, monkeypatch):
+    configure(monkeypatch, read_your_writes_window=60)
+
+    response = await client.post(f"{API}/questions", json={"text": "from primary"})
+
+    assert LAST_WRITE_COOKIE in response.cookies
+    assert await listed_texts(client) == ["from primary"]
+    # Окно прошло: чтение снова идет в реплику
+    configure(monkeypatch, read_your_writes_window=0)
+    assert await listed_texts(client) == [REPLICA_TEXT]
+
+
+async def test_reads_after_own_write_skip_the_response_cache(client, replica, monkeypatch):
+    configure(monkeypatch, read_your_writes_window=60)
+    cache = MemoryCache(max_entries=100, ttl=60)
+    app.dependency_overrides[get_cache] = lambda: cache
+
+    written = (await client.post(f"{API}/questions", json={"text": "from primary"})).cookies[LAST_WRITE_COOKIE]
+    client.cookies.clear()
+    # Другой клиент читает реплику и после инвалидации снова кладет в кэш список без новой записи
+    assert await listed_texts(client) == [REPLICA_TEXT]
+    client.cookies.set(LAST_WRITE_COOKIE, written)
+
+    assert await listed_texts(client) == ["from primary"]
+    assert cache.stats.hits == 0
+
+
+async def test_other_clients_read_from_replica_after_a_write(client, replica):
+    await create_question(client, "from primary")
+    client.cookies.clear()
+
+    assert await listed_texts(client) == [REPLICA_TEXT]
+
+
+async def test_lagging_replica_is_skipped(client, replica, monkeypatch):
+    await create_question(client, "from primary")
+    client.cookies.clear()
+    # Отставание локальной замены всегда 0, поэтому порог ниже нуля
+    configure(monkeypatch, replica_max_lag=-1)
+
+    assert await listed_texts(client) == ["from primary"]
+
+
+async def test_unreachable_replica_counts_as_infinite_lag():
+    engine = create_async_engine("postgresql+asyncpg://postgres@127.0.0.1:1/postgres")
+    try:
+        assert await ReplicaLagMonitor(engine).lag() == float("inf")
+    finally:
+        await engine.dispose()
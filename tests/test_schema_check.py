@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database import schema_check
+from app.database.db import engine
+from app.database.schema_check import SchemaMismatchError, check_schema_revision
+
+
+async def test_schema_at_head_passes(database):
+    await check_schema_revision(engine)
+
+
+async def test_revision_mismatch(database, monkeypatch):
+    monkeypatch.setattr(schema_check, "alembic_heads", lambda: {"0000000000"})
+    with pytest.raises(SchemaMismatchError, match="doesn't match Alembic head"):
+        await check_schema_revision(engine)
+
+
+async def test_missing_alembic_version_table(database):
+    # Пустой search_path: таблица alembic_version не находится, как в непромигрированной базе
+    empty = create_async_engine(settings.database_url,
+                                connect_args={"server_settings": {"search_path": "pg_temp"}})
+    try:
+        with pytest.raises(SchemaMismatchError, match="alembic_version table is missing"):
+            await check_schema_revision(empty)
+    finally:
+        await empty.dispose()
+
+
+async def test_other_database_errors_propagate(database):
+    # alembic_version заблокирована другой транзакцией: ошибка lock_timeout не про миграции
+    impatient = create_async_engine(settings.database_url,
+                                    connect_args={"server_settings": {"lock_timeout": "50"}})
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(text("LOCK TABLE alembic_version IN ACCESS EXCLUSIVE MODE"))
+            with pytest.raises(DBAPIError) as error:
+                await check_schema_revision(impatient)
+        assert not isinstance(error.value, SchemaMismatchError)
+    finally:
+        await impatient.dispose()
+
+
+async def test_connection_errors_propagate():
+    unreachable = create_async_engine(f"postgresql+asyncpg://{settings.db_user}@127.0.0.1:1/{settings.db_name}")
+    try:
+        with pytest.raises(OSError):
+            await check_schema_revision(unreachable)
+    finally:
+        await unreachable.dispose()
@@ -0,0 +1,88 @@
+import pytest
+
+from app import dependencies
+from app.search.inverted_index import InvertedIndex
+from tests.conftest import API, create_answer, create_question
+
+
+@pytest.fixture(autouse=True, params=["postgres", "memory"])
+def backend(request, monkeypatch) -> str:
+    """Every search test runs against tsvector in Postgres and against the in-process index."""
+    if request.param == "memory":
+        monkeypatch.setattr(dependencies, "search_index", InvertedIndex())
+    return request.param
+
+
+async def search(client, q: str, **params) -> dict:
+    response = await client.get(f"{API}/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def found(page: dict) -> list[tuple[str, int]]:
+    return [(hit["type"], hit["id"]) for hit in page["items"]]
+
+
+async def test_questions_and_answers_ranked(client):
+    frequent = await create_question(client, "replication replication replication")
+    rare = await create_question(client, "how to configure replication in a large cluster")
+    answer = await create_answer(client, rare["id"], "replication and more replication")
+    await create_question(client, "unrelated question")
+
+    page = await search(client, "replication")
+
+    assert found(page) == [("question", frequent["id"]), ("answer", answer["id"]), ("question", rare["id"])]
+    ranks = [hit["rank"] for hit in page["items"]]
+    assert ranks == sorted(ranks, reverse=True)
+    assert page["items"][1]["question_id"] == rare["id"]
+
+
+async def test_query_syntax(client, backend):
+    both = await create_question(client, "index bloat after vacuum")
+    only_index = await create_question(client, "bloat of an index")
+    settings = await create_question(client, "vacuum settings")
+
+    assert found(await search(client, "index bloat -vacuum")) == [("question", only_index["id"])]
+    assert found(await search(client, '"bloat after vacuum"')) == [("question", both["id"])]
+    if backend == "postgres":
+        # or есть только в синтаксисе websearch_to_tsquery
+        assert len((await search(client, "index or settings"))["items"]) == 3
+    else:
+        assert set(found(await search(client, "vacu*"))) == {("question", both["id"]), ("question", settings["id"])}
+
+
+async def test_cursor_pages_cover_all_hits(client):
+    created = {(await create_question(client, f"pagination topic {i}"))["id"] for i in range(5)}
+
+    seen, params = [], {"limit": 2}
+    while True:
+        page = await search(client, "pagination", **params)
+        seen += [hit["id"] for hit in page["items"]]
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert len(seen) == len(created) and set(seen) == created
+
+
+async def test_snippet_is_escaped_and_highlighted(client):
+    await create_question(client, "tuning checkpoints when wal < 1GB & max_wal_size")
+
+    snippet = (await search(client, "checkpoints"))["items"][0]["snippet"]
+
+    assert "&lt; 1GB &amp;" in snippet
+    assert "<mark>checkpoints</mark>" in snippet
+
+
+async def test_deleted_rows_disappear_from_results(client):
+    question = await create_question(client, "cascade question")
+    await create_answer(client, question["id"], "cascade answer")
+
+    await client.delete(f"{API}/questions/{question['id']}")
+
+    assert (await search(client, "cascade"))["items"] == []
+
+
+async def test_invalid_queries_are_rejected(client):
+    assert (await client.get(f"{API}/search", params={"q": "   "})).status_code == 422
+    assert (await client.get(f"{API}/search", params={"q": "x", "cursor": "bad"})).status_code == 400
@@ -0,0 +1,57 @@
+import dataclasses
+
+import pytest
+from sqlalchemy import text
+
+from app import dependencies
+from app.database.db import engine
+from app.search.inverted_index import InvertedIndex
+from tests.conftest import API, create_answer, create_question
+
+
+@pytest.fixture
+def snapshot(client, tmp_path, monkeypatch):
+    """Memory search backend with its snapshot in a temporary directory."""
+    path = tmp_path / "search_index.bin"
+    monkeypatch.setattr(dependencies, "settings",
+                        dataclasses.replace(dependencies.settings, search_index_path=str(path)))
+    monkeypatch.setattr(dependencies, "search_index", InvertedIndex())
+    return path
+
+
+async def search_ids(client, q: str) -> set[tuple[str, int]]:
+    response = await client.get(f"{API}/search", params={"q": q})
+    return {(hit["type"], hit["id"]) for hit in response.json()["items"]}
+
+
+async def test_restart_from_snapshot_catches_up_with_tables(client, snapshot, monkeypatch):
+    kept = await create_question(client, "snapshot kept")
+    answer = await create_answer(client, kept["id"], "snapshot answer")
+    dropped = await create_question(client, "snapshot dropped")
+    dependencies.save_search_index()
+    assert [path.name for path in snapshot.parent.iterdir()] == [snapshot.name]
+
+    # Пока процесс «лежит», таблицы меняются в обход приложения
+    async with engine.begin() as connection:
+        await connection.execute(text("DELETE FROM questions WHERE id = :id"), {"id": dropped["id"]})
+        added = (await connection.execute(
+            text("INSERT INTO questions (text) VALUES ('snapshot added') RETURNING id"))).scalar_one()
+    monkeypatch.setattr(dependencies, "search_index", InvertedIndex())
+    await dependencies.restore_search_index()
+
+    assert await search_ids(client, "snapshot") == {("question", kept["id"]), ("answer", answer["id"]),
+                                                    ("question", added)}
+    # Догнанный индекс сохранен заново: следующий старт видит те же документы
+    restored = InvertedIndex()
+    restored.load(str(snapshot))
+    assert len(restored) == 3
+
+
+async def test_unusable_snapshot_is_rebuilt_from_tables(client, snapshot, monkeypatch):
+    question = await create_question(client, "rebuilt question")
+    snapshot.write_bytes(b"not a snapshot")
+    monkeypatch.setattr(dependencies, "search_index", InvertedIndex())
+
+    await dependencies.restore_search_index()
+
+    assert await search_ids(client, "rebuilt") == {("question", question["id"])}
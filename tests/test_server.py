@@ -0,0 +1,52 @@
+import importlib.util
+import os
+import sys
+
+from app import server
+from app.config import Settings
+
+
+def test_main_runs_uvicorn_with_workers(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(server.uvicorn, "run", lambda target, **kwargs: calls.append((target, kwargs)))
+    monkeypatch.setattr(sys, "argv", ["app.server", "--workers", "3", "--port", "9000"])
+    # main() пишет в os.environ для воркеров; копия не дает этому попасть в остальные тесты
+    environ = {name: value for name, value in os.environ.items() if name != "PROMETHEUS_MULTIPROC_DIR"}
+    monkeypatch.setattr(os, "environ", environ)
+    monkeypatch.setattr(server.tempfile, "mkdtemp", lambda prefix: str(tmp_path))
+
+    server.main()
+
+    (target, kwargs), = calls
+    assert target == "app.main:app"
+    assert (kwargs["workers"], kwargs["port"]) == (3, 9000)
+    assert kwargs["loop"] in ("uvloop", "asyncio") and kwargs["http"] in ("httptools", "h11")
+    # Воркеры делят DB_POOL_TOTAL и пишут метрики в общий каталог
+    assert environ["WEB_CONCURRENCY"] == "3"
+    assert environ["PROMETHEUS_MULTIPROC_DIR"] == str(tmp_path)
+
+
+def test_auto_loop_and_parser_depend_on_installed_packages():
+    expected_loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    expected_http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    assert server.resolve_loop("auto") == expected_loop
+    assert server.resolve_http("auto") == expected_http
+    assert server.resolve_loop("asyncio") == "asyncio"
+    assert server.resolve_http("h11") == "h11"
+
+
+def test_total_pool_limit_is_shared_between_workers(monkeypatch):
+    monkeypatch.setenv("DB_POOL_TOTAL", "10")
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+
+    assert Settings.from_env().worker_pool_limits == (2, 0)
+
+
+def test_pool_limits_without_total(monkeypatch):
+    monkeypatch.setenv("DB_POOL_TOTAL", "0")
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+
+    assert Settings.from_env().worker_pool_limits == (7, 3)
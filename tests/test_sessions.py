@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import event
+
+from app.cache.memory import MemoryCache
+from app.database.db import engine
+from app.dependencies import get_cache
+from app.main import app
+from tests.conftest import API, create_answer, create_question
+
+
+@pytest.fixture
+def checkouts():
+    """Connections checked out of the primary pool while the test runs."""
+    counter = []
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        counter.append(connection_record)
+
+    event.listen(engine.sync_engine, "checkout", on_checkout)
+    yield counter
+    event.remove(engine.sync_engine, "checkout", on_checkout)
+
+
+async def test_cached_read_does_not_check_out_a_connection(client, checkouts):
+    cache = MemoryCache()
+    app.dependency_overrides[get_cache] = lambda: cache
+    question = await create_question(client)
+    await client.get(f"{API}/questions/{question['id']}")
+    checkouts.clear()
+
+    response = await client.get(f"{API}/questions/{question['id']}")
+
+    assert response.status_code == 200
+    assert checkouts == []
+
+
+async def test_rejected_request_does_not_check_out_a_connection(client, checkouts):
+    response = await client.get(f"{API}/questions", params={"limit": 1000})
+
+    assert response.status_code == 422
+    assert checkouts == []
+
+
+async def test_read_checks_out_one_connection(client, checkouts):
+    question = await create_question(client)
+    await create_answer(client, question["id"])
+    checkouts.clear()
+
+    await client.get(f"{API}/questions/{question['id']}")
+    await client.get(f"{API}/questions")
+
+    # Соединение берется на первый запрос и возвращается после чтения, по одному на ответ
+    assert len(checkouts) == 2
+    assert engine.pool.checkedout() == 0